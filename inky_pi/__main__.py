@@ -6,14 +6,25 @@ from __future__ import annotations
 
 import sys
 from argparse import ArgumentParser, Namespace
-from enum import Enum, auto
-from typing import Dict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from loguru import logger
 
 from inky_pi import __version__
-from inky_pi.configs import Settings
-from inky_pi.display.display_base import DisplayModel, DisplayOutput
+from inky_pi.display.display_base import (
+    DisplayBase,
+    DisplayModel,
+    DisplayOption,
+    DisplayOutput,
+    RefreshPolicy,
+)
+from inky_pi.metrics import configure_metrics, write_textfile
+from inky_pi.timing import configure_timing, refresh_timer, stage
 from inky_pi.train.train_base import TrainBase, TrainModel, TrainObject
 from inky_pi.util import (
     configure_logging,
@@ -28,41 +39,84 @@ from inky_pi.weather.weather_base import (
     WeatherObject,
 )
 
-config = Settings()
+if TYPE_CHECKING:
+    from inky_pi.cache import ResponseCache
+    from inky_pi.configs import Settings
 
-# Define objects to be used in fetching data
-TRAIN_OBJECT = TrainObject(
-    model=TrainModel[config.TRAIN_MODEL],
-    station_from=config.STATION_FROM,
-    station_to=config.STATION_TO,
-    number=config.TRAIN_NUMBER,
-    url=config.TRAIN_MODEL_URL,
-    token=config.TRAIN_API_TOKEN,
-)
 
-WEATHER_OBJECT = WeatherObject(
-    model=WeatherModel[config.WEATHER_MODEL],
-    latitude=config.LATITUDE,
-    longitude=config.LONGITUDE,
-    exclude_flags=config.EXCLUDE_FLAGS,
-    weather_api_token=config.WEATHER_API_TOKEN,
-)
+@dataclass(frozen=True)
+class RuntimeContext:
+    """Runtime context object
 
+    Holds the validated settings and the objects derived from them that are
+    used in fetching data and selecting an output.
+    """
 
-class DisplayOption(Enum):
-    """Enum of display options"""
+    config: Settings
+    train_object: TrainObject
+    weather_object: WeatherObject
+    output_dispatch_table: Dict[str, DisplayOutput]
+    cache: Optional[ResponseCache] = None
+    snapshot_file: Optional[Path] = None
 
-    TRAIN = auto()
-    WEATHER = auto()
-    NIGHT = auto()
 
+@lru_cache(maxsize=None)
+def get_runtime_context() -> RuntimeContext:
+    """Builds the runtime context on first use and memoizes it
 
-BASE_COLOR = config.INKY_COLOR
-OUTPUT_DISPATCH_TABLE: Dict[str, DisplayOutput] = {
-    "INKY": DisplayOutput(model=DisplayModel.INKY, base_color=BASE_COLOR),
-    "TERMINAL": DisplayOutput(model=DisplayModel.TERMINAL, base_color=BASE_COLOR),
-    "DESKTOP": DisplayOutput(model=DisplayModel.DESKTOP, base_color=BASE_COLOR),
-}
+    Settings validation (.env parsing, pydantic, CRS code lookups) is deferred
+    until data is actually displayed, so argument parsing and dry runs stay cheap.
+
+    Returns:
+        RuntimeContext: Runtime context object
+    """
+    # pylint: disable=import-outside-toplevel
+    from inky_pi.cache import DiskCache
+    from inky_pi.configs import Settings
+    from inky_pi.http_session import configure_http
+    from inky_pi.snapshot import SNAPSHOT_FILE
+
+    with stage("settings"):
+        config = Settings()
+    configure_http(
+        (config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT), config.HTTP_RETRIES
+    )
+    base_color = config.INKY_COLOR
+    return RuntimeContext(
+        config=config,
+        train_object=TrainObject(
+            model=TrainModel[config.TRAIN_MODEL],
+            station_from=config.STATION_FROM,
+            station_to=config.STATION_TO,
+            number=config.TRAIN_NUMBER,
+            url=config.TRAIN_MODEL_URL,
+            token=config.TRAIN_API_TOKEN,
+            wsdl_cache_ttl=config.TRAIN_WSDL_CACHE_TTL,
+        ),
+        weather_object=WeatherObject(
+            model=WeatherModel[config.WEATHER_MODEL],
+            latitude=config.LATITUDE,
+            longitude=config.LONGITUDE,
+            exclude_flags=config.EXCLUDE_FLAGS,
+            weather_api_token=config.WEATHER_API_TOKEN,
+        ),
+        output_dispatch_table={
+            model.name: DisplayOutput(
+                model=model,
+                base_color=base_color,
+                # Only the e-ink panel benefits from skipping unchanged frames
+                refresh_policy=(
+                    RefreshPolicy[config.DISPLAY_REFRESH_POLICY]
+                    if model == DisplayModel.INKY
+                    else RefreshPolicy.ALWAYS
+                ),
+                output_file=config.HEADLESS_OUTPUT_FILE,
+            )
+            for model in DisplayModel
+        },
+        cache=DiskCache() if config.RESPONSE_CACHE else None,
+        snapshot_file=SNAPSHOT_FILE if config.OFFLINE_SNAPSHOT else None,
+    )
 
 
 def _parse_args(args: list[str]) -> Namespace:
@@ -87,7 +141,7 @@ def _parse_args(args: list[str]) -> Namespace:
     parser.add_argument(
         "-m",
         "--output",
-        help="Output destination (inky, terminal, desktop)",
+        help="Output destination (inky, terminal, desktop, file, buffer)",
         type=str,
         default="inky",
         choices=[model.name.lower() for model in DisplayModel],
@@ -99,6 +153,18 @@ def _parse_args(args: list[str]) -> Namespace:
         action="version",
         version="%(prog)s " + __version__,
     )
+    parser.add_argument(
+        "--timings",
+        help="Log per-stage refresh timings",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write Prometheus metrics to this textfile-collector file (.prom)",
+        type=str,
+        default=None,
+    )
     parser.add_argument(
         "--dry-run",
         help="Dry run",
@@ -111,17 +177,115 @@ def _parse_args(args: list[str]) -> Namespace:
 def display_data(option: DisplayOption, output: DisplayOutput) -> None:
     """inky_pi weather with train function
 
-    Retrieves train and weather data from API endpoints, generates text and
-    weather icon, and draws to inkyWHAT screen.
+    Retrieves train and weather data from API endpoints concurrently, generates
+    text and weather icon, and draws to inkyWHAT screen.
+
+    If fresh data takes longer than OFFLINE_SNAPSHOT_WAIT seconds, or cannot be
+    fetched, the last saved snapshot is drawn first, marked stale, so the screen
+    is not left blank while the network is slow or down.
 
     Args:
         option (DisplayOption): Display Option enum (TRAIN, WEATHER, NIGHT)
         output (DisplayOutput): Display Output dataclass (INKY | TERMINAL | DESKTOP)
     """
-    # Weather data is always used
-    weather_data: WeatherBase = weather_model_factory(WEATHER_OBJECT)
+    with refresh_timer("display_data"):
+        context: RuntimeContext = get_runtime_context()
+        needs_train = option == DisplayOption.TRAIN
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="inky_fetch") as pool:
+            # Weather data is always used; train data only if the option is TRAIN
+            weather_future: Future[WeatherBase] = pool.submit(
+                weather_model_factory, context.weather_object, context.cache
+            )
+            train_future: Optional[Future[TrainBase]] = (
+                pool.submit(train_model_factory, context.train_object, context.cache)
+                if needs_train
+                else None
+            )
+            # Display driver setup overlaps with the network round trips; fresh
+            # data is drawn once both fetches have completed
+            display: DisplayBase = import_display(output)
+            futures: List[Future[Any]] = [weather_future]
+            if train_future:
+                futures.append(train_future)
+            drew_snapshot = False
+            if context.snapshot_file is not None:
+                wait(futures, timeout=context.config.OFFLINE_SNAPSHOT_WAIT)
+                if not all(future.done() for future in futures):
+                    drew_snapshot = _draw_snapshot(display, option, output)
+            try:
+                weather_data: WeatherBase = weather_future.result()
+                train_data: Optional[TrainBase] = (
+                    train_future.result() if train_future else None
+                )
+            except (Exception, SystemExit):
+                # Keep the last known data on screen rather than nothing
+                if context.snapshot_file is not None and not drew_snapshot:
+                    _draw_snapshot(display, option, output)
+                raise
+
+        if context.snapshot_file is not None:
+            # pylint: disable=import-outside-toplevel
+            from inky_pi.snapshot import save_snapshot
+
+            save_snapshot(
+                context.weather_object,
+                weather_data,
+                context.train_object,
+                train_data,
+                context.snapshot_file,
+            )
+        draw_data(display, option, output, weather_data, train_data)
+
+
+def _draw_snapshot(
+    display: DisplayBase, option: DisplayOption, output: DisplayOutput
+) -> bool:
+    """Draw the last saved data, marked stale, if it covers the option
 
-    with import_display(output) as display:
+    Args:
+        display (DisplayBase): Display to draw on
+        option (DisplayOption): Display Option enum (TRAIN, WEATHER, NIGHT)
+        output (DisplayOutput): Display Output dataclass
+
+    Returns:
+        bool: True if the snapshot was drawn
+    """
+    # pylint: disable=import-outside-toplevel
+    from inky_pi.snapshot import load_snapshot
+
+    context = get_runtime_context()
+    assert context.snapshot_file is not None
+    needs_train = option == DisplayOption.TRAIN
+    snapshot = load_snapshot(
+        context.weather_object, context.train_object, context.snapshot_file
+    )
+    if snapshot.weather is None or not snapshot.covers(needs_train):
+        return False
+    fetched = snapshot.fetched(needs_train)
+    logger.info("Drawing snapshot fetched at {fetched}", fetched=fetched)
+    draw_data(display, option, output, snapshot.weather, snapshot.train, fetched)
+    return True
+
+
+def draw_data(
+    display: DisplayBase,
+    option: DisplayOption,
+    output: DisplayOutput,
+    weather_data: WeatherBase,
+    train_data: Optional[TrainBase] = None,
+    stale_since: Optional[datetime] = None,
+) -> None:
+    """Draws already fetched train and weather data and renders it to the display
+
+    Args:
+        display (DisplayBase): Display to draw on
+        option (DisplayOption): Display Option enum (TRAIN, WEATHER, NIGHT)
+        output (DisplayOutput): Display Output dataclass (INKY | TERMINAL | DESKTOP)
+        weather_data (WeatherBase): Weather data
+        train_data (TrainBase): Train data, only drawn for the TRAIN option
+        stale_since (datetime): Fetch time of stale data, shown instead of the time
+    """
+    with display.frame(option):
         logger.debug(
             "InkyPi displaying option: {option} on output: {output}",
             option=option.name.lower(),
@@ -132,17 +296,20 @@ def display_data(option: DisplayOption, output: DisplayOutput) -> None:
             return
 
         display.draw_date()
-        display.draw_time()
+        if stale_since is None:
+            display.draw_time()
+        else:
+            display.draw_stale_time(stale_since)
         display.draw_weather_icon(weather_data.get_icon())
         display.draw_weather_forecast(
             weather_data,
             ScaleType.CELSIUS,
             disp_tomorrow=bool(option == DisplayOption.TRAIN),
         )
-        if option == DisplayOption.TRAIN:
-            # Train data is only queried if the option is TRAIN
-            train_data: TrainBase = train_model_factory(TRAIN_OBJECT)
-            display.draw_train_times(train_data, config.TRAIN_NUMBER)
+        if option == DisplayOption.TRAIN and train_data is not None:
+            display.draw_train_times(
+                train_data, get_runtime_context().config.TRAIN_NUMBER
+            )
         elif option == DisplayOption.WEATHER:
             display.draw_forecast_icons(weather_data)
 
@@ -154,6 +321,10 @@ def main() -> None:
     configure_logging()
     logger.debug("InkyPi main initialized")
     args: Namespace = _parse_args(sys.argv[1:])
+    if args.timings:
+        configure_timing(True)
+    if args.metrics_file:
+        configure_metrics(True)
     if args.dry_run:
         logger.debug(
             "Dry run: option = {option} / output = {output}",
@@ -162,13 +333,16 @@ def main() -> None:
         )
         return
     try:
+        option = DisplayOption[args.option.upper()]
         display_data(
-            DisplayOption[args.option.upper()],
-            OUTPUT_DISPATCH_TABLE[args.output.upper()],
+            option, get_runtime_context().output_dispatch_table[args.output.upper()]
         )
     except Exception as exc:  # pylint: disable=broad-except
         logger.exception(exc)
         raise
+    finally:
+        if args.metrics_file:
+            write_textfile(args.metrics_file)
 
 
 if __name__ == "__main__":
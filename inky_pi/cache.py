@@ -0,0 +1,230 @@
+"""Response cache for inky_pi data providers.
+
+Provider objects are cached after a successful fetch, keyed on their request
+parameters (TrainObject/WeatherObject). Fresh entries are served directly; stale
+entries are served immediately while a background thread fetches a replacement,
+so the screen keeps rendering when an upstream API is slow. Departure boards go
+out of date within minutes, so train entries are never served stale."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle  # nosec B403 - only used for the local, self-written cache
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, TypeVar
+
+from loguru import logger
+
+from inky_pi.metrics import record_cache
+from inky_pi.train.train_base import TrainModel
+from inky_pi.weather.weather_base import WeatherModel
+
+CACHE_DIR = Path(__file__).parent.parent.joinpath(".cache")
+# Entries are pickled provider objects; bump when their attributes change so
+# entries written by an older version are not unpickled into the new classes
+CACHE_VERSION = 3
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Cache policy for a provider
+
+    ttl: seconds an entry is served without refreshing
+    stale_ttl: further seconds an expired entry is served while refreshing
+    """
+
+    ttl: float
+    stale_ttl: float
+
+
+DEFAULT_CACHE_POLICIES: Dict[Enum, CachePolicy] = {
+    TrainModel.HUXLEY2: CachePolicy(ttl=30, stale_ttl=0),
+    TrainModel.OPEN_LIVE: CachePolicy(ttl=30, stale_ttl=0),
+    WeatherModel.OPEN_WEATHER_MAP: CachePolicy(ttl=600, stale_ttl=3600),
+}
+
+
+@dataclass
+class CacheEntry:
+    """Cached value and the time it was fetched"""
+
+    created: float
+    value: Any
+
+
+class ResponseCache(ABC):
+    """Abstract base class for all response cache stores"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return cache entry
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            CacheEntry: Entry, or None if missing
+        """
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store cache entry
+
+        Args:
+            key (str): Cache key
+            entry (CacheEntry): Entry to store
+        """
+
+
+class MemoryCache(ResponseCache):
+    """In-process response cache (e.g. for a long-running process)"""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, CacheEntry] = {}
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+
+
+class DiskCache(ResponseCache):
+    """Response cache persisted to disk, so it survives between cron runs"""
+
+    def __init__(self, directory: Path = CACHE_DIR) -> None:
+        """Initialize disk cache
+
+        Args:
+            directory (Path): Directory to store entries in
+        """
+        self._directory = directory
+
+    def _path(self, key: str) -> Path:
+        return self._directory.joinpath(f"{key}.pickle")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._path(key), "rb") as file:
+                entry: CacheEntry = pickle.load(file)  # nosec B301
+                return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as exc:
+            logger.warning(
+                "Ignoring unreadable cache entry {key}: {exc}", key=key, exc=exc
+            )
+            return None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store cache entry; a failed write is logged, as the cache is optional"""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                pickle.dump(entry, file)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PickleError) as exc:
+            logger.warning("Unable to store cache entry {key}: {exc}", key=key, exc=exc)
+            with suppress(OSError):
+                tmp_path.unlink()
+
+
+def cache_key(request_object: Any) -> str:
+    """Build a cache key from a TrainObject/WeatherObject's request parameters
+
+    The key includes CACHE_VERSION, so bumping it orphans all existing entries.
+
+    Args:
+        request_object (Any): TrainObject or WeatherObject dataclass
+
+    Returns:
+        str: Cache key
+    """
+    params = sorted(asdict(request_object).items())
+    params.insert(0, ("cache_version", CACHE_VERSION))
+    return hashlib.sha256(repr(params).encode("utf-8")).hexdigest()[:32]
+
+
+_refreshing: Set[str] = set()
+_refreshing_lock = threading.Lock()
+
+
+def _refresh(cache: ResponseCache, key: str, fetch: Callable[[], Any]) -> None:
+    """Fetch a replacement for a stale entry; on failure keep serving stale data"""
+    try:
+        cache.set(key, CacheEntry(time.time(), fetch()))
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("Background refresh failed, serving stale data: {exc}", exc=exc)
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+def _refresh_in_background(
+    cache: ResponseCache, key: str, fetch: Callable[[], Any]
+) -> Optional[threading.Thread]:
+    """Start a refresh thread unless one is already running for this key
+
+    The thread is not a daemon, so a one-shot process persists the refreshed
+    entry for its next run before exiting.
+    """
+    with _refreshing_lock:
+        if key in _refreshing:
+            return None
+        _refreshing.add(key)
+    thread = threading.Thread(
+        target=_refresh, args=(cache, key, fetch), name=f"inky_refresh_{key[:8]}"
+    )
+    thread.start()
+    return thread
+
+
+def cached_fetch(
+    cache: ResponseCache,
+    request_object: Any,
+    fetch: Callable[[], T],
+    policy: Optional[CachePolicy] = None,
+) -> T:
+    """Serve a provider from cache, refreshing it according to its policy
+
+    Args:
+        cache (ResponseCache): Cache store
+        request_object (Any): TrainObject or WeatherObject (with a ``model``)
+        fetch (Callable): Fetches a fresh provider object
+        policy (CachePolicy): Overrides the provider's default cache policy
+
+    Returns:
+        The cached or freshly fetched provider object
+    """
+    policy = policy or DEFAULT_CACHE_POLICIES[request_object.model]
+    key = cache_key(request_object)
+    entry = cache.get(key)
+    if entry is not None:
+        age = time.time() - entry.created
+        if age < policy.ttl:
+            logger.debug("Cache hit for {model}", model=request_object.model.name)
+            record_cache("response", hit=True)
+            value: T = entry.value
+            return value
+        if age < policy.ttl + policy.stale_ttl:
+            logger.debug("Serving stale {model}", model=request_object.model.name)
+            record_cache("response", hit=True)
+            _refresh_in_background(cache, key, fetch)
+            stale_value: T = entry.value
+            return stale_value
+
+    record_cache("response", hit=False)
+    fresh_value = fetch()
+    cache.set(key, CacheEntry(time.time(), fresh_value))
+    return fresh_value
@@ -1,12 +1,19 @@
 """Console script for inky_pi."""
 
+import signal
+from pathlib import Path
+from typing import Any, Optional
+
 import click
 from click import BaseCommand
 from loguru import logger
 
 from inky_pi import __version__
-from inky_pi.__main__ import OUTPUT_DISPATCH_TABLE, DisplayOption, display_data
-from inky_pi.util import configure_logging
+from inky_pi.__main__ import display_data, get_runtime_context
+from inky_pi.display.display_base import DisplayModel, DisplayOption
+from inky_pi.metrics import configure_metrics, start_http_server, write_textfile
+from inky_pi.timing import configure_timing
+from inky_pi.util import LOG_ROOT_DIR, configure_logging
 
 OUTPUT_PREFIX = "inky_pi cli"
 
@@ -23,11 +30,32 @@ def cli() -> BaseCommand:
     "-o", "--option", default="train", help="Display option (train, weather, night)"
 )
 @click.option(
-    "-m", "--output", default="inky", help="Output source (inky, terminal, desktop)"
+    "-m",
+    "--output",
+    default="inky",
+    help="Output source (inky, terminal, desktop, file, buffer)",
 )
 @click.option("--dry-run", is_flag=True, default=False, help="Dry run")
-def display(option: str, output: str, dry_run: bool) -> None:
+@click.option(
+    "--timings", is_flag=True, default=False, help="Log per-stage refresh timings"
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    envvar="INKY_PI_METRICS_FILE",
+    default=None,
+    help="Write Prometheus metrics to this textfile-collector file (.prom)",
+)
+def display(
+    option: str,
+    output: str,
+    dry_run: bool,
+    timings: bool,
+    metrics_file: Optional[Path],
+) -> None:
     """Console script for inky_pi train and weather."""
+    if timings:
+        configure_timing(True)
     if dry_run:
         logger.debug(
             "Dry run: {prefix} option = {option} / output = {output}",
@@ -38,11 +66,119 @@ def display(option: str, output: str, dry_run: bool) -> None:
         click.echo(
             f"Dry run: {OUTPUT_PREFIX} option ="
             f" {DisplayOption[option.upper()].name.lower()} / output ="
-            f" {OUTPUT_DISPATCH_TABLE[output.upper()].model.name.lower()}"
+            f" {DisplayModel[output.upper()].name.lower()}"
         )
         return
 
-    display_data(DisplayOption[option.upper()], OUTPUT_DISPATCH_TABLE[output.upper()])
+    if metrics_file is not None:
+        configure_metrics(True)
+    try:
+        display_data(
+            DisplayOption[option.upper()],
+            get_runtime_context().output_dispatch_table[output.upper()],
+        )
+    finally:
+        if metrics_file is not None:
+            # Written on failure too, so the error counts reach the collector
+            write_textfile(metrics_file)
+
+
+@cli.command()
+@click.option(
+    "-m",
+    "--output",
+    default="inky",
+    help="Output source (inky, terminal, desktop, file, buffer)",
+)
+@click.option(
+    "--train-interval",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Seconds between train refreshes (default: SERVE_TRAIN_INTERVAL)",
+)
+@click.option(
+    "--weather-interval",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Seconds between weather refreshes (default: SERVE_WEATHER_INTERVAL)",
+)
+@click.option(
+    "--timings", is_flag=True, default=False, help="Log per-stage refresh timings"
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(min=1, max=65535),
+    envvar="INKY_PI_METRICS_PORT",
+    default=None,
+    help="Serve Prometheus metrics on this local port at /metrics",
+)
+def serve(
+    output: str,
+    train_interval: Optional[int],
+    weather_interval: Optional[int],
+    timings: bool,
+    metrics_port: Optional[int],
+) -> None:
+    """Keep refreshing the display from one long-running process."""
+    if timings:
+        configure_timing(True)
+    if metrics_port is not None:
+        configure_metrics(True)
+        start_http_server(metrics_port)
+        logger.info("Serving metrics on port {port}", port=metrics_port)
+    # pylint: disable=import-outside-toplevel
+    from inky_pi.daemon import create_scheduler
+
+    context = get_runtime_context()
+    scheduler = create_scheduler(
+        context,
+        context.output_dispatch_table[output.upper()],
+        train_interval,
+        weather_interval,
+    )
+
+    def _stop(*_: Any) -> None:
+        scheduler.stop()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    scheduler.run()
+
+
+@cli.command()
+@click.option(
+    "-o", "--option", default="train", help="Display option (train, weather, night)"
+)
+@click.option(
+    "-m",
+    "--output",
+    default="inky",
+    help="Output source (inky, terminal, desktop, file, buffer); buffer is headless",
+)
+@click.option(
+    "--directory",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=LOG_ROOT_DIR,
+    show_default=True,
+    help="Directory to write the profile to (next to inky.log)",
+)
+@click.option("--name", default=None, help="Profile file name, without extension")
+def profile(option: str, output: str, directory: Path, name: Optional[str]) -> None:
+    """Profile one display refresh with cProfile and import time tracing."""
+    # Validate before starting the profiled interpreter
+    option = DisplayOption[option.upper()].name.lower()
+    output = DisplayModel[output.upper()].name.lower()
+    # pylint: disable=import-outside-toplevel
+    from inky_pi.profiling import profile_refresh
+
+    result = profile_refresh(option, output, directory, name)
+    click.echo(f"Report: {result.report_file}")
+    click.echo(f"cProfile stats: {result.pstats_file}")
+    click.echo(f"Import tree (speedscope): {result.speedscope_file}")
+    if result.returncode:
+        raise click.ClickException(
+            f"Refresh failed with exit code {result.returncode}; profile is partial"
+        )
 
 
 def main() -> None:
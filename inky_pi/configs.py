@@ -15,18 +15,15 @@ command in a Python shell:
 """
 
 from enum import Enum
-from pathlib import Path
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from inky_pi.display.display_base import RefreshPolicy
+from inky_pi.stations import get_station_index
 from inky_pi.train.train_base import TrainModel
-from inky_pi.util import load_json
 from inky_pi.weather.weather_base import WeatherModel
 
-ROOT_DIR = Path(__file__).parent.parent
-STATIC_DIR = ROOT_DIR.joinpath("inky_web/static")
-
 
 class InkyColor(Enum):
     """Enum of inky display color options"""
@@ -47,6 +44,23 @@ class Settings(BaseSettings):
         title="Inky Display Color",
         description="The color of the Inky display. Options: red, black, yellow.",
     )
+    DISPLAY_REFRESH_POLICY: str = Field(
+        default=RefreshPolicy.ALWAYS.value,
+        title="Display Refresh Policy",
+        description=(
+            "When to skip refreshing the Inky display: never (ALWAYS), if the"
+            " frame is unchanged (SKIP_UNCHANGED), or if only the clock changed"
+            f" (IGNORE_VOLATILE). Options: {list(RefreshPolicy)}."
+        ),
+    )
+    HEADLESS_OUTPUT_FILE: str = Field(
+        default="frame.png",
+        title="Headless Output File",
+        description=(
+            "File the headless file output writes each frame to: a PNG image"
+            " (.png) or raw packed 1-bit black/colour planes (any other extension)"
+        ),
+    )
     TRAIN_MODEL: str = Field(
         default=TrainModel.OPEN_LIVE.value,
         title="Train Model",
@@ -82,6 +96,75 @@ class Settings(BaseSettings):
         title="Train Model URL",
         description="Train API URL to fetch data from",
     )
+    TRAIN_WSDL_CACHE_TTL: int = Field(
+        default=86400,
+        title="Train WSDL Cache TTL",
+        description="Seconds to cache the downloaded train API WSDL/XSD files",
+    )
+    HTTP_CONNECT_TIMEOUT: float = Field(
+        default=3.05,
+        title="HTTP Connect Timeout",
+        description="Seconds to wait for a connection to a train or weather API",
+    )
+    HTTP_READ_TIMEOUT: float = Field(
+        default=10.0,
+        title="HTTP Read Timeout",
+        description="Seconds to wait for a train or weather API to respond",
+    )
+    HTTP_RETRIES: int = Field(
+        default=2,
+        title="HTTP Retries",
+        description=(
+            "Retries of a failed train or weather API request, with backoff"
+            " (0 disables retries)"
+        ),
+    )
+    RESPONSE_CACHE: bool = Field(
+        default=True,
+        title="Response Cache",
+        description=(
+            "Cache train and weather responses on disk between runs, serving"
+            " stale weather data while refreshing in the background (train"
+            " data is never served stale)"
+        ),
+    )
+    OFFLINE_SNAPSHOT: bool = Field(
+        default=True,
+        title="Offline Snapshot",
+        description=(
+            "Save the last fetched train and weather data and show it, marked"
+            " stale, until fresh data arrives or when it cannot be fetched"
+        ),
+    )
+    OFFLINE_SNAPSHOT_WAIT: float = Field(
+        default=20.0,
+        title="Offline Snapshot Wait",
+        description=(
+            "Seconds to wait for fresh data before showing the saved snapshot;"
+            " keep it above the usual fetch time, as fresh data arriving later"
+            " refreshes the display a second time (0 shows it immediately)"
+        ),
+    )
+    SERVE_TRAIN_INTERVAL: int = Field(
+        default=60,
+        title="Serve Train Interval",
+        description="Seconds between train data refreshes in serve (daemon) mode",
+    )
+    SERVE_WEATHER_INTERVAL: int = Field(
+        default=900,
+        title="Serve Weather Interval",
+        description="Seconds between weather data refreshes in serve (daemon) mode",
+    )
+    SERVE_SCHEDULE: str = Field(
+        default="06:00-10:00=train,22:30-06:00=night",
+        title="Serve Schedule",
+        description=(
+            "Time-of-day display options in serve (daemon) mode as a"
+            " comma-delimited list of HH:MM-HH:MM=option rules (without spaces);"
+            " the weather option is shown outside them. Options: train, weather,"
+            " night."
+        ),
+    )
     WEATHER_MODEL: str = Field(
         default=WeatherModel.OPEN_WEATHER_MAP.value,
         title="Weather Model",
@@ -155,15 +238,41 @@ class Settings(BaseSettings):
             )
         return value
 
+    @field_validator("SERVE_TRAIN_INTERVAL", "SERVE_WEATHER_INTERVAL")
+    @classmethod
+    def _check_serve_interval(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("Serve intervals must be at least 1 second")
+        return value
+
+    @field_validator("HTTP_CONNECT_TIMEOUT", "HTTP_READ_TIMEOUT")
+    @classmethod
+    def _check_http_timeout(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("HTTP timeouts must be positive")
+        return value
+
+    @field_validator("HTTP_RETRIES")
+    @classmethod
+    def _check_http_retries(cls, value: int) -> int:
+        if value < 0:
+            raise ValueError("HTTP retries cannot be negative")
+        return value
+
+    @field_validator("OFFLINE_SNAPSHOT_WAIT")
+    @classmethod
+    def _check_offline_snapshot_wait(cls, value: float) -> float:
+        if value < 0:
+            raise ValueError("Offline snapshot wait cannot be negative")
+        return value
+
     @field_validator("STATION_FROM", "STATION_TO")
     @classmethod
     def _check_station_code(cls, value: str) -> str:
-        station_crs_data = load_json(STATIC_DIR.joinpath("crs_codes.json"))
-        valid_crs_codes = [station["crsCode"] for station in station_crs_data]
+        stations = get_station_index()
 
-        if value not in valid_crs_codes:
+        if not stations.is_valid_code(value):
             raise ValueError(
-                f"Invalid CRS code: {value}."
-                f" Valid options are: {', '.join(valid_crs_codes)}"
+                f"Invalid CRS code: {value}. Valid options are: {', '.join(stations)}"
             )
         return value
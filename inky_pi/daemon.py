@@ -0,0 +1,367 @@
+"""Inky_Pi daemon module.
+
+Keeps one process alive and refreshes the display on independent cadences: the
+clock every minute, train data every SERVE_TRAIN_INTERVAL seconds and weather data
+every SERVE_WEATHER_INTERVAL seconds. The display option is chosen by time-of-day
+rules (SERVE_SCHEDULE). Between updates the process sleeps on an event until the
+next refresh is due, so it uses no CPU while idle. On start-up the last saved
+snapshot is drawn, marked stale, before the first fetch."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime
+from datetime import time as dt_time
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from loguru import logger
+
+from inky_pi.__main__ import RuntimeContext, draw_data
+from inky_pi.display.display_base import DisplayBase, DisplayOption, DisplayOutput
+from inky_pi.snapshot import load_snapshot, save_snapshot
+from inky_pi.timing import refresh_timer
+from inky_pi.train.train_base import TrainBase
+from inky_pi.util import import_display, train_model_factory, weather_model_factory
+from inky_pi.weather.weather_base import WeatherBase
+
+CLOCK_INTERVAL = 60
+RETRY_INTERVAL = 60
+DEFAULT_OPTION = DisplayOption.WEATHER
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ScheduleRule:
+    """Display option shown between two times of day (wrapping past midnight)"""
+
+    start: dt_time
+    end: dt_time
+    option: DisplayOption
+
+    def matches(self, now: dt_time) -> bool:
+        """Check if a time of day falls within the rule (start inclusive)
+
+        Args:
+            now (time): Time of day
+
+        Returns:
+            bool: True if the rule applies
+        """
+        if self.start <= self.end:
+            return self.start <= now < self.end
+        return now >= self.start or now < self.end
+
+
+def parse_schedule(schedule: str) -> List[ScheduleRule]:
+    """Parse schedule rules, e.g. "06:00-10:00=train,22:30-06:00=night"
+
+    Args:
+        schedule (str): Comma-delimited HH:MM-HH:MM=option rules
+
+    Raises:
+        ValueError: If a rule is malformed or names an unknown option
+
+    Returns:
+        list: Schedule rules, in priority order
+    """
+    rules: List[ScheduleRule] = []
+    for rule in filter(None, schedule.split(",")):
+        try:
+            span, option = rule.split("=")
+            start, end = span.split("-")
+            rules.append(
+                ScheduleRule(
+                    dt_time.fromisoformat(start),
+                    dt_time.fromisoformat(end),
+                    DisplayOption[option.upper()],
+                )
+            )
+        except (KeyError, ValueError) as exc:
+            raise ValueError(
+                f"Invalid schedule rule: {rule}. Expected HH:MM-HH:MM=option with"
+                f" option one of {[option.name.lower() for option in DisplayOption]}"
+            ) from exc
+    return rules
+
+
+def select_option(
+    rules: Sequence[ScheduleRule],
+    now: datetime,
+    default: DisplayOption = DEFAULT_OPTION,
+) -> DisplayOption:
+    """Select the display option for a time of day; the first matching rule wins
+
+    Args:
+        rules (Sequence[ScheduleRule]): Schedule rules
+        now (datetime): Current time
+        default (DisplayOption): Option shown when no rule matches
+
+    Returns:
+        DisplayOption: Display option
+    """
+    time_of_day = now.time()
+    for rule in rules:
+        if rule.matches(time_of_day):
+            return rule.option
+    return default
+
+
+class RefreshScheduler:
+    """Refreshes data and the display on independent cadences"""
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self,
+        context: RuntimeContext,
+        output: DisplayOutput,
+        rules: Sequence[ScheduleRule],
+        train_interval: float,
+        weather_interval: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize scheduler
+
+        Args:
+            context (RuntimeContext): Runtime context
+            output (DisplayOutput): Display output to render to
+            rules (Sequence[ScheduleRule]): Time-of-day display option rules
+            train_interval (float): Seconds between train data refreshes
+            weather_interval (float): Seconds between weather data refreshes
+            clock (Callable): Wall clock, in seconds since the epoch
+        """
+        self._context = context
+        self._output = output
+        self._rules = rules
+        self._train_interval = train_interval
+        self._weather_interval = weather_interval
+        self._clock = clock
+        self._stop_event = threading.Event()
+        self._display: Optional[DisplayBase] = None
+        self._option: Optional[DisplayOption] = None
+        self._weather_data: Optional[WeatherBase] = None
+        self._train_data: Optional[TrainBase] = None
+        # Fetch times of the held data
+        self._weather_fetched = 0.0
+        self._train_fetched = 0.0
+        # Fetch times of held data drawn as stale: restored from the snapshot, or
+        # kept after a failed refetch, until it is refetched
+        self._weather_stale: Optional[datetime] = None
+        self._train_stale: Optional[datetime] = None
+        self._next_weather = 0.0
+        self._next_train = 0.0
+        self._next_clock = 0.0
+
+    @property
+    def option(self) -> Optional[DisplayOption]:
+        """Display option currently shown"""
+        return self._option
+
+    def stop(self) -> None:
+        """Stop the scheduler loop; safe to call from a signal handler"""
+        self._stop_event.set()
+
+    def run(self) -> None:
+        """Refresh until stopped, sleeping until the next refresh is due"""
+        logger.info(
+            "InkyPi serving output: {output}", output=self._output.model.name.lower()
+        )
+        self.restore_snapshot(self._clock())
+        while not self._stop_event.is_set():
+            next_due = self.tick(self._clock())
+            self._stop_event.wait(max(0.0, next_due - self._clock()))
+        logger.info("InkyPi serve stopped")
+
+    def restore_snapshot(self, now: float) -> None:
+        """Draw the last saved data, marked stale, before anything is fetched
+
+        Args:
+            now (float): Current time, in seconds since the epoch
+        """
+        if self._context.snapshot_file is None:
+            return
+        snapshot = load_snapshot(
+            self._context.weather_object,
+            self._context.train_object,
+            self._context.snapshot_file,
+        )
+        if snapshot.weather is None:
+            return
+        self._weather_data = snapshot.weather
+        self._weather_stale = datetime.fromtimestamp(snapshot.weather.fetched)
+        if snapshot.train is not None:
+            self._train_data = snapshot.train
+            self._train_stale = datetime.fromtimestamp(snapshot.train.fetched)
+        self._option = select_option(self._rules, datetime.fromtimestamp(now))
+        if snapshot.covers(self._option == DisplayOption.TRAIN):
+            logger.info(
+                "Drawing snapshot fetched at {fetched}", fetched=self._weather_stale
+            )
+            self._draw()
+
+    def tick(self, now: float) -> float:
+        """Fetch whatever data is due, redrawing the display if anything changed
+
+        Args:
+            now (float): Current time, in seconds since the epoch
+
+        Returns:
+            float: Time the next refresh is due
+        """
+        option = select_option(self._rules, datetime.fromtimestamp(now))
+        redraw = option != self._option or now >= self._next_clock
+        self._option = option
+        with refresh_timer("serve"):
+            if self._fetch_due(now):
+                redraw = True
+            if redraw and self._weather_data is not None:
+                self._draw()
+        # The clock refresh also re-evaluates the schedule rules on the minute
+        self._next_clock = (now // CLOCK_INTERVAL + 1) * CLOCK_INTERVAL
+        next_due = min(self._next_clock, self._next_weather)
+        if option == DisplayOption.TRAIN:
+            next_due = min(next_due, self._next_train)
+        return next_due
+
+    def _fetch_due(self, now: float) -> bool:
+        """Fetch weather and (for the TRAIN option) train data that is due
+
+        Args:
+            now (float): Current time, in seconds since the epoch
+
+        Returns:
+            bool: True if any data was refreshed, or held data became stale
+        """
+        fetch_weather = now >= self._next_weather
+        fetch_train = self._option == DisplayOption.TRAIN and now >= self._next_train
+        if not fetch_weather and not fetch_train:
+            return False
+
+        context = self._context
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="inky_fetch") as pool:
+            # The scheduler sets the cadence itself, so the response cache is bypassed
+            weather_future: Optional[Future[Optional[WeatherBase]]] = (
+                pool.submit(
+                    _fetch_or_none, weather_model_factory, context.weather_object
+                )
+                if fetch_weather
+                else None
+            )
+            train_future: Optional[Future[Optional[TrainBase]]] = (
+                pool.submit(_fetch_or_none, train_model_factory, context.train_object)
+                if fetch_train
+                else None
+            )
+            weather_data = weather_future.result() if weather_future else None
+            train_data = train_future.result() if train_future else None
+
+        refreshed = False
+        if fetch_weather:
+            self._next_weather = now + (
+                self._weather_interval if weather_data else RETRY_INTERVAL
+            )
+            if weather_data is not None:
+                self._weather_data, refreshed = weather_data, True
+                self._weather_fetched, self._weather_stale = now, None
+            elif self._weather_data is not None and self._weather_stale is None:
+                # The held data is now older than the refresh interval
+                self._weather_stale = datetime.fromtimestamp(self._weather_fetched)
+                refreshed = True
+        if fetch_train:
+            self._next_train = now + (
+                self._train_interval if train_data else RETRY_INTERVAL
+            )
+            if train_data is not None:
+                self._train_data, refreshed = train_data, True
+                self._train_fetched, self._train_stale = now, None
+            elif self._train_data is not None and self._train_stale is None:
+                self._train_stale = datetime.fromtimestamp(self._train_fetched)
+                refreshed = True
+        if refreshed and context.snapshot_file is not None:
+            save_snapshot(
+                context.weather_object,
+                weather_data,
+                context.train_object,
+                train_data,
+                context.snapshot_file,
+            )
+        return refreshed
+
+    def _stale_since(self) -> Optional[datetime]:
+        """Fetch time of the oldest stale data drawn for the current option"""
+        stale = [self._weather_stale]
+        if self._option == DisplayOption.TRAIN:
+            stale.append(self._train_stale)
+        return min((when for when in stale if when is not None), default=None)
+
+    def _draw(self) -> None:
+        """Draw the held data for the current option and render it
+
+        The display (and its hardware driver) is created on first use and reused
+        for every frame, so driver setup and image allocation happen only once.
+        """
+        assert self._option is not None and self._weather_data is not None
+        if self._display is None:
+            self._display = import_display(self._output)
+        try:
+            draw_data(
+                self._display,
+                self._option,
+                self._output,
+                self._weather_data,
+                self._train_data,
+                self._stale_since(),
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception(exc)
+
+
+def _fetch_or_none(factory: Callable[..., T], request_object: object) -> Optional[T]:
+    """Call a model factory, logging failures instead of raising them
+
+    The factories exit the program on invalid responses; a long-running process
+    keeps showing its last good data and retries instead.
+
+    Args:
+        factory (Callable): train_model_factory or weather_model_factory
+        request_object (object): TrainObject or WeatherObject
+
+    Returns:
+        Provider object, or None if the fetch failed
+    """
+    try:
+        return factory(request_object)
+    except (Exception, SystemExit) as exc:  # pylint: disable=broad-except
+        logger.warning("Fetch failed, keeping last data: {exc!r}", exc=exc)
+        return None
+
+
+def create_scheduler(
+    context: RuntimeContext,
+    output: DisplayOutput,
+    train_interval: Optional[float] = None,
+    weather_interval: Optional[float] = None,
+) -> RefreshScheduler:
+    """Create a refresh scheduler from the runtime context's settings
+
+    Args:
+        context (RuntimeContext): Runtime context
+        output (DisplayOutput): Display output to render to
+        train_interval (float): Overrides SERVE_TRAIN_INTERVAL
+        weather_interval (float): Overrides SERVE_WEATHER_INTERVAL
+
+    Returns:
+        RefreshScheduler: Refresh scheduler
+    """
+    config = context.config
+    return RefreshScheduler(
+        context,
+        # Panel refreshes overlap with fetching and drawing the next frame
+        replace(output, background_commit=True),
+        parse_schedule(config.SERVE_SCHEDULE),
+        train_interval or config.SERVE_TRAIN_INTERVAL,
+        weather_interval or config.SERVE_WEATHER_INTERVAL,
+    )
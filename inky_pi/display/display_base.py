@@ -5,13 +5,18 @@ Abstract class for all display models"""
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum, auto
-from typing import Any, Tuple
+from typing import Any, Iterator, Optional, Tuple, TypeVar
 
+from inky_pi.timing import timed
 from inky_pi.train.train_base import TrainBase
 from inky_pi.weather.weather_base import IconType, ScaleType, WeatherBase
 
+D = TypeVar("D", bound="DisplayBase")
+
 
 class DisplayModel(Enum):
     """Enum of display models"""
@@ -19,22 +24,57 @@ class DisplayModel(Enum):
     INKY = auto()
     TERMINAL = auto()
     DESKTOP = auto()
+    FILE = auto()
+    BUFFER = auto()
+
+
+class DisplayOption(Enum):
+    """Enum of display options"""
+
+    TRAIN = auto()
+    WEATHER = auto()
+    NIGHT = auto()
+
+
+class RefreshPolicy(Enum):
+    """Enum of display refresh policies
+
+    ALWAYS: refresh on every run
+    SKIP_UNCHANGED: skip the refresh if the frame is identical to the last one
+    IGNORE_VOLATILE: also skip it if only volatile regions (the clock) changed
+    """
+
+    ALWAYS = "ALWAYS"
+    SKIP_UNCHANGED = "SKIP_UNCHANGED"
+    IGNORE_VOLATILE = "IGNORE_VOLATILE"
 
 
 @dataclass
 class DisplayOutput:
     """Display output object
 
-    Uses strategy pattern to define display model and base color
+    Uses strategy pattern to define display model, base color and refresh policy;
+    background_commit shows frames on a worker thread instead of blocking, and
+    output_file is the file the FILE model writes frames to
     """
 
     model: DisplayModel
     base_color: str
+    refresh_policy: RefreshPolicy = RefreshPolicy.ALWAYS
+    background_commit: bool = False
+    output_file: str = ""
 
 
 class DisplayBase(ABC):
     """Abstract base class for all display models"""
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Time every draw_* method a display model defines as a refresh stage"""
+        super().__init_subclass__(**kwargs)
+        for name, method in list(vars(cls).items()):
+            if name.startswith("draw_") and callable(method):
+                setattr(cls, name, timed(name)(method))
+
     @abstractmethod
     def draw_date(self, x_y: Tuple[int, int] = (0, 0)) -> None:
         """Display date
@@ -51,6 +91,15 @@ class DisplayBase(ABC):
             x_y: (x, y) coordinates
         """
 
+    @abstractmethod
+    def draw_stale_time(self, fetched: datetime, x_y: Tuple[int, int] = (0, 0)) -> None:
+        """Display the time stale data was fetched, in place of the time
+
+        Args:
+            fetched: time the displayed data was fetched
+            x_y: (x, y) coordinates
+        """
+
     @abstractmethod
     def draw_train_times(
         self, data_t: TrainBase, num_trains: int = 0, x_y: Tuple[int, int] = (0, 0)
@@ -133,13 +182,42 @@ class DisplayBase(ABC):
         """
 
     @abstractmethod
-    def __enter__(self) -> "DisplayBase":
-        """Enter context manager
+    def begin_frame(self, option: Optional[DisplayOption] = None) -> None:
+        """Clear the previous frame so the display object can be drawn on again
+
+        Args:
+            option: display option (layout) of the new frame, if known
+        """
+
+    @abstractmethod
+    def render(self) -> None:
+        """Render the drawn frame to the output"""
+
+    @contextmanager
+    def frame(self: D, option: Optional[DisplayOption] = None) -> Iterator[D]:
+        """Draw one frame: begins the frame, then renders it when the block exits
+
+        Args:
+            option: display option (layout) of the frame, if known
+
+        Yields:
+            self
+        """
+        self.begin_frame(option)
+        try:
+            yield self
+        finally:
+            self.render()
+
+    def __enter__(self: D) -> D:
+        """Enter context manager; begins a new frame without a known layout
 
         Returns:
             self
         """
+        self.begin_frame()
+        return self
 
-    @abstractmethod
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        """Exit context manager"""
+        """Exit context manager; renders the frame"""
+        self.render()
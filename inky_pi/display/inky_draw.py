@@ -5,29 +5,37 @@ Draw strings and icons"""
 import platform
 from datetime import datetime, timedelta
 from time import strftime
-from typing import Any, Callable, Dict, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # pylint: disable=no-name-in-module
 from font_fredoka_one import FredokaOne  # type: ignore
 from font_hanken_grotesk import HankenGroteskBold  # type: ignore
 
 # pylint: enable=no-name-in-module
+from loguru import logger
 from PIL import Image, ImageDraw, ImageFont
 
-from inky_pi.display.display_base import DisplayBase, DisplayModel, DisplayOutput
+from inky_pi.display.display_base import (
+    DisplayBase,
+    DisplayModel,
+    DisplayOption,
+    DisplayOutput,
+    RefreshPolicy,
+)
+from inky_pi.display.util.commit_worker import CommitWorker
 from inky_pi.display.util.desktop_driver import DesktopDisplayDriver
-from inky_pi.display.util.drawing import (
-    draw_cloud_icon,
-    draw_cloud_lightning_icon,
-    draw_cloud_rain_icon,
-    draw_cloud_snow_icon,
-    draw_mist_icon,
-    draw_sun_cloud_icon,
-    draw_sun_cloud_rain_icon,
-    draw_sun_icon,
-    draw_two_clouds_icon,
+from inky_pi.display.util.frame_hash import (
+    Box,
+    FrameDigest,
+    FrameHashStore,
+    frame_digest,
 )
+from inky_pi.display.util.headless_driver import HeadlessDisplayDriver
 from inky_pi.display.util.shapes import gen_closed_eye_icon
+from inky_pi.display.util.sprites import SpriteCache, get_sprite_cache
+from inky_pi.display.util.text_cache import TextCache, get_text_cache
+from inky_pi.metrics import observed
+from inky_pi.timing import timed
 from inky_pi.train.train_base import TrainBase
 from inky_pi.weather.weather_base import IconType, ScaleType, WeatherBase
 
@@ -45,27 +53,173 @@ FONT_GL = ImageFont.truetype(FredokaOne, 40)
 class InkyDraw(DisplayBase):
     """Draw text and shapes onto Inky e-ink display"""
 
-    def __init__(self, display_driver: Any) -> None:
+    def __init__(
+        self,
+        display_driver: Any,
+        sprites: Optional[SpriteCache] = None,
+        refresh_policy: RefreshPolicy = RefreshPolicy.ALWAYS,
+        frame_store: Optional[FrameHashStore] = None,
+        background_commit: bool = False,
+        text_cache: Optional[TextCache] = None,
+    ) -> None:
         """Create display and image drawing objects
         inky_model can be an InkyWHAT model or a DesktopDisplayDriver object
 
         Args:
             display_driver (Any): Display driver (InkyWHAT or DesktopDisplayDriver)
+            sprites (SpriteCache): Weather icon sprites; defaults to the shared cache
+            refresh_policy (RefreshPolicy): When to skip refreshing the display
+            frame_store (FrameHashStore): Store for the last shown frame's digest
+            background_commit (bool): Show frames on a CommitWorker thread
+            text_cache (TextCache): Rendered text bitmaps; defaults to the shared cache
         """
         self._display: Any = display_driver
         self._img: Image.Image = Image.new(
             "P", (self._display.WIDTH, self._display.HEIGHT), color="white"
         )
         self._img_draw: ImageDraw.ImageDraw = ImageDraw.Draw(self._img)
+        self._background: Any = self._img.getpixel((0, 0))
         self._black: Any = self._display.BLACK
         self._white: Any = self._display.WHITE
         self._color: Any = self._display.YELLOW
+        self._sprites: SpriteCache = sprites or get_sprite_cache()
+        self._text_cache: TextCache = text_cache or get_text_cache()
+        self._refresh_policy = refresh_policy
+        self._frame_store = frame_store or FrameHashStore()
+        # Regions ignored by RefreshPolicy.IGNORE_VOLATILE (e.g. the clock)
+        self._volatile: List[Box] = []
+        self._commit_worker: Optional[CommitWorker] = (
+            CommitWorker(self._commit) if background_commit else None
+        )
+        # Static layers: the parts of a layout that never change between frames
+        self._static_painters: Dict[DisplayOption, Callable[[], None]] = {
+            DisplayOption.NIGHT: self._draw_goodnight_static,
+        }
+        self._static_layers: Dict[Tuple[DisplayOption, Any], Image.Image] = {}
+        self._static_option: Optional[DisplayOption] = None
+
+    def begin_frame(self, option: Optional[DisplayOption] = None) -> None:
+        """Clear the image for a new frame, reusing the image and draw context
+
+        The image's palette keeps the colors allocated by earlier frames, so the
+        same color is drawn with the same palette index in every frame. If the
+        layout has static content, the frame starts from a copy of its static
+        layer, which is rendered once per (option, color); the draw_* methods
+        then only draw the dynamic content over it.
+
+        Args:
+            option (DisplayOption): Display option (layout) of the new frame
+        """
+        self._volatile.clear()
+        self._static_option = None
+        painter = self._static_painters.get(option) if option else None
+        if option is None or painter is None:
+            self._img.paste(self._background, (0, 0, *self._img.size))
+            return
+        key = (option, self._color)
+        if key not in self._static_layers:
+            self._img.paste(self._background, (0, 0, *self._img.size))
+            painter()
+            self._static_layers[key] = self._img.copy()
+        else:
+            self._img.paste(self._static_layers[key])
+        self._static_option = option
+
+    def _text(
+        self, x_y: Tuple[int, int], text: str, fill: Any, font: ImageFont.FreeTypeFont
+    ) -> Box:
+        """Draw text from the text bitmap cache
+
+        Args:
+            x_y: (x, y) coordinates
+            text (str): Text
+            fill: Text color
+            font (ImageFont.FreeTypeFont): Font
+
+        Returns:
+            Box: Bounding box of the drawn text
+        """
+        return self._text_cache.draw(self._img_draw, x_y, text, fill, font)
+
+    def _is_unchanged(self, digest: FrameDigest) -> bool:
+        """Check the frame against the last shown one
+
+        Args:
+            digest (FrameDigest): Digests of the frame to show
+
+        Returns:
+            bool: True if the refresh can be skipped under the refresh policy
+        """
+        last = self._frame_store.load()
+        return last is not None and (
+            digest.full == last.full
+            or (
+                self._refresh_policy == RefreshPolicy.IGNORE_VOLATILE
+                and digest.stable == last.stable
+            )
+        )
 
+    @timed("render_screen")
+    @observed("render_seconds")
     def render_screen(self) -> None:
-        """Render border, images (w/text) on inky screen and show on display"""
-        self._display.set_image(self._img)
+        """Render border, images (w/text) on inky screen and show on display
+
+        With a commit worker the frame is handed over and shown in the background.
+        Unless the refresh policy is ALWAYS, the refresh is skipped when the frame
+        matches the one last shown (ignoring volatile regions if so configured).
+        """
+        digest: Optional[FrameDigest] = None
+        if self._refresh_policy != RefreshPolicy.ALWAYS:
+            digest = frame_digest(
+                self._img,
+                self._volatile,
+                f"{type(self._display).__name__}"
+                f"|{getattr(self._display, 'colour', '')}",
+            )
+            if self._is_unchanged(digest):
+                logger.info("Display unchanged; skipping refresh")
+                return
+        if self._commit_worker is None:
+            self._show(self._img, digest)
+        else:
+            # The worker gets a snapshot, as the image is reused by the next frame
+            self._commit_worker.submit((self._img.copy(), digest))
+
+    @property
+    def display_driver(self) -> Any:
+        """Display driver (InkyWHAT, DesktopDisplayDriver or HeadlessDisplayDriver)"""
+        return self._display
+
+    @property
+    def commit_worker(self) -> Optional[CommitWorker]:
+        """Worker showing frames in the background, if enabled"""
+        return self._commit_worker
+
+    @timed("panel_show")
+    @observed("panel_seconds", source="display")
+    def _show(self, image: Image.Image, digest: Optional[FrameDigest] = None) -> None:
+        """Send a frame to the display driver and refresh the panel
+
+        The frame digest is only recorded once the panel has been refreshed, so a
+        failed refresh is retried on the next run instead of being skipped.
+
+        Args:
+            image (Image.Image): Frame
+            digest (FrameDigest): Digests of the frame, recorded after the refresh
+        """
+        self._display.set_image(image)
         self._display.set_border(self._black)
         self._display.show()
+        if digest is not None:
+            self._frame_store.save(digest)
+
+    def _commit(self, frame: Tuple[Image.Image, Optional[FrameDigest]]) -> None:
+        """Show a frame submitted to the commit worker
+
+        Args:
+            frame (tuple): Frame and its digests
+        """
+        self._show(*frame)
 
     def draw_goodnight(
         self, data_w: WeatherBase, scale: ScaleType = ScaleType.CELSIUS
@@ -76,32 +230,37 @@ class InkyDraw(DisplayBase):
             data_w (WeatherBase): Weather data object
             scale (ScaleType): Scale type
         """
-        x_mid, y_mid = self._display.WIDTH // 2, self._display.HEIGHT // 2
-        gen_closed_eye_icon(self._img_draw, self._color, (x_mid, y_mid))
-        # Message text
-        message_str = "Good Night ^^"
-        width, height = 250, 25
-        message_x, message_y = x_mid - (width // 2), y_mid - (height // 2)
-        self._img_draw.text((message_x, message_y), message_str, self._black, FONT_GL)
+        if self._static_option != DisplayOption.NIGHT:
+            self._draw_goodnight_static()
         # Weather text
         x_weather, y_weather = 20, 210
-        self._img_draw.text(
+        self._text(
             (x_weather, y_weather),
             data_w.get_temp_range(1, scale),
             self._color,
             FONT_GM,
         )
-        self._img_draw.text(
+        self._text(
             (x_weather, y_weather + 40), data_w.get_condition(1), self._color, FONT_GS
         )
 
+    def _draw_goodnight_static(self) -> None:
+        """Draw the static part of the goodnight screen: eye icon and message"""
+        x_mid, y_mid = self._display.WIDTH // 2, self._display.HEIGHT // 2
+        gen_closed_eye_icon(self._img_draw, self._color, (x_mid, y_mid))
+        # Message text
+        message_str = "Good Night ^^"
+        width, height = 250, 25
+        message_x, message_y = x_mid - (width // 2), y_mid - (height // 2)
+        self._text((message_x, message_y), message_str, self._black, FONT_GL)
+
     def draw_date(self, x_y: Tuple[int, int] = (10, 5)) -> None:
         """Draw date text
 
         Args:
             x_y: (x, y) coordinates
         """
-        self._img_draw.text(x_y, strftime("%a %d %b %Y"), self._black, FONT_S)
+        self._text(x_y, strftime("%a %d %b %Y"), self._black, FONT_S)
 
     def draw_time(self, x_y: Tuple[int, int] = (257, 5)) -> None:
         """Draw time text
@@ -109,7 +268,25 @@ class InkyDraw(DisplayBase):
         Args:
             x_y: (x, y) coordinates
         """
-        self._img_draw.text(x_y, f"Updated {strftime('%H:%M')}", self._black, FONT_S)
+        text = f"Updated {strftime('%H:%M')}"
+        box = self._text(x_y, text, self._black, FONT_S)
+        # The clock region spans to the right edge, so it covers any time's width
+        self._volatile.append((box[0], box[1], self._display.WIDTH, box[3]))
+
+    def draw_stale_time(
+        self, fetched: datetime, x_y: Tuple[int, int] = (257, 5)
+    ) -> None:
+        """Draw the time stale data was fetched, in the accent color
+
+        Args:
+            fetched (datetime): Time the displayed data was fetched
+            x_y: (x, y) coordinates
+        """
+        when = fetched.strftime(
+            "%H:%M" if fetched.date() == datetime.now().date() else "%d %b"
+        )
+        # Not volatile: the fresh frame replacing it must always be shown
+        self._text(x_y, f"Stale {when}", self._color, FONT_S)
 
     def draw_train_times(
         self, data_t: TrainBase, num_trains: int = 3, x_y: Tuple[int, int] = (10, 205)
@@ -123,10 +300,10 @@ class InkyDraw(DisplayBase):
             num_trains (int): Number of train info to draw
             x_y: (x, y) coordinates
         """
-        for i in range(0, num_trains):
-            self._img_draw.text(
+        for i, train in enumerate(data_t.fetch_trains(num_trains)):
+            self._text(
                 (x_y[0], x_y[1] + i * 30),
-                data_t.fetch_train(i),
+                train,
                 self._black,
                 FONT_S,
             )
@@ -151,29 +328,27 @@ class InkyDraw(DisplayBase):
             x_y: (x, y) coordinates
             disp_tomorrow (bool): Display tomorrow's weather forecast
         """
-        self._img_draw.text(
+        self._text(
             x_y,
             data_w.get_current_temperature(scale),
             self._black,
             FONT_XL,
         )
-        self._img_draw.text(
+        self._text(
             (x_y[0] + 140, x_y[1] + 13),
             data_w.get_current_condition(),
             self._black,
             FONT_M,
         )
-        self._img_draw.text(
+        self._text(
             (x_y[0], x_y[1] + 50),
             data_w.get_temp_range(0, scale),
             self._black,
             FONT_M,
         )
-        self._img_draw.text(
-            (x_y[0], x_y[1] + 80), data_w.get_condition(0), self._black, FONT_M
-        )
+        self._text((x_y[0], x_y[1] + 80), data_w.get_condition(0), self._black, FONT_M)
         if disp_tomorrow:
-            self._img_draw.text(
+            self._text(
                 (x_y[0], x_y[1] + 110),
                 "tomorrow: " + data_w.get_condition(1),
                 self._black,
@@ -185,24 +360,13 @@ class InkyDraw(DisplayBase):
         icon: IconType,
         x_y: Tuple[int, int] = (30, 90),
     ) -> None:
-        """Draws specified icon
+        """Draws specified icon from its pre-rendered sprite
 
         Args:
             icon (IconType): Weather IconType to draw
             x_y: (x, y) coordinates
         """
-        draw_icon_dispatcher: Dict[IconType, Callable[..., None]] = {
-            IconType.CLEAR_SKY: draw_sun_icon,
-            IconType.FEW_CLOUDS: draw_sun_cloud_icon,
-            IconType.SCATTERED_CLOUDS: draw_cloud_icon,
-            IconType.BROKEN_CLOUDS: draw_two_clouds_icon,
-            IconType.SHOWER_RAIN: draw_cloud_rain_icon,
-            IconType.RAIN: draw_sun_cloud_rain_icon,
-            IconType.THUNDERSTORM: draw_cloud_lightning_icon,
-            IconType.SNOW: draw_cloud_snow_icon,
-            IconType.MIST: draw_mist_icon,
-        }
-        draw_icon_dispatcher[icon](self._img_draw, self._black, self._white, x_y)
+        self._sprites.draw(self._img_draw, icon, self._black, self._white, x_y)
 
     def draw_mini_forecast(
         self,
@@ -221,14 +385,14 @@ class InkyDraw(DisplayBase):
         """
         new_date = datetime.now() + timedelta(days=day)
         if day > 0:
-            self._img_draw.text(
+            self._text(
                 (x_y[0] + 10, x_y[1] + 5),
                 new_date.strftime("%a %d"),
                 self._black,
                 FONT_XS,
             )
         self.draw_weather_icon(data_w.get_icon(day), (x_y[0], x_y[1] + 27))
-        self._img_draw.text(
+        self._text(
             ((x_y[0] + 10 if day > 0 else x_y[0]), x_y[1] + 90),
             data_w.get_future_weather(day, scale),
             self._black,
@@ -254,11 +418,8 @@ class InkyDraw(DisplayBase):
                 data_w, scale, (x_y[0] + (i * spacing), x_y[1]), i + 1
             )
 
-    def __enter__(self) -> "InkyDraw":
-        return self
-
-    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        """Exit context manager; render the drawn screen"""
+    def render(self) -> None:
+        """Render the drawn screen on the display (see render_screen)"""
         self.render_screen()
 
 
@@ -287,9 +448,18 @@ def instantiate_inky_display(display_object: DisplayOutput) -> InkyDraw:
     Returns:
         InkyDraw: InkyDraw object
     """
-    display_driver = (
-        _import_inky_what()
-        if display_object.model == DisplayModel.INKY
-        else DesktopDisplayDriver
+    base_color = f"{display_object.base_color}"
+    display_driver: Any
+    if display_object.model == DisplayModel.INKY:
+        display_driver = _import_inky_what()(base_color)
+    elif display_object.model == DisplayModel.FILE:
+        display_driver = HeadlessDisplayDriver(base_color, display_object.output_file)
+    elif display_object.model == DisplayModel.BUFFER:
+        display_driver = HeadlessDisplayDriver(base_color)
+    else:
+        display_driver = DesktopDisplayDriver(base_color)
+    return InkyDraw(
+        display_driver,
+        refresh_policy=display_object.refresh_policy,
+        background_commit=display_object.background_commit,
     )
-    return InkyDraw(display_driver(f"{display_object.base_color}"))
@@ -2,13 +2,16 @@
 
 Draws data to terminal"""
 
+from datetime import datetime
 from time import strftime
-from typing import Any, Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from rich.console import Console
 from rich.panel import Panel
 
-from inky_pi.display.display_base import DisplayBase, DisplayOutput
+from inky_pi.display.display_base import DisplayBase, DisplayOption, DisplayOutput
+from inky_pi.metrics import observed
+from inky_pi.timing import timed
 from inky_pi.train.train_base import TrainBase
 from inky_pi.weather.weather_base import IconType, ScaleType, WeatherBase
 
@@ -29,6 +32,8 @@ class TerminalDraw(DisplayBase):
         self._console = Console()
         self._output: List[str] = []
 
+    @timed("render_screen")
+    @observed("render_seconds", source="display")
     def render_text(self) -> None:
         """Render collected text onto the terminal"""
         panel = Panel(
@@ -56,6 +61,15 @@ class TerminalDraw(DisplayBase):
         time = strftime("%H:%M")
         self._output.append(time)
 
+    def draw_stale_time(self, fetched: datetime, x_y: Tuple[int, int] = (0, 0)) -> None:
+        """Append the time stale data was fetched to terminal text
+
+        Args:
+            fetched: time the displayed data was fetched
+            x_y: (x, y) coordinates
+        """
+        self._output.append(f"Stale data from {fetched.strftime('%d %b %H:%M')}")
+
     def draw_train_times(
         self, data_t: TrainBase, num_trains: int = 3, x_y: Tuple[int, int] = (0, 0)
     ) -> None:
@@ -69,9 +83,7 @@ class TerminalDraw(DisplayBase):
         self._output.append(
             f"Train schedule from {data_t.origin} to {data_t.destination}:"
         )
-        for i in range(num_trains):
-            train = data_t.fetch_train(i)
-            self._output.append(train)
+        self._output.extend(data_t.fetch_trains(num_trains))
 
     def draw_weather_forecast(
         self,
@@ -173,16 +185,16 @@ class TerminalDraw(DisplayBase):
         self._output.append(message)
         self._output.append(f"Tomorrow's Temperature: {temp}")
 
-    def __enter__(self) -> "TerminalDraw":
-        """Enter context manager
+    def begin_frame(self, option: Optional[DisplayOption] = None) -> None:
+        """Discard the text collected for the previous frame
 
-        Returns:
-            self
+        Args:
+            option: display option (layout) of the new frame, if known
         """
-        return self
+        self._output.clear()
 
-    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        """Exit context manager"""
+    def render(self) -> None:
+        """Render the collected text on the terminal (see render_text)"""
         self.render_text()
 
 
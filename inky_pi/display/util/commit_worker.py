@@ -0,0 +1,116 @@
+"""Background display commit worker
+
+An e-ink refresh blocks for several seconds while the panel updates. The worker
+commits frames to the display on its own thread, so the caller can fetch and draw
+the next frame in the meantime. Its mailbox holds a single frame: a frame that is
+still pending when a newer one arrives is dropped, so only the newest frame is
+shown and bursts of updates never queue up behind a slow refresh.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+import weakref
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+# Open workers, closed by a single exit hook rather than one atexit registration
+# per worker, which would hold on to every worker ever created
+_workers: weakref.WeakSet[CommitWorker] = weakref.WeakSet()
+
+
+@atexit.register
+def _close_workers() -> None:
+    """Commit the pending frames of all live workers before the interpreter exits"""
+    for worker in list(_workers):
+        worker.close()
+
+
+class CommitWorker:
+    """Commits the newest submitted frame on a dedicated thread"""
+
+    def __init__(self, commit: Callable[[Any], None], name: str = "inky_commit"):
+        """Start the worker thread
+
+        Pending frames are committed before the interpreter exits.
+
+        Args:
+            commit (Callable): Shows a frame on the display (e.g. a PIL image)
+            name (str): Worker thread name
+        """
+        self._commit = commit
+        self._condition = threading.Condition()
+        self._pending: Optional[Any] = None
+        self._busy = False
+        self._closed = False
+        self.committed = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        _workers.add(self)
+
+    def submit(self, frame: Any) -> None:
+        """Queue a frame for display, replacing any frame still pending
+
+        Args:
+            frame (Any): Frame to commit; must not be modified afterwards
+
+        Raises:
+            RuntimeError: If the worker has been closed
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Display commit worker is closed")
+            if self._pending is not None:
+                self.dropped += 1
+                logger.debug("Dropping superseded frame")
+            self._pending = frame
+            self._condition.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no frame is pending or being committed
+
+        Args:
+            timeout (float): Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if the worker is idle
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and not self._busy, timeout
+            )
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Commit any pending frame, then stop the worker thread
+
+        Args:
+            timeout (float): Seconds to wait, or None to wait indefinitely
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        _workers.discard(self)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Commit frames as they arrive until closed and drained"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending is not None or self._closed
+                )
+                if self._pending is None:
+                    return
+                frame, self._pending, self._busy = self._pending, None, True
+            try:
+                self._commit(frame)
+                self.committed += 1
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.exception(exc)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
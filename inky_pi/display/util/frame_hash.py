@@ -0,0 +1,118 @@
+"""Frame hashing for skipping unchanged e-ink refreshes
+
+A full e-ink refresh is slow and flashes the panel, so the digest of the last
+frame sent to the panel is persisted between runs. A digest is taken of the whole
+frame and one with the volatile regions (e.g. the "Updated HH:MM" clock) blanked,
+so a refresh can be skipped when the frame is identical or only those regions
+differ.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+from loguru import logger
+from PIL import Image
+
+from inky_pi.cache import CACHE_DIR
+
+FRAME_HASH_FILE = CACHE_DIR.joinpath("frame_hash.json")
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class FrameDigest:
+    """Digests of a frame: whole frame, and with volatile regions blanked"""
+
+    full: str
+    stable: str
+
+
+def _digest(image: Image.Image, salt: str) -> str:
+    """Digest of a P-mode frame's pixels and palette
+
+    Args:
+        image (Image.Image): Frame
+        salt (str): Panel identity (e.g. driver and colour)
+
+    Returns:
+        str: Hex digest
+    """
+    sha = hashlib.sha256(f"{salt}|{image.mode}|{image.size}".encode("utf-8"))
+    sha.update(bytes(image.getpalette() or ()))
+    sha.update(image.tobytes())
+    return sha.hexdigest()
+
+
+def frame_digest(
+    image: Image.Image, volatile: Sequence[Box] = (), salt: str = ""
+) -> FrameDigest:
+    """Digest a frame, with and without its volatile regions
+
+    Args:
+        image (Image.Image): Frame
+        volatile (Sequence[Box]): Regions ignored by the stable digest
+        salt (str): Panel identity (e.g. driver and colour)
+
+    Returns:
+        FrameDigest: Frame digests
+    """
+    full = _digest(image, salt)
+    if not volatile:
+        return FrameDigest(full, full)
+    stable = image.copy()
+    for box in volatile:
+        stable.paste(0, box)
+    return FrameDigest(full, _digest(stable, salt))
+
+
+class FrameHashStore:
+    """Persists the digest of the frame last shown on the panel"""
+
+    def __init__(self, path: Path = FRAME_HASH_FILE) -> None:
+        """Initialize frame hash store
+
+        Args:
+            path (Path): File to persist the digest in
+        """
+        self._path = path
+
+    def load(self) -> Optional[FrameDigest]:
+        """Return the digest of the frame last shown, if known
+
+        Returns:
+            FrameDigest: Frame digests, or None
+        """
+        try:
+            with open(self._path, "r", encoding="utf-8") as file:
+                return FrameDigest(**json.load(file))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Ignoring unreadable frame hash: {exc}", exc=exc)
+            return None
+
+    def save(self, digest: FrameDigest) -> None:
+        """Record the digest of the frame now shown
+
+        Args:
+            digest (FrameDigest): Frame digests
+        """
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(asdict(digest), file)
+            os.replace(tmp_path, self._path)
+        except OSError as exc:
+            logger.warning("Unable to store frame hash: {exc}", exc=exc)
+
+    def clear(self) -> None:
+        """Forget the last frame, forcing the next refresh"""
+        self._path.unlink(missing_ok=True)
@@ -0,0 +1,112 @@
+"""Headless Display Driver
+
+This class is a drop-in replacement for the Inky library InkyWHAT class that
+renders frames without a panel or an image viewer. Each shown frame is encoded as
+a PNG or as raw packed bit planes and kept in memory as bytes, optionally also
+written to a file, so frames can be rendered in CI, on a server and in benchmarks.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from enum import Enum
+from pathlib import Path
+from typing import List, Optional
+
+from inky_pi.display.util.desktop_driver import DesktopDisplayDriver
+
+
+class HeadlessFormat(Enum):
+    """Enum of headless frame encodings
+
+    PNG: PNG image
+    RAW: packed 1-bit planes as sent to the panel: a black plane, followed by a
+    colour plane unless the display is black only
+    """
+
+    PNG = "png"
+    RAW = "raw"
+
+    @classmethod
+    def from_path(cls, path: Path | str) -> "HeadlessFormat":
+        """Select the encoding from a file extension (.png, or .raw/.bin)
+
+        Args:
+            path (Path | str): Output file path
+
+        Returns:
+            HeadlessFormat: Frame encoding
+        """
+        return cls.PNG if Path(path).suffix.lower() == ".png" else cls.RAW
+
+
+class HeadlessDisplayDriver(DesktopDisplayDriver):
+    """Headless Display Driver."""
+
+    def __init__(
+        self,
+        base_color: str = "",
+        path: Optional[Path | str] = None,
+        frame_format: Optional[HeadlessFormat] = None,
+    ) -> None:
+        """Initialize display driver.
+
+        Args:
+            base_color: base color
+            path: file to write each frame to; frames are only kept in memory if None
+            frame_format: frame encoding; from the path's extension (or PNG) if None
+        """
+        super().__init__(base_color)
+        self.path: Optional[Path] = Path(path) if path else None
+        self.frame_format: HeadlessFormat = frame_format or (
+            HeadlessFormat.from_path(self.path) if self.path else HeadlessFormat.PNG
+        )
+        self.buffer: bytes = b""
+
+    def planes(self) -> List[bytes]:
+        """Pack the image into 1-bit planes, one per ink
+
+        Returns:
+            list: Black plane, and the colour plane for non-black displays
+        """
+        if self._img is None:
+            raise RuntimeError("No image to show")
+        image = self._img if self._img.mode == "P" else self._img.convert("P")
+        palette = image.getpalette("RGB") or []
+        colors = [tuple(palette[i : i + 3]) for i in range(0, len(palette), 3)]
+        inks = [self.BLACK] if self._color == self.BLACK else [self.BLACK, self._color]
+        return [
+            image.point(
+                [255 * (color == ink[:3]) for color in colors]
+                + [0] * (256 - len(colors)),
+                "1",
+            ).tobytes()
+            for ink in inks
+        ]
+
+    def encode(self) -> bytes:
+        """Encode the image in the frame format
+
+        Returns:
+            bytes: Encoded frame
+        """
+        if self._img is None:
+            raise RuntimeError("No image to show")
+        if self.frame_format == HeadlessFormat.RAW:
+            return b"".join(self.planes())
+        stream = io.BytesIO()
+        self._img.save(stream, format="PNG", optimize=False, compress_level=1)
+        return stream.getvalue()
+
+    def show(self) -> None:
+        """Show image
+
+        Encodes the image into the buffer and writes it to the output file, if any.
+        """
+        self.buffer = self.encode()
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(self.buffer)
+            os.replace(tmp_path, self.path)
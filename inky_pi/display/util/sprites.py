@@ -0,0 +1,220 @@
+"""Pre-rendered weather icon sprites
+
+Each weather icon is rasterised once from its vector drawing function into a
+colour-independent sprite: a 1-bit mask for the outline pixels, one for the
+negative space pixels (and one per literal ink the shapes use). Drawing an icon is
+then a few bitmap blits in the requested colours. Sprites are kept in memory and
+optionally stored on disk so a fresh process can skip rasterising; stored sprites
+are keyed on a digest of the drawing sources, so they are redrawn when the shapes
+change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+from PIL import Image, ImageDraw
+
+from inky_pi.cache import CACHE_DIR
+from inky_pi.display.util import drawing, shapes
+from inky_pi.display.util.drawing import (
+    draw_cloud_icon,
+    draw_cloud_lightning_icon,
+    draw_cloud_rain_icon,
+    draw_cloud_snow_icon,
+    draw_mist_icon,
+    draw_sun_cloud_icon,
+    draw_sun_cloud_rain_icon,
+    draw_sun_icon,
+    draw_two_clouds_icon,
+)
+from inky_pi.weather.weather_base import IconType
+
+SPRITE_DIR = CACHE_DIR.joinpath("sprites")
+# Icons are drawn at SPRITE_ORIGIN on a canvas large enough for any icon
+SPRITE_CANVAS: Tuple[int, int] = (160, 160)
+SPRITE_ORIGIN: Tuple[int, int] = (32, 32)
+
+ICON_DRAWERS: Dict[IconType, Callable[..., None]] = {
+    IconType.CLEAR_SKY: draw_sun_icon,
+    IconType.FEW_CLOUDS: draw_sun_cloud_icon,
+    IconType.SCATTERED_CLOUDS: draw_cloud_icon,
+    IconType.BROKEN_CLOUDS: draw_two_clouds_icon,
+    IconType.SHOWER_RAIN: draw_cloud_rain_icon,
+    IconType.RAIN: draw_sun_cloud_rain_icon,
+    IconType.THUNDERSTORM: draw_cloud_lightning_icon,
+    IconType.SNOW: draw_cloud_snow_icon,
+    IconType.MIST: draw_mist_icon,
+}
+
+# Canvas values for untouched pixels and the outline/negative space colours; any
+# other value is a literal ink passed by the shapes and is drawn unchanged
+_BACKGROUND, _INK, _NEGATIVE = 0, 254, 255
+
+
+@dataclass(frozen=True)
+class Sprite:
+    """Rasterised icon: offset from the icon position and a 1-bit mask per ink"""
+
+    offset: Tuple[int, int]
+    layers: Tuple[Tuple[int, Image.Image], ...]
+
+    def draw(
+        self,
+        draw: ImageDraw.ImageDraw,
+        color: Any,
+        color_neg: Any,
+        x_y: Tuple[int, int],
+    ) -> None:
+        """Blit sprite; equivalent to calling the icon's drawing function
+
+        Args:
+            draw: ImageDraw object
+            color: Color of the outlines
+            color_neg: Color of the negative space
+            x_y: (x, y) coordinates
+        """
+        box = (x_y[0] + self.offset[0], x_y[1] + self.offset[1])
+        inks = {_INK: color, _NEGATIVE: color_neg}
+        for value, mask in self.layers:
+            draw.bitmap(box, mask, fill=inks.get(value, value))
+
+
+def _sprite_from_canvas(canvas: Image.Image) -> Sprite:
+    """Crop a rasterised canvas to its drawn area and split it into masks
+
+    Args:
+        canvas (Image.Image): "L" canvas from rasterise_icon
+
+    Returns:
+        Sprite: Sprite
+    """
+    bbox = canvas.getbbox() or (0, 0, 1, 1)
+    cropped = canvas.crop(bbox)
+    offset = (bbox[0] - SPRITE_ORIGIN[0], bbox[1] - SPRITE_ORIGIN[1])
+    layers = tuple(
+        (value, cropped.point([255 * (v == value) for v in range(256)], "1"))
+        for value, count in enumerate(cropped.histogram())
+        if count and value != _BACKGROUND
+    )
+    return Sprite(offset, layers)
+
+
+def rasterise_icon(icon: IconType) -> Image.Image:
+    """Draw an icon's vector shapes onto a colour-independent canvas
+
+    Args:
+        icon (IconType): Weather icon
+
+    Returns:
+        Image.Image: "L" canvas holding _BACKGROUND/_INK/_NEGATIVE values
+    """
+    canvas = Image.new("L", SPRITE_CANVAS, _BACKGROUND)
+    ICON_DRAWERS[icon](ImageDraw.Draw(canvas), _INK, _NEGATIVE, SPRITE_ORIGIN)
+    return canvas
+
+
+@lru_cache(maxsize=None)
+def _source_digest() -> str:
+    """Digest of the icon drawing sources, used to invalidate stored sprites"""
+    sha = hashlib.sha256()
+    for module in (drawing, shapes):
+        sha.update(Path(str(module.__file__)).read_bytes())
+    return sha.hexdigest()[:16]
+
+
+class SpriteCache:
+    """In-memory weather icon sprite cache with an optional on-disk warm store"""
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        """Initialize sprite cache
+
+        Args:
+            directory (Path): Directory to store rasterised sprites in, if any
+        """
+        self._directory = directory
+        self._sprites: Dict[IconType, Sprite] = {}
+
+    @staticmethod
+    def _path(directory: Path, icon: IconType) -> Path:
+        return directory.joinpath(f"{icon.name.lower()}-{_source_digest()}.png")
+
+    def _load_canvas(self, icon: IconType) -> Image.Image:
+        """Load an icon canvas from the warm store, rasterising it on a miss
+
+        Args:
+            icon (IconType): Weather icon
+
+        Returns:
+            Image.Image: Rasterised canvas
+        """
+        if self._directory is None:
+            return rasterise_icon(icon)
+        path = self._path(self._directory, icon)
+        try:
+            with Image.open(path) as stored:
+                stored.load()
+                if stored.mode == "L" and stored.size == SPRITE_CANVAS:
+                    warm: Image.Image = stored.copy()
+                    return warm
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.warning(
+                "Ignoring unreadable sprite {path}: {exc}", path=path, exc=exc
+            )
+
+        canvas = rasterise_icon(icon)
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            canvas.save(path, format="PNG")
+        except OSError as exc:
+            logger.warning("Unable to store sprite {path}: {exc}", path=path, exc=exc)
+        return canvas
+
+    def get(self, icon: IconType) -> Sprite:
+        """Return the sprite for an icon, rasterising it on first use
+
+        Args:
+            icon (IconType): Weather icon
+
+        Returns:
+            Sprite: Sprite
+        """
+        if icon not in self._sprites:
+            self._sprites[icon] = _sprite_from_canvas(self._load_canvas(icon))
+        return self._sprites[icon]
+
+    def draw(
+        self,
+        draw: ImageDraw.ImageDraw,
+        icon: IconType,
+        color: Any,
+        color_neg: Any,
+        x_y: Tuple[int, int],
+    ) -> None:
+        """Draw an icon from its cached sprite
+
+        Args:
+            draw: ImageDraw object
+            icon (IconType): Weather icon
+            color: Color of the outlines
+            color_neg: Color of the negative space
+            x_y: (x, y) coordinates
+        """
+        self.get(icon).draw(draw, color, color_neg, x_y)
+
+
+@lru_cache(maxsize=None)
+def get_sprite_cache() -> SpriteCache:
+    """Returns the process-wide sprite cache, backed by SPRITE_DIR
+
+    Returns:
+        SpriteCache: Shared sprite cache
+    """
+    return SpriteCache(SPRITE_DIR)
@@ -0,0 +1,178 @@
+"""Rendered text bitmap cache
+
+Most strings drawn on the display repeat between frames (the date, condition
+descriptions, station names). Each string is shaped and rasterised through
+FreeType once into a 1-bit mask with its bounding box; drawing it again is a
+single bitmap blit. Masks are colour-independent, so one entry serves every fill
+colour. The cache is a bounded LRU with hit/miss counters.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, NamedTuple, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+TEXT_CACHE_SIZE = 256
+
+Box = Tuple[int, int, int, int]
+
+
+class CacheInfo(NamedTuple):
+    """Text cache statistics, as returned by functools' cache_info()"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+@dataclass(frozen=True)
+class TextBitmap:
+    """Rasterised text: bounding box relative to the text origin and 1-bit mask"""
+
+    bbox: Box
+    mask: Image.Image
+
+    def box_at(self, x_y: Tuple[int, int]) -> Box:
+        """Bounding box of the text drawn at a position
+
+        Args:
+            x_y: (x, y) coordinates
+
+        Returns:
+            Box: (left, top, right, bottom)
+        """
+        return (
+            x_y[0] + self.bbox[0],
+            x_y[1] + self.bbox[1],
+            x_y[0] + self.bbox[2],
+            x_y[1] + self.bbox[3],
+        )
+
+    def draw(self, draw: ImageDraw.ImageDraw, x_y: Tuple[int, int], fill: Any) -> None:
+        """Blit text; equivalent to ImageDraw.text on a non-antialiased image
+
+        Args:
+            draw: ImageDraw object
+            x_y: (x, y) coordinates
+            fill: Text color
+        """
+        if self.mask.width and self.mask.height:
+            draw.bitmap(self.box_at(x_y)[:2], self.mask, fill=fill)
+
+
+def rasterise_text(text: str, font: ImageFont.FreeTypeFont) -> TextBitmap:
+    """Rasterise single-line text into a 1-bit mask cropped to its bounding box
+
+    Args:
+        text (str): Text
+        font (ImageFont.FreeTypeFont): Font
+
+    Returns:
+        TextBitmap: Text bitmap
+    """
+    bbox: Box = tuple(int(v) for v in font.getbbox(text, mode="1"))  # type: ignore
+    mask = Image.new("1", (bbox[2] - bbox[0], bbox[3] - bbox[1]))
+    if mask.width and mask.height:
+        ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), text, 1, font)
+    return TextBitmap(bbox, mask)
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text bitmaps keyed by (text, font)"""
+
+    def __init__(self, maxsize: int = TEXT_CACHE_SIZE) -> None:
+        """Initialize text cache
+
+        Args:
+            maxsize (int): Maximum number of text bitmaps kept
+        """
+        self._maxsize = maxsize
+        self._bitmaps: OrderedDict[Tuple[str, Any], TextBitmap] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str, font: ImageFont.FreeTypeFont) -> TextBitmap:
+        """Return the bitmap for a string, rasterising it on a miss
+
+        Args:
+            text (str): Single-line text
+            font (ImageFont.FreeTypeFont): Font
+
+        Returns:
+            TextBitmap: Text bitmap
+        """
+        key = (text, font)
+        with self._lock:
+            bitmap = self._bitmaps.get(key)
+            if bitmap is not None:
+                self._bitmaps.move_to_end(key)
+                self.hits += 1
+                return bitmap
+            self.misses += 1
+        bitmap = rasterise_text(text, font)
+        with self._lock:
+            self._bitmaps[key] = bitmap
+            while len(self._bitmaps) > self._maxsize:
+                self._bitmaps.popitem(last=False)
+        return bitmap
+
+    def draw(
+        self,
+        draw: ImageDraw.ImageDraw,
+        x_y: Tuple[int, int],
+        text: str,
+        fill: Any,
+        font: ImageFont.FreeTypeFont,
+    ) -> Box:
+        """Draw text from its cached bitmap
+
+        Multi-line text is drawn directly, as it is laid out line by line.
+
+        Args:
+            draw: ImageDraw object
+            x_y: (x, y) coordinates
+            text (str): Text
+            fill: Text color
+            font (ImageFont.FreeTypeFont): Font
+
+        Returns:
+            Box: Bounding box of the drawn text
+        """
+        if "\n" in text:
+            draw.text(x_y, text, fill, font)
+            return tuple(int(v) for v in draw.textbbox(x_y, text, font))  # type: ignore
+        bitmap = self.get(text, font)
+        bitmap.draw(draw, x_y, fill)
+        return bitmap.box_at(x_y)
+
+    def cache_info(self) -> CacheInfo:
+        """Return cache statistics
+
+        Returns:
+            CacheInfo: Hits, misses, maximum and current size
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self._maxsize, len(self._bitmaps))
+
+    def clear(self) -> None:
+        """Remove all bitmaps and reset the counters"""
+        with self._lock:
+            self._bitmaps.clear()
+            self.hits = self.misses = 0
+
+
+@lru_cache(maxsize=None)
+def get_text_cache() -> TextCache:
+    """Returns the process-wide text cache
+
+    Returns:
+        TextCache: Shared text cache
+    """
+    return TextCache()
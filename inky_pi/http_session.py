@@ -0,0 +1,157 @@
+"""Shared HTTP session for inky_pi providers.
+
+A single pooled requests session is reused for every HTTP provider refresh, so a
+long-running process keeps its connections (and TLS sessions) alive between polls.
+Every request gets explicit connect/read timeouts and bounded, backed-off retries,
+set from the settings by ``configure_http``. The async providers use an
+httpx.AsyncClient configured the same way (httpx is an optional dependency,
+installed with the "async" extra).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+if TYPE_CHECKING:
+    import httpx
+
+HTTP_TIMEOUT: Tuple[float, float] = (3.05, 10.0)  # (connect, read) seconds
+HTTP_RETRIES = 2
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_POOL_SIZE = 4
+
+_timeout: Tuple[float, float] = HTTP_TIMEOUT
+_retries: int = HTTP_RETRIES
+
+
+def configure_http(timeout: Tuple[float, float], retries: int) -> None:
+    """Set the timeout and retries of the shared session and new async clients
+
+    Args:
+        timeout: default (connect, read) timeout in seconds
+        retries: maximum retries for connection errors and retryable statuses
+    """
+    global _timeout, _retries  # pylint: disable=global-statement
+    if (timeout, retries) != (_timeout, _retries):
+        _timeout, _retries = timeout, retries
+        get_http_session.cache_clear()
+
+
+def get_http_timeout() -> Tuple[float, float]:
+    """Returns the configured timeout, for clients that are not built here
+
+    Returns:
+        Tuple[float, float]: (connect, read) timeout in seconds
+    """
+    return _timeout
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies a default timeout to every request"""
+
+    def __init__(self, timeout: Tuple[float, float] = HTTP_TIMEOUT) -> None:
+        """Initialize session
+
+        Args:
+            timeout: default (connect, read) timeout in seconds
+        """
+        super().__init__()
+        self.timeout = timeout
+
+    def request(  # type: ignore[override]
+        self, method: str, url: str, *args: Any, **kwargs: Any
+    ) -> requests.Response:
+        """Send a request, using the session timeout unless one is given
+
+        Args:
+            method (str): HTTP method
+            url (str): URL
+
+        Returns:
+            requests.Response: Response object
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, *args, **kwargs)
+
+
+def create_http_session(
+    timeout: Tuple[float, float] = HTTP_TIMEOUT,
+    retries: int = HTTP_RETRIES,
+    backoff_factor: float = HTTP_BACKOFF_FACTOR,
+    pool_size: int = HTTP_POOL_SIZE,
+) -> TimeoutSession:
+    """Creates a pooled, keep-alive HTTP session with timeouts and retries
+
+    Args:
+        timeout: default (connect, read) timeout in seconds
+        retries: maximum retries for connection errors and retryable statuses
+        backoff_factor: exponential backoff factor between retries
+        pool_size: connections kept alive per host
+
+    Returns:
+        TimeoutSession: Configured session
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session = TimeoutSession(timeout)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@lru_cache(maxsize=None)
+def get_http_session() -> TimeoutSession:
+    """Returns the process-wide HTTP session, creating it on first use
+
+    Returns:
+        TimeoutSession: Shared session, with the configured timeout and retries
+    """
+    return create_http_session(_timeout, _retries)
+
+
+def create_async_http_client(
+    timeout: Optional[Tuple[float, float]] = None,
+    retries: Optional[int] = None,
+    pool_size: int = HTTP_POOL_SIZE,
+) -> httpx.AsyncClient:
+    """Creates a pooled, keep-alive async HTTP client with timeouts and retries
+
+    httpx only retries failed connection attempts, not error statuses.
+
+    Args:
+        timeout: default (connect, read) timeout in seconds (default: configured)
+        retries: maximum retries for connection errors (default: configured)
+        pool_size: maximum (and keep-alive) connections
+
+    Returns:
+        httpx.AsyncClient: Configured client; close with ``aclose`` or ``async with``
+    """
+    # pylint: disable=import-outside-toplevel
+    import httpx
+
+    timeout = _timeout if timeout is None else timeout
+    retries = _retries if retries is None else retries
+
+    transport = httpx.AsyncHTTPTransport(
+        retries=retries,
+        limits=httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        ),
+    )
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout[1], connect=timeout[0]), transport=transport
+    )
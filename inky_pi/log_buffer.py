@@ -0,0 +1,164 @@
+"""Buffered, batched log file sink for SD-card friendly operation.
+
+Records are formatted by loguru as usual (JSON when serialized) but, instead of
+being written to inky.log inline with the refresh, they are kept in a bounded
+in-memory ring buffer. A background thread writes them in one batch every flush
+interval, as soon as a record at or above the flush level arrives, and when the
+sink is removed (loguru removes its sinks at exit). When a log storm fills the
+buffer, the oldest records are dropped, so memory stays bounded, and the next
+batch starts with a warning line giving the count of dropped records. Batches
+that cannot be written are counted as dropped in the same way. The sink writes
+that line itself: logging it through loguru from the flush thread could
+deadlock with the sink being removed.
+
+Enabled by ``configure_logging(buffered=True)`` or the INKY_PI_LOG_BUFFER=1
+environment variable.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, List
+
+from loguru import logger
+
+LOG_BUFFER_CAPACITY = 1000
+LOG_FLUSH_INTERVAL = 5.0
+LOG_FLUSH_LEVEL = "ERROR"
+
+
+class BufferedFileSink:
+    """loguru sink writing records to a size-rotated file in background batches"""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        path: Path,
+        rotation_bytes: int,
+        capacity: int = LOG_BUFFER_CAPACITY,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        flush_level: str = LOG_FLUSH_LEVEL,
+        serialize: bool = True,
+    ) -> None:
+        """Initialize sink and start the flush thread
+
+        Args:
+            path (Path): Log file
+            rotation_bytes (int): Size at which the log file is rotated
+            capacity (int): Maximum number of buffered records
+            flush_interval (float): Seconds between batched writes
+            flush_level (str): Level name; records at or above it are flushed
+                without waiting for the interval
+            serialize (bool): Whether records are serialized to JSON, so the
+                dropped records warning is written in the same format
+        """
+        self.path = path
+        self.rotation_bytes = rotation_bytes
+        self.flush_interval = flush_interval
+        self.flush_level_no = logger.level(flush_level).no
+        self.serialize = serialize
+        self.dropped = 0
+        self._buffer: Deque[str] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="inky_log_flush", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message: Any) -> None:
+        """Buffer a formatted record; called by loguru for each record
+
+        Args:
+            message (loguru.Message): Formatted record, with the record attached
+        """
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(str(message))
+        if message.record["level"].no >= self.flush_level_no:
+            self._wake.set()
+
+    def stop(self) -> None:
+        """Stop the flush thread and write the remaining records"""
+        self._stopped = True
+        self._wake.set()
+        self._thread.join()
+        self._flush()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopped:
+                return
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write all buffered records in one batch
+
+        The batch starts with a warning if records were dropped since the
+        previous flush. If the batch cannot be written (e.g. the SD card is full
+        or read-only), its records are counted as dropped, so the flush thread
+        keeps running and the next batch that is written reports them.
+        """
+        with self._lock:
+            records: List[str] = list(self._buffer)
+            self._buffer.clear()
+            dropped, self.dropped = self.dropped, 0
+        batch = [self._dropped_notice(dropped), *records] if dropped else records
+        if not batch:
+            return
+        data = "".join(batch)
+        try:
+            with self._write_lock:
+                self._rotate(len(data.encode("utf-8")))
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.write(data)
+        except OSError:
+            with self._lock:
+                self.dropped += dropped + len(records)
+
+    def _dropped_notice(self, count: int) -> str:
+        """Format the dropped records warning like a record written by loguru
+
+        Args:
+            count (int): Number of dropped records
+
+        Returns:
+            str: Log line
+        """
+        now = datetime.now().astimezone()
+        message = f"Log buffer full: dropped {count} records"
+        text = (
+            f"{now.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]} | WARNING  | "
+            f"{__name__} - {message}\n"
+        )
+        if not self.serialize:
+            return text
+        record = {
+            "extra": {"dropped": count},
+            "level": {"icon": "\u26a0\ufe0f", "name": "WARNING", "no": 30},
+            "message": message,
+            "name": __name__,
+            "time": {"repr": str(now), "timestamp": now.timestamp()},
+        }
+        return json.dumps({"text": text, "record": record}) + "\n"
+
+    def _rotate(self, incoming_bytes: int) -> None:
+        """Rename the log file aside if the batch would grow it past the limit"""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size and size + incoming_bytes > self.rotation_bytes:
+            # Same naming as loguru's rotation: inky.<timestamp>.log
+            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+            self.path.rename(
+                self.path.with_name(f"{self.path.stem}.{timestamp}{self.path.suffix}")
+            )
@@ -0,0 +1,492 @@
+"""Optional health metrics in the Prometheus text exposition format.
+
+When enabled, inky_pi records fetch latency per provider, render and panel refresh
+durations, error counts by exception type, response cache hit ratios and the time
+of the last successful update of each data source and the display. The metrics are
+served from a small local HTTP endpoint in serve (daemon) mode, or written to a
+node_exporter textfile-collector file after each one-shot (cron) run.
+
+Metrics are disabled by default; until ``configure_metrics(True)`` is called
+every recording call costs a single global check.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_HOST = "127.0.0.1"
+FETCH_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RENDER_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# E-ink panels take several seconds (colour panels up to ~30 s) per refresh
+PANEL_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# Provider names used as the ``provider`` label, keyed on TrainModel/WeatherModel
+PROVIDER_NAMES: Dict[str, str] = {
+    "HUXLEY2": "Huxley2",
+    "OPEN_LIVE": "OpenLive",
+    "OPEN_WEATHER_MAP": "OpenWeatherMap",
+}
+
+Labels = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _quote(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return '"' + escaped + '"'
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = (f"{name}={_quote(values[index])}" for index, name in enumerate(names))
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric(ABC):
+    """Base class for labelled metrics"""
+
+    metric_type: str
+
+    def __init__(self, name: str, documentation: str, labels: Labels = ()) -> None:
+        """Initialize metric
+
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            labels (tuple): Label names
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Sample lines of the metric
+
+        Returns:
+            list: Lines in the text exposition format
+        """
+
+    def render(self) -> str:
+        """Render the metric with its HELP and TYPE comments
+
+        Returns:
+            str: Metric in the text exposition format
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+            *self.samples(),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Labels = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *label_values: str) -> None:
+        """Increment the count by one
+
+        Args:
+            label_values (str): Label values, in label name order
+        """
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + 1
+
+    def value(self, *label_values: str) -> float:
+        """Current value
+
+        Args:
+            label_values (str): Label values, in label name order
+
+        Returns:
+            float: Value
+        """
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def values(self) -> Dict[Labels, float]:
+        """Current values
+
+        Returns:
+            dict: Value per label values
+        """
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.values().items())
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    metric_type = "gauge"
+
+    def set(self, *label_values: str, value: float) -> None:
+        """Set the value
+
+        Args:
+            label_values (str): Label values, in label name order
+            value (float): Value
+        """
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets"""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labels: Labels = (),
+    ) -> None:
+        """Initialize histogram
+
+        Args:
+            name (str): Metric name
+            documentation (str): Help text
+            buckets (Sequence[float]): Upper bucket bounds, in increasing order
+            labels (tuple): Label names
+        """
+        super().__init__(name, documentation, labels)
+        self.buckets = (*buckets, float("inf"))
+        # Per label set: bucket counts (not cumulative) and sum of observations
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+
+    def observe(self, *label_values: str, value: float) -> None:
+        """Record an observation
+
+        Args:
+            label_values (str): Label values, in label name order
+            value (float): Observed value
+        """
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts = self._counts.setdefault(label_values, [0] * len(self.buckets))
+            counts[index] += 1
+            self._sums[label_values] = self._sums.get(label_values, 0.0) + value
+
+    def count(self, *label_values: str) -> int:
+        """Number of observations
+
+        Args:
+            label_values (str): Label values, in label name order
+
+        Returns:
+            int: Count
+        """
+        with self._lock:
+            return sum(self._counts.get(label_values, ()))
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(
+                (labels, list(counts), self._sums[labels])
+                for labels, counts in self._counts.items()
+            )
+        lines: List[str] = []
+        for labels, counts, total in values:
+            cumulative = 0
+            for index, bound in enumerate(self.buckets):
+                cumulative += counts[index]
+                label_str = _format_labels(
+                    (*self.labels, "le"), (*labels, _format_value(bound))
+                )
+                lines.append(f"{self.name}_bucket{label_str} {cumulative}")
+            label_str = _format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics recorded by inky_pi"""
+
+    def __init__(self) -> None:
+        self.fetch_seconds = Histogram(
+            "inky_pi_fetch_duration_seconds",
+            "Time taken to fetch and parse provider data.",
+            FETCH_BUCKETS,
+            ("provider",),
+        )
+        self.render_seconds = Histogram(
+            "inky_pi_render_duration_seconds",
+            "Time taken to render a frame.",
+            RENDER_BUCKETS,
+        )
+        self.panel_seconds = Histogram(
+            "inky_pi_panel_refresh_duration_seconds",
+            "Time taken to send a frame to the display and refresh it.",
+            PANEL_BUCKETS,
+        )
+        self.errors = Counter(
+            "inky_pi_errors_total",
+            "Failed fetches, renders and panel refreshes by exception type.",
+            ("type",),
+        )
+        self.cache_hits = Counter("inky_pi_cache_hits_total", "Cache hits.", ("cache",))
+        self.cache_misses = Counter(
+            "inky_pi_cache_misses_total", "Cache misses.", ("cache",)
+        )
+        self.last_success = Gauge(
+            "inky_pi_last_success_timestamp_seconds",
+            "Unix time of the last successful provider fetch or display refresh.",
+            ("source",),
+        )
+
+    def _cache_hit_ratio(self) -> Gauge:
+        ratio = Gauge(
+            "inky_pi_cache_hit_ratio", "Fraction of cache lookups that hit.", ("cache",)
+        )
+        hits = self.cache_hits.values()
+        misses = self.cache_misses.values()
+        for labels in {*hits, *misses}:
+            hit_count = hits.get(labels, 0)
+            ratio.set(*labels, value=hit_count / (hit_count + misses.get(labels, 0)))
+        return ratio
+
+    def render(self) -> str:
+        """Render all metrics
+
+        Returns:
+            str: Metrics in the Prometheus text exposition format
+        """
+        metrics: List[Metric] = [
+            self.fetch_seconds,
+            self.render_seconds,
+            self.panel_seconds,
+            self.errors,
+            self.cache_hits,
+            self.cache_misses,
+            self._cache_hit_ratio(),
+            self.last_success,
+        ]
+        return "".join(metric.render() for metric in metrics)
+
+
+_registry: Optional[MetricsRegistry] = None
+
+
+def configure_metrics(enabled: bool) -> Optional[MetricsRegistry]:
+    """Enable or disable metrics recording
+
+    Args:
+        enabled (bool): Whether metrics are recorded
+
+    Returns:
+        MetricsRegistry: The registry, or None if metrics are disabled
+    """
+    global _registry  # pylint: disable=global-statement
+    if not enabled:
+        _registry = None
+    elif _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
+
+
+def get_metrics() -> Optional[MetricsRegistry]:
+    """Returns the metrics registry
+
+    Returns:
+        MetricsRegistry: The registry, or None if metrics are disabled
+    """
+    return _registry
+
+
+def record_error(exc: BaseException) -> None:
+    """Count an error by exception type
+
+    Args:
+        exc (BaseException): Exception raised
+    """
+    registry = _registry
+    if registry is not None:
+        registry.errors.inc(type(exc).__name__)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup
+
+    Args:
+        cache (str): Cache name
+        hit (bool): Whether the lookup hit
+    """
+    registry = _registry
+    if registry is not None:
+        (registry.cache_hits if hit else registry.cache_misses).inc(cache)
+
+
+@contextmanager
+def track_fetch(model: Any) -> Iterator[None]:
+    """Record the latency, errors and last success time of a provider fetch
+
+    Args:
+        model (Enum): TrainModel or WeatherModel of the provider
+
+    Yields:
+        None
+    """
+    registry = _registry
+    if registry is None:
+        yield
+        return
+    provider = PROVIDER_NAMES.get(model.name, model.name)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as exc:
+        record_error(exc)
+        raise
+    registry.fetch_seconds.observe(provider, value=time.perf_counter() - start)
+    registry.last_success.set(provider, value=time.time())
+
+
+def observed(histogram: str, source: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator recording each call's duration, and counting errors by type
+
+    Args:
+        histogram (str): Registry attribute of the histogram (e.g. render_seconds)
+        source (str): Sets the last success time of this source after each call
+
+    Returns:
+        Callable: Decorator
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            registry = _registry
+            if registry is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exc:
+                record_error(exc)
+                raise
+            getattr(registry, histogram).observe(value=time.perf_counter() - start)
+            if source is not None:
+                registry.last_success.set(source, value=time.time())
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def write_textfile(path: Path | str) -> None:
+    """Write the metrics for a textfile collector (e.g. node_exporter)
+
+    Each one-shot run starts with empty metrics, so the last success times of
+    sources that were not updated in this run are carried over from the previous
+    file. The file is replaced atomically, so the collector never reads a partial
+    file.
+
+    Args:
+        path (Path | str): Output file, which should end in .prom
+    """
+    registry = _registry
+    if registry is None:
+        return
+    path = Path(path)
+    prefix = f'{registry.last_success.name}{{source="'
+    try:
+        previous = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        previous = []
+    for line in previous:
+        source, _, value = line[len(prefix) :].partition('"} ')
+        if line.startswith(prefix) and not registry.last_success.value(source):
+            with suppress(ValueError):
+                registry.last_success.set(source, value=float(value))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(registry.render(), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def start_http_server(port: int, host: str = METRICS_HOST) -> ThreadingHTTPServer:
+    """Serve the metrics at /metrics over HTTP from a daemon thread
+
+    Args:
+        port (int): Port to listen on (0 picks a free port)
+        host (str): Address to bind; local only by default
+
+    Returns:
+        ThreadingHTTPServer: Running server; stop it with ``shutdown``
+    """
+    # pylint: disable=import-outside-toplevel,redefined-outer-name
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Serves the metrics at /metrics"""
+
+        def do_GET(self) -> None:  # pylint: disable=invalid-name
+            """Respond to a GET request"""
+            registry = _registry
+            if self.path.split("?")[0] not in ("/", "/metrics") or registry is None:
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_: Any) -> None:
+            """Do not log scrapes to stderr"""
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="inky_metrics", daemon=True
+    ).start()
+    return server
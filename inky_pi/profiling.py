@@ -0,0 +1,249 @@
+"""Profile one display refresh without extra tooling.
+
+The refresh runs in a fresh interpreter started with ``-X importtime``, so the
+import tree is traced from a cold start as it is on a device, and under
+cProfile. Three files are written next to inky.log:
+
+* ``<name>.txt``: sorted report of the slowest functions and imports
+* ``<name>.pstats``: cProfile statistics (``python -m pstats``, snakeviz)
+* ``<name>.speedscope.json``: the import tree, for https://www.speedscope.app
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import subprocess  # nosec B404
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+IMPORTTIME_PREFIX = "import time:"
+REPORT_LIMIT = 30
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+@dataclass
+class ImportRecord:
+    """Import of one module, with the imports it triggered"""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: List[ImportRecord] = field(default_factory=list)
+
+    def walk(self) -> List[ImportRecord]:
+        """This import and all nested imports, depth first
+
+        Returns:
+            list: Import records
+        """
+        records = [self]
+        for child in self.children:
+            records.extend(child.walk())
+        return records
+
+
+@dataclass(frozen=True)
+class ProfileResult:
+    """Files written by a profiled refresh and the exit code of the refresh"""
+
+    report_file: Path
+    pstats_file: Path
+    speedscope_file: Path
+    returncode: int
+
+
+def parse_importtime(lines: List[str]) -> List[ImportRecord]:
+    """Build the import tree from ``-X importtime`` output
+
+    Nested imports are reported before the module importing them, indented by
+    two spaces per level.
+
+    Args:
+        lines (list): stderr lines; lines not written by -X importtime are skipped
+
+    Returns:
+        list: Top-level imports in import order
+    """
+    pending: Dict[int, List[ImportRecord]] = {}
+    for line in lines:
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        self_us, cumulative_us, name = line[len(IMPORTTIME_PREFIX) :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # Header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        record = ImportRecord(name.strip(), int(self_us), int(cumulative_us))
+        record.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(record)
+    return pending.get(0, [])
+
+
+def speedscope_profile(imports: List[ImportRecord], name: str) -> Dict[str, Any]:
+    """Convert an import tree to a speedscope evented profile
+
+    Args:
+        imports (list): Top-level imports
+        name (str): Profile name
+
+    Returns:
+        dict: speedscope file contents
+    """
+    frames: List[Dict[str, str]] = []
+    frame_index: Dict[str, int] = {}
+    events: List[Dict[str, Any]] = []
+
+    def add(record: ImportRecord, start: int) -> None:
+        frame = frame_index.setdefault(record.name, len(frames))
+        if frame == len(frames):
+            frames.append({"name": record.name})
+        events.append({"type": "O", "frame": frame, "at": start})
+        child_start = start
+        for child in record.children:
+            add(child, child_start)
+            child_start += child.cumulative_us
+        events.append({"type": "C", "frame": frame, "at": start + record.cumulative_us})
+
+    end = 0
+    for record in imports:
+        add(record, end)
+        end += record.cumulative_us
+    return {
+        "$schema": SPEEDSCOPE_SCHEMA,
+        "name": name,
+        "exporter": "inky_pi",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "evented",
+                "name": "imports",
+                "unit": "microseconds",
+                "startValue": 0,
+                "endValue": end,
+                "events": events,
+            }
+        ],
+    }
+
+
+def format_report(
+    stats: Optional[pstats.Stats], imports: List[ImportRecord], title: str
+) -> str:
+    """Format the slowest functions and imports as text
+
+    Args:
+        stats (pstats.Stats): cProfile statistics, None if none were written
+        imports (list): Top-level imports
+        title (str): Report title
+
+    Returns:
+        str: Report
+    """
+    stream = io.StringIO()
+    stream.write(f"{title}\n\n")
+    if stats is not None:
+        stream.write(f"Functions by cumulative time (top {REPORT_LIMIT})\n")
+        stats.stream = stream  # type: ignore[attr-defined]
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_LIMIT)
+        stream.write(f"Functions by own time (top {REPORT_LIMIT})\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(REPORT_LIMIT)
+
+    records = [record for top in imports for record in top.walk()]
+    total_ms = sum(record.cumulative_us for record in imports) / 1000
+    stream.write(f"Imports: {len(records)} modules, {total_ms:.1f} ms total\n\n")
+    for heading, key in (
+        ("cumulative", lambda record: record.cumulative_us),
+        ("own", lambda record: record.self_us),
+    ):
+        stream.write(f"Imports by {heading} time (top {REPORT_LIMIT})\n")
+        stream.write(f"{'self ms':>10} {'cumulative ms':>14}  module\n")
+        for record in sorted(records, key=key, reverse=True)[:REPORT_LIMIT]:
+            stream.write(
+                f"{record.self_us / 1000:>10.1f} {record.cumulative_us / 1000:>14.1f}"
+                f"  {record.name}\n"
+            )
+        stream.write("\n")
+    return stream.getvalue()
+
+
+def profile_refresh(
+    option: str, output: str, directory: Path, name: Optional[str] = None
+) -> ProfileResult:
+    """Profile one display_data refresh in a fresh interpreter
+
+    Args:
+        option (str): Display option (train, weather, night)
+        output (str): Output source (inky, terminal, desktop, file, buffer)
+        directory (Path): Directory to write the profile files to
+        name (str): File name stem (default: inky_profile_<timestamp>)
+
+    Returns:
+        ProfileResult: Written files and the refresh exit code
+    """
+    stem = name or f"inky_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    directory.mkdir(parents=True, exist_ok=True)
+    pstats_file = directory.joinpath(f"{stem}.pstats")
+    report_file = directory.joinpath(f"{stem}.txt")
+    speedscope_file = directory.joinpath(f"{stem}.speedscope.json")
+    pstats_file.unlink(missing_ok=True)
+
+    process = subprocess.run(  # nosec B603
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-m",
+            __name__,
+            option,
+            output,
+            str(pstats_file),
+        ],
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    lines = process.stderr.splitlines()
+    # Pass the refresh's own log output through
+    for line in lines:
+        if not line.startswith(IMPORTTIME_PREFIX):
+            print(line, file=sys.stderr)
+
+    imports = parse_importtime(lines)
+    stats = pstats.Stats(str(pstats_file)) if pstats_file.exists() else None
+    title = f"inky_pi profile: option = {option} / output = {output} ({stem})"
+    report_file.write_text(format_report(stats, imports, title), encoding="utf-8")
+    speedscope_file.write_text(
+        json.dumps(speedscope_profile(imports, stem)), encoding="utf-8"
+    )
+    return ProfileResult(report_file, pstats_file, speedscope_file, process.returncode)
+
+
+def _run(option: str, output: str, pstats_file: str) -> None:
+    """Run one refresh under cProfile; entry point of the profiled interpreter"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        # pylint: disable=import-outside-toplevel
+        from inky_pi.__main__ import display_data, get_runtime_context
+        from inky_pi.display.display_base import DisplayOption
+        from inky_pi.timing import configure_timing
+        from inky_pi.util import configure_logging
+
+        configure_logging()
+        configure_timing(True)
+        display_data(
+            DisplayOption[option.upper()],
+            get_runtime_context().output_dispatch_table[output.upper()],
+        )
+    finally:
+        profiler.disable()
+        profiler.dump_stats(pstats_file)
+
+
+if __name__ == "__main__":
+    _run(*sys.argv[1:4])
@@ -0,0 +1,356 @@
+"""Last-known-good snapshot of the displayed data, for offline-first rendering.
+
+After each successful fetch the parsed weather and departures are saved, with the
+time they were fetched, as a compact snapshot of plain values: the formatted
+strings and icons the display draws, not the provider objects. A snapshot is
+therefore independent of the provider that produced it. Departures are stored as
+plain tuples in field order, so SNAPSHOT_VERSION must be bumped when the layout
+of Departure or of the captured values changes; older snapshots are then ignored.
+
+On start-up the snapshot is drawn, marked as stale, if fresh data does not arrive
+quickly or cannot be fetched at all, so the first frame after boot does not
+depend on the network. Snapshots are tied to the request parameters (stations,
+location, model); changing the settings ignores the old snapshot.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle  # nosec B403 - only used for the local, self-written snapshot
+import threading
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+from inky_pi.cache import CACHE_DIR, cache_key
+from inky_pi.train.train_base import Departure, TrainBase, TrainObject
+from inky_pi.weather.weather_base import IconType, ScaleType, WeatherBase, WeatherObject
+
+SNAPSHOT_FILE = CACHE_DIR.joinpath("snapshot.pickle")
+SNAPSHOT_VERSION = 3
+# Days covered by the weather getters: 0 (today) to 7
+FORECAST_DAYS = 8
+
+T = TypeVar("T")
+
+
+def _capture(getter: Callable[[], T]) -> Optional[T]:
+    """Call a provider getter, recording a failure as a missing value"""
+    try:
+        return getter()
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+def _missing(name: str) -> ValueError:
+    return ValueError(f"{name} is not available in the snapshot.")
+
+
+class WeatherSnapshot(WeatherBase):
+    """Weather data restored from a snapshot"""
+
+    def __init__(self, values: Dict[str, Any], fetched: float) -> None:
+        """Initialize snapshot
+
+        Args:
+            values (dict): Captured getter values (see capture)
+            fetched (float): Time the data was fetched, in seconds since the epoch
+        """
+        self._values = values
+        self.fetched = fetched
+
+    @classmethod
+    def capture(cls, data: WeatherBase) -> Dict[str, Any]:
+        """Capture the values of every getter of a weather provider
+
+        Args:
+            data (WeatherBase): Weather provider with retrieved data
+
+        Returns:
+            dict: Plain values, keyed by getter
+        """
+        days = range(FORECAST_DAYS)
+        icons: List[Optional[IconType]] = [
+            _capture(partial(data.get_icon, day)) for day in days
+        ]
+        values: Dict[str, Any] = {
+            "icon": [icon.name if icon else None for icon in icons],
+            "current_condition": _capture(data.get_current_condition),
+            "condition": [_capture(partial(data.get_condition, day)) for day in days],
+            "current_weather": {},
+            "current_temperature": {},
+            "temp_range": {},
+            "future_weather": {},
+        }
+        for scale in ScaleType:
+            values["current_weather"][scale.name] = _capture(
+                partial(data.get_current_weather, scale)
+            )
+            values["current_temperature"][scale.name] = _capture(
+                partial(data.get_current_temperature, scale)
+            )
+            values["temp_range"][scale.name] = [
+                _capture(partial(data.get_temp_range, day, scale)) for day in days
+            ]
+            values["future_weather"][scale.name] = [
+                _capture(partial(data.get_future_weather, day, scale)) for day in days
+            ]
+        return values
+
+    @classmethod
+    def from_weather(cls, data: WeatherBase, fetched: float) -> WeatherSnapshot:
+        """Create a snapshot of a weather provider's data
+
+        Args:
+            data (WeatherBase): Weather provider with retrieved data
+            fetched (float): Time the data was fetched, in seconds since the epoch
+
+        Returns:
+            WeatherSnapshot: Snapshot
+        """
+        return cls(cls.capture(data), fetched)
+
+    def _get(self, getter: str, *keys: Any) -> Any:
+        value = self._values.get(getter)
+        for key in keys:
+            try:
+                value = value[key]  # type: ignore[index]
+            except (KeyError, IndexError, TypeError):
+                value = None
+        if value is None:
+            raise _missing(getter)
+        return value
+
+    def retrieve_data(self, protocol: Any, weather_object: WeatherObject) -> None:
+        """Do nothing; a snapshot already holds its data"""
+
+    async def aretrieve_data(
+        self, protocol: Any, weather_object: WeatherObject
+    ) -> None:
+        """Do nothing; a snapshot already holds its data"""
+
+    def get_icon(self, day: int = 0) -> IconType:
+        return IconType[self._get("icon", day)]
+
+    def get_current_weather(self, scale: ScaleType = ScaleType.CELSIUS) -> str:
+        return str(self._get("current_weather", scale.name))
+
+    def get_current_temperature(self, scale: ScaleType = ScaleType.CELSIUS) -> str:
+        return str(self._get("current_temperature", scale.name))
+
+    def get_current_condition(self) -> str:
+        return str(self._get("current_condition"))
+
+    def get_temp_range(self, day: int, scale: ScaleType = ScaleType.CELSIUS) -> str:
+        return str(self._get("temp_range", scale.name, day))
+
+    def get_condition(self, day: int) -> str:
+        return str(self._get("condition", day))
+
+    def get_future_weather(self, day: int, scale: ScaleType = ScaleType.CELSIUS) -> str:
+        return str(self._get("future_weather", scale.name, day))
+
+
+class TrainSnapshot(TrainBase):
+    """Train departures restored from a snapshot"""
+
+    def __init__(self, values: Dict[str, Any], fetched: float) -> None:
+        """Initialize snapshot
+
+        Args:
+            values (dict): Captured departures and messages (see capture)
+            fetched (float): Time the data was fetched, in seconds since the epoch
+        """
+        super().__init__()
+        self._num = values["num"]
+        departures = values["departures"]
+        self._departures = (
+            tuple(Departure(*departure) for departure in departures)
+            if departures is not None
+            else None
+        )
+        self._message = values["message"]
+        self.origin = values["origin"]
+        self.destination = values["destination"]
+        self.fetched = fetched
+
+    @classmethod
+    def capture(cls, data: TrainBase) -> Dict[str, Any]:
+        """Capture the departures and messages of a train provider
+
+        Args:
+            data (TrainBase): Train provider with retrieved data
+
+        Returns:
+            dict: Plain values
+        """
+        departures: Optional[Tuple[Departure, ...]] = _capture(lambda: data.departures)
+        return {
+            "num": data.num,
+            "departures": (
+                [tuple(departure) for departure in departures]
+                if departures is not None
+                else None
+            ),
+            "message": data.message,
+            "origin": data.origin,
+            "destination": data.destination,
+        }
+
+    @classmethod
+    def from_train(cls, data: TrainBase, fetched: float) -> TrainSnapshot:
+        """Create a snapshot of a train provider's data
+
+        Args:
+            data (TrainBase): Train provider with retrieved data
+            fetched (float): Time the data was fetched, in seconds since the epoch
+
+        Returns:
+            TrainSnapshot: Snapshot
+        """
+        return cls(cls.capture(data), fetched)
+
+    def retrieve_data(self, protocol: Any, train_object: TrainObject) -> None:
+        """Do nothing; a snapshot already holds its data"""
+
+    async def aretrieve_data(self, protocol: Any, train_object: TrainObject) -> None:
+        """Do nothing; a snapshot already holds its data"""
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Last-known-good weather and train data"""
+
+    weather: Optional[WeatherSnapshot] = None
+    train: Optional[TrainSnapshot] = None
+
+    def covers(self, needs_train: bool) -> bool:
+        """Check if the snapshot has the data needed to draw a frame
+
+        Args:
+            needs_train (bool): Whether the frame shows departures
+
+        Returns:
+            bool: True if the frame can be drawn from the snapshot
+        """
+        return self.weather is not None and (self.train is not None or not needs_train)
+
+    def fetched(self, needs_train: bool) -> datetime:
+        """Time the oldest data drawn in a frame was fetched
+
+        Args:
+            needs_train (bool): Whether the frame shows departures
+
+        Returns:
+            datetime: Fetch time
+        """
+        assert self.weather is not None
+        fetched = self.weather.fetched
+        if needs_train and self.train is not None:
+            fetched = min(fetched, self.train.fetched)
+        return datetime.fromtimestamp(fetched)
+
+
+_lock = threading.Lock()
+
+
+def _read(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "rb") as file:
+            data: Dict[str, Any] = pickle.load(file)  # nosec B301
+    except FileNotFoundError:
+        return {}
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as exc:
+        logger.warning("Ignoring unreadable snapshot {path}: {exc}", path=path, exc=exc)
+        return {}
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return {}
+    return data
+
+
+def load_snapshot(
+    weather_object: WeatherObject,
+    train_object: Optional[TrainObject] = None,
+    path: Path = SNAPSHOT_FILE,
+) -> Snapshot:
+    """Load the parts of the snapshot saved for the given request parameters
+
+    Args:
+        weather_object (WeatherObject): Weather request parameters
+        train_object (TrainObject): Train request parameters
+        path (Path): Snapshot file
+
+    Returns:
+        Snapshot: Snapshot; parts that are missing or were saved for other
+            request parameters are None
+    """
+    data = _read(path)
+    weather = data.get("weather")
+    train = data.get("train")
+    return Snapshot(
+        weather=(
+            WeatherSnapshot(weather["values"], weather["fetched"])
+            if weather and weather["key"] == cache_key(weather_object)
+            else None
+        ),
+        train=(
+            TrainSnapshot(train["values"], train["fetched"])
+            if train and train_object and train["key"] == cache_key(train_object)
+            else None
+        ),
+    )
+
+
+def save_snapshot(
+    weather_object: WeatherObject,
+    weather_data: Optional[WeatherBase],
+    train_object: Optional[TrainObject] = None,
+    train_data: Optional[TrainBase] = None,
+    path: Path = SNAPSHOT_FILE,
+) -> None:
+    """Save fetched data, keeping the saved parts that were not refetched
+
+    Each part is stamped with the time its data was fetched, which is earlier than
+    now for data served from the response cache. The snapshot is only a fallback,
+    so failing to save it is logged, not raised.
+
+    Args:
+        weather_object (WeatherObject): Weather request parameters
+        weather_data (WeatherBase): Fetched weather data, if refetched
+        train_object (TrainObject): Train request parameters
+        train_data (TrainBase): Fetched train data, if refetched
+        path (Path): Snapshot file
+    """
+    parts: Dict[str, Dict[str, Any]] = {}
+    if weather_data is not None:
+        parts["weather"] = {
+            "key": cache_key(weather_object),
+            "fetched": weather_data.fetched,
+            "values": WeatherSnapshot.capture(weather_data),
+        }
+    if train_object is not None and train_data is not None:
+        parts["train"] = {
+            "key": cache_key(train_object),
+            "fetched": train_data.fetched,
+            "values": TrainSnapshot.capture(train_data),
+        }
+    if not parts:
+        return
+    with _lock:
+        data = {**_read(path), **parts, "version": SNAPSHOT_VERSION}
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PickleError) as exc:
+            logger.warning("Could not save snapshot {path}: {exc}", path=path, exc=exc)
+        finally:
+            with suppress(OSError):
+                tmp_path.unlink()
@@ -0,0 +1,274 @@
+"""Station index for inky_pi.
+
+The National Rail CRS station data (inky_web/static/crs_codes.json) is the source
+of truth. It is compiled into a compact binary index which is memory-mapped for
+lookups, so cold starts avoid a JSON decode and thousands of small objects. The
+index is rebuilt whenever the SHA-256 of the JSON content changes.
+
+Index layout (little-endian):
+    header:       magic (4s), version (H), station count (I), json sha256 (32s)
+    records:      per station sorted by CRS code: code (3s), name offset (I),
+                  name length (H); offsets are relative to the string table
+    name order:   record numbers sorted by UTF-8 station name (H each)
+    source order: record numbers in json file order (H each)
+    string table: UTF-8 station names
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+from loguru import logger
+
+ROOT_DIR = Path(__file__).parent.parent
+STATIC_DIR = ROOT_DIR.joinpath("inky_web/static")
+CRS_CODES_FILE = STATIC_DIR.joinpath("crs_codes.json")
+CRS_INDEX_FILE = STATIC_DIR.joinpath("crs_codes.idx")
+
+INDEX_MAGIC = b"CRSI"
+INDEX_VERSION = 1
+CODE_WIDTH = 3
+_HEADER = struct.Struct("<4sHI32s")
+_RECORD = struct.Struct(f"<{CODE_WIDTH}sIH")
+_ORDER = struct.Struct("<H")
+
+
+def _bisect_left(count: int, key: Callable[[int], bytes], target: bytes) -> int:
+    """Binary search over positions 0..count-1 (bisect's key= needs Python 3.10)"""
+    low, high = 0, count
+    while low < high:
+        mid = (low + high) // 2
+        if key(mid) < target:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+def compile_station_index(source: bytes) -> bytes:
+    """Compiles CRS station json content into the binary index format
+
+    Args:
+        source (bytes): Raw content of the CRS codes json file
+
+    Returns:
+        bytes: Binary station index
+    """
+    stations = [
+        (station["crsCode"].encode("ascii"), station["stationName"].encode("utf-8"))
+        for station in json.loads(source)
+    ]
+    if any(len(code) != CODE_WIDTH for code, _ in stations):
+        raise ValueError(f"CRS codes must be {CODE_WIDTH} characters long")
+
+    by_code = sorted(range(len(stations)), key=lambda i: stations[i][0])
+    record_number = {source_pos: num for num, source_pos in enumerate(by_code)}
+
+    records, strings, offset = bytearray(), bytearray(), 0
+    for source_pos in by_code:
+        code, name = stations[source_pos]
+        records += _RECORD.pack(code, offset, len(name))
+        strings += name
+        offset += len(name)
+
+    name_order = sorted(record_number.values(), key=lambda n: stations[by_code[n]][1])
+    source_order = [record_number[i] for i in range(len(stations))]
+
+    header = _HEADER.pack(
+        INDEX_MAGIC, INDEX_VERSION, len(stations), hashlib.sha256(source).digest()
+    )
+    return b"".join(
+        [
+            header,
+            bytes(records),
+            b"".join(_ORDER.pack(num) for num in name_order),
+            b"".join(_ORDER.pack(num) for num in source_order),
+            bytes(strings),
+        ]
+    )
+
+
+def build_station_index(
+    crs_file: Path = CRS_CODES_FILE, index_file: Path = CRS_INDEX_FILE
+) -> Path:
+    """Compiles the CRS json file and atomically writes the binary index
+
+    Args:
+        crs_file (Path): Path to the CRS codes json file
+        index_file (Path): Path to write the binary index to
+
+    Returns:
+        Path: Path of the written index
+    """
+    index = compile_station_index(crs_file.read_bytes())
+    tmp_file = index_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp_file.write_bytes(index)
+    os.replace(tmp_file, index_file)
+    return index_file
+
+
+class StationIndex:
+    """Read-only, zero-copy view over a binary station index"""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]) -> None:
+        """Parse the index header and locate each section
+
+        Args:
+            buffer (bytes | mmap): Binary station index content
+
+        Raises:
+            ValueError: If the buffer is not a supported station index
+        """
+        magic, version, count, digest = _HEADER.unpack_from(buffer, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError("Unsupported station index format")
+        self._buffer = buffer
+        self._count: int = count
+        self.digest: bytes = digest
+        self._records = _HEADER.size
+        self._name_order = self._records + count * _RECORD.size
+        self._source_order = self._name_order + count * _ORDER.size
+        self._strings = self._source_order + count * _ORDER.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, code: object) -> bool:
+        return isinstance(code, str) and self._find_code(code) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over CRS codes in sorted order"""
+        for num in range(self._count):
+            yield self._code(num).decode("ascii")
+
+    def _code(self, num: int) -> bytes:
+        start = self._records + num * _RECORD.size
+        return bytes(self._buffer[start : start + CODE_WIDTH])
+
+    def _name(self, num: int) -> bytes:
+        _, offset, length = _RECORD.unpack_from(
+            self._buffer, self._records + num * _RECORD.size
+        )
+        start = self._strings + offset
+        return bytes(self._buffer[start : start + length])
+
+    def _ordered(self, section: int, pos: int) -> int:
+        num: int = _ORDER.unpack_from(self._buffer, section + pos * _ORDER.size)[0]
+        return num
+
+    def _find_code(self, code: str) -> Optional[int]:
+        key = code.encode("ascii", errors="replace")
+        if len(key) != CODE_WIDTH:
+            return None
+        pos = _bisect_left(self._count, self._code, key)
+        return pos if pos < self._count and self._code(pos) == key else None
+
+    def is_valid_code(self, code: str) -> bool:
+        """Check if a CRS code belongs to a known station
+
+        Args:
+            code (str): CRS station code
+
+        Returns:
+            bool: True if the code is known
+        """
+        return code in self
+
+    def get_name(self, code: str) -> str:
+        """Look up the station name for a CRS code
+
+        Args:
+            code (str): CRS station code
+
+        Raises:
+            KeyError: If the code is unknown
+
+        Returns:
+            str: Station name
+        """
+        num = self._find_code(code)
+        if num is None:
+            raise KeyError(code)
+        return self._name(num).decode("utf-8")
+
+    def get_code(self, name: str) -> str:
+        """Look up the CRS code for a station name
+
+        Args:
+            name (str): Station name
+
+        Raises:
+            KeyError: If the name is unknown
+
+        Returns:
+            str: CRS station code
+        """
+        key = name.encode("utf-8")
+        pos = _bisect_left(
+            self._count,
+            lambda p: self._name(self._ordered(self._name_order, p)),
+            key,
+        )
+        if pos < self._count:
+            num = self._ordered(self._name_order, pos)
+            if self._name(num) == key:
+                return self._code(num).decode("ascii")
+        raise KeyError(name)
+
+    @cached_property
+    def choices(self) -> Tuple[Tuple[str, str], ...]:
+        """(code, name) pairs in source file order, e.g. for select fields"""
+        return tuple(
+            (self._code(num).decode("ascii"), self._name(num).decode("utf-8"))
+            for num in (
+                self._ordered(self._source_order, pos) for pos in range(self._count)
+            )
+        )
+
+
+def _index_digest(index_file: Path) -> Optional[bytes]:
+    """Read the json digest stored in an index header, if the index is usable"""
+    try:
+        with open(index_file, "rb") as file:
+            magic, version, _, digest = _HEADER.unpack(file.read(_HEADER.size))
+    except (OSError, struct.error):
+        return None
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        return None
+    digest_bytes: bytes = digest
+    return digest_bytes
+
+
+@lru_cache(maxsize=None)
+def get_station_index(
+    crs_file: Path = CRS_CODES_FILE, index_file: Path = CRS_INDEX_FILE
+) -> StationIndex:
+    """Memory-maps the station index, rebuilding it if the json has changed
+
+    If the index cannot be written (e.g. read-only install), it is compiled in
+    memory instead.
+
+    Args:
+        crs_file (Path): Path to the CRS codes json file
+        index_file (Path): Path to the binary index
+
+    Returns:
+        StationIndex: Station index reader
+    """
+    source = crs_file.read_bytes()
+    if _index_digest(index_file) != hashlib.sha256(source).digest():
+        logger.debug("Rebuilding station index {index}", index=index_file)
+        try:
+            build_station_index(crs_file, index_file)
+        except OSError as exc:
+            logger.warning("Unable to write station index: {exc}", exc=exc)
+            return StationIndex(compile_station_index(source))
+    with open(index_file, "rb") as file:
+        return StationIndex(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
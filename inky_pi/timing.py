@@ -0,0 +1,185 @@
+"""Per-stage latency instrumentation for the refresh pipeline.
+
+Stages (settings validation, backend imports, fetches, each draw_* call, the
+panel refresh) are timed with the ``stage`` context manager or the ``timed``
+decorator. Durations are collected while a ``refresh_timer`` is active and
+emitted as one structured loguru record per refresh, so slow stages can be found
+in inky.log. When timing is disabled, or no refresh is being timed, a timed call
+costs a single global check.
+
+Timing is enabled by ``configure_timing(True)``, the CLI ``--timings`` flag, or
+the INKY_PI_TIMINGS=1 environment variable.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional, TypeVar
+
+from loguru import logger
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TIMING_ENV_VAR = "INKY_PI_TIMINGS"
+
+
+@dataclass
+class StageTiming:
+    """Accumulated duration of a stage within one refresh"""
+
+    seconds: float = 0.0
+    calls: int = 0
+
+
+class TimingReport:
+    """Stage durations collected during one refresh"""
+
+    def __init__(self, name: str) -> None:
+        """Initialize report
+
+        Args:
+            name (str): Refresh name (e.g. display_data)
+        """
+        self.name = name
+        self.stages: Dict[str, StageTiming] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage_name: str, seconds: float) -> None:
+        """Add a stage duration; repeated stages are summed
+
+        Args:
+            stage_name (str): Stage name
+            seconds (float): Duration
+        """
+        with self._lock:
+            timing = self.stages.setdefault(stage_name, StageTiming())
+            timing.seconds += seconds
+            timing.calls += 1
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Stage durations in milliseconds, with call counts
+
+        Returns:
+            dict: {stage: {"ms": duration, "calls": count}}
+        """
+        with self._lock:
+            return {
+                stage_name: {
+                    "ms": round(timing.seconds * 1000, 3),
+                    "calls": timing.calls,
+                }
+                for stage_name, timing in self.stages.items()
+            }
+
+
+_enabled: bool = os.environ.get(TIMING_ENV_VAR, "") == "1"
+_active: Optional[TimingReport] = None
+
+
+def configure_timing(enabled: bool) -> None:
+    """Enable or disable per-stage timing
+
+    Args:
+        enabled (bool): Whether refreshes are timed
+    """
+    global _enabled  # pylint: disable=global-statement
+    _enabled = enabled
+
+
+def timing_enabled() -> bool:
+    """Check if per-stage timing is enabled
+
+    Returns:
+        bool: True if refreshes are timed
+    """
+    return _enabled
+
+
+@contextmanager
+def _timed_stage(report: TimingReport, stage_name: str) -> Iterator[None]:
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        report.add(stage_name, perf_counter() - start)
+
+
+def stage(stage_name: str) -> ContextManager[None]:
+    """Time a block as a stage of the refresh being timed
+
+    Args:
+        stage_name (str): Stage name
+
+    Returns:
+        ContextManager: Timing context, or a no-op one if no refresh is timed
+    """
+    report = _active
+    if report is None:
+        return nullcontext()
+    return _timed_stage(report, stage_name)
+
+
+def timed(stage_name: str) -> Callable[[F], F]:
+    """Decorator timing each call of a function as a stage
+
+    Args:
+        stage_name (str): Stage name
+
+    Returns:
+        Callable: Decorator
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            report = _active
+            if report is None:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                report.add(stage_name, perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@contextmanager
+def refresh_timer(name: str) -> Iterator[Optional[TimingReport]]:
+    """Time the stages of one refresh and log them as one structured record
+
+    Args:
+        name (str): Refresh name (e.g. display_data)
+
+    Yields:
+        TimingReport: Report being collected, or None if timing is disabled
+    """
+    global _active  # pylint: disable=global-statement
+    if not _enabled or _active is not None:
+        yield None
+        return
+    report = TimingReport(name)
+    _active = report
+    start = perf_counter()
+    try:
+        yield report
+    finally:
+        _active = None
+        total_ms = round((perf_counter() - start) * 1000, 3)
+        stages = report.as_dict()
+        logger.bind(stages=stages).info(
+            "Refresh timings for {refresh}: {total_ms} ms total; {summary}",
+            refresh=name,
+            total_ms=total_ms,
+            summary=", ".join(
+                f"{stage_name} {timing['ms']} ms"
+                for stage_name, timing in stages.items()
+            ),
+        )
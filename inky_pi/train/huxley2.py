@@ -2,12 +2,19 @@
 
 Fetches train data from Huxley2 (OpenLDBWS) and generates formatted data"""
 
-from typing import Any
+import json
+from typing import Any, Dict, Optional, Tuple
 
 import requests
 from loguru import logger
 
-from inky_pi.train.train_base import TrainBase, TrainObject, abbreviate_stn_name
+from inky_pi.http_session import create_async_http_client, get_http_session
+from inky_pi.train.train_base import (
+    Departure,
+    TrainBase,
+    TrainObject,
+    abbreviate_stn_name,
+)
 
 
 class Huxley2(TrainBase):
@@ -19,79 +26,147 @@ class Huxley2(TrainBase):
         More info here: https://huxley2.azurewebsites.net/
 
         Args:
-            protocol (Any): Requests object for HTTP requests
+            protocol (Any): Requests session (or module) for HTTP requests
             train_object (TrainObject): Train object
         """
-        response: Any = protocol.get(
+        response: Any = protocol.get(self._departures_url(train_object))
+        try:
+            board: Dict[str, Any] = response.json()
+        except requests.exceptions.JSONDecodeError as exc:
+            raise self._invalid_request(train_object) from exc
+        self._parse_board(board, train_object)
+
+    async def aretrieve_data(self, protocol: Any, train_object: TrainObject) -> None:
+        """Asynchronously requests train data from the Huxley2 departures endpoint
+
+        Args:
+            protocol (Any): httpx.AsyncClient for HTTP requests
+            train_object (TrainObject): Train object
+        """
+        response: Any = await protocol.get(self._departures_url(train_object))
+        try:
+            board: Dict[str, Any] = response.json()
+        except json.JSONDecodeError as exc:  # httpx decodes with the json module
+            raise self._invalid_request(train_object) from exc
+        self._parse_board(board, train_object)
+
+    @staticmethod
+    def _departures_url(train_object: TrainObject) -> str:
+        """Build the departures request URL
+
+        Args:
+            train_object (TrainObject): Train object
+
+        Returns:
+            str: Request URL
+        """
+        return (
             "https://huxley2.azurewebsites.net/departures/"
             f"{train_object.station_from}/to/"
             f"{train_object.station_to}/{train_object.number}"
         )
 
-        self._num = train_object.number
-        try:
-            self._data = response.json()
-            self.origin = abbreviate_stn_name(self._data["locationName"])
-            self.destination = abbreviate_stn_name(self._data["filterLocationName"])
-        except protocol.exceptions.JSONDecodeError as exc:
-            logger.error("Error retrieving train data (check stations?).")
-            raise ValueError(f"Invalid train data request: {train_object}") from exc
-
-    def _handle_error(self, num: int) -> str:
-        """Log error and raise exception
+    @staticmethod
+    def _invalid_request(train_object: TrainObject) -> ValueError:
+        """Log and build the error for a response that is not train data
 
         Args:
-            num (int): Train number
+            train_object (TrainObject): Train object
 
-        Raises:
-            Exception: Exception to raise
+        Returns:
+            ValueError: Error to raise
         """
-        if not self._data:
-            raise ValueError("No train data available.")
+        logger.error("Error retrieving train data (check stations?).")
+        return ValueError(f"Invalid train data request: {train_object}")
 
-        try:
-            error_msg = str(self._data["nrccMessages"][0]["value"])
-            return TrainBase.format_error_msg(error_msg, num)
-        except (AttributeError, TypeError, KeyError, IndexError):
-            error_msg = f"No trains to {self.destination} from {self.origin}."
-            return TrainBase.format_error_msg(error_msg, num)
+    def _parse_board(self, board: Dict[str, Any], train_object: TrainObject) -> None:
+        """Normalise the decoded departure board into departure records
 
-    def fetch_train(self, num: int) -> str:
-        """Generate next train string
+        Args:
+            board (dict): Decoded departure board
+            train_object (TrainObject): Train object
+        """
+        self._num = train_object.number
+        self.origin = abbreviate_stn_name(str(board["locationName"]))
+        self.destination = abbreviate_stn_name(str(board["filterLocationName"]))
+        self._departures = self._parse_services(board)
+        self._message = self._parse_message(board)
 
-        String is returned in format:
-            [hh:mm] | [Platform #] to [Final Destination Station] - [Status]
+    @staticmethod
+    def _parse_services(board: Dict[str, Any]) -> Tuple[Departure, ...]:
+        """Build departure records, skipping services with missing fields
 
         Args:
-            num (int): Next train departing number starting from 0
+            board (dict): Decoded departure board
 
         Returns:
-            str: Formatted string or error message
+            tuple: Departure records
         """
-        self._validate_number(num)
-        if not self._data:
-            raise ValueError("No train data available.")
+        departures = []
+        for service in board.get("trainServices") or ():
+            try:
+                departures.append(
+                    Departure.create(
+                        service["std"],
+                        service["etd"],
+                        service.get("platform"),
+                        service["destination"][0]["locationName"],
+                        service.get("isCancelled"),
+                    )
+                )
+            except (KeyError, TypeError, IndexError):
+                logger.debug("Skipping incomplete train service: {s}", s=service)
+        return tuple(departures)
+
+    @staticmethod
+    def _parse_message(board: Dict[str, Any]) -> str:
+        """Extract the first service (NRCC) message, if any
+
+        Args:
+            board (dict): Decoded departure board
 
+        Returns:
+            str: Message, or an empty string
+        """
         try:
-            service: dict[str, Any] = self._data["trainServices"][num]
-            platform: str = service["platform"][0:2]
-            arrival_t: str = service["std"]
-            dest_stn: str = service["destination"][0]["locationName"]
-            status: str = service["etd"]
-            return TrainBase.format_train_string(arrival_t, platform, dest_stn, status)
-        except (KeyError, TypeError, IndexError):
-            return self._handle_error(num)
+            return str(board["nrccMessages"][0]["value"])
+        except (AttributeError, TypeError, KeyError, IndexError):
+            return ""
 
 
-def instantiate_huxley2(train_object: TrainObject) -> Huxley2:
+def instantiate_huxley2(
+    train_object: TrainObject, session: Optional[requests.Session] = None
+) -> Huxley2:
     """Huxley2 object creator
 
     Args:
         train_object (TrainObject): train object containing model
+        session (requests.Session): HTTP session; defaults to the shared session
+
+    Returns:
+        Huxley2: Huxley2 object
+    """
+    train_base = Huxley2()
+    train_base.retrieve_data(session or get_http_session(), train_object)
+    return train_base
+
+
+async def ainstantiate_huxley2(
+    train_object: TrainObject, client: Any = None
+) -> Huxley2:
+    """Asynchronous Huxley2 object creator
+
+    Args:
+        train_object (TrainObject): train object containing model
+        client (httpx.AsyncClient): HTTP client; a short-lived one is used if None
 
     Returns:
         Huxley2: Huxley2 object
     """
     train_base = Huxley2()
-    train_base.retrieve_data(requests, train_object)
+    if client is None:
+        async with create_async_http_client() as own_client:
+            await train_base.aretrieve_data(own_client, train_object)
+    else:
+        await train_base.aretrieve_data(client, train_object)
     return train_base
@@ -1,11 +1,144 @@
 """Open Live Departure Boards Web Service (OpenLDBWS) API"""
 
-from typing import Any
+import asyncio
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Tuple
 
 import zeep
+import zeep.cache
 from loguru import logger
 
-from inky_pi.train.train_base import TrainBase, TrainObject, abbreviate_stn_name
+from inky_pi.http_session import create_async_http_client, get_http_timeout
+from inky_pi.train.train_base import (
+    Departure,
+    TrainBase,
+    TrainObject,
+    abbreviate_stn_name,
+)
+
+TOKEN_NAMESPACE = "http://thalesgroup.com/RTTI/2013-11-28/Token/types"
+
+
+@dataclass
+class OpenLiveClient:
+    """Pooled SOAP client with its plugins and reusable access token header"""
+
+    client: Any
+    history: Any
+    header: Any
+
+
+# Module-level client pool keyed by WSDL URL; the WSDL/XSDs are parsed once per
+# process and the raw documents are cached on disk for the configured TTL
+_CLIENT_POOL: Dict[str, OpenLiveClient] = {}
+# Async clients keyed by WSDL URL, each with the httpx client it sends over; only
+# the latest httpx client is kept per URL, so short-lived clients are not retained
+_ASYNC_CLIENT_POOL: Dict[str, Tuple[Any, Any]] = {}
+# Held while a client is created, so concurrent refreshes parse the WSDL only once
+_POOL_LOCK = threading.Lock()
+
+
+def get_open_live_client(protocol: Any, train_object: TrainObject) -> OpenLiveClient:
+    """Returns the pooled client for the train object's WSDL URL, creating it once
+
+    Args:
+        protocol (Any): Zeep object for SOAP requests
+        train_object (TrainObject): Train object
+
+    Returns:
+        OpenLiveClient: Pooled client
+    """
+    with _POOL_LOCK:
+        if train_object.url not in _CLIENT_POOL:
+            _CLIENT_POOL[train_object.url] = _create_open_live_client(
+                protocol, train_object
+            )
+        return _CLIENT_POOL[train_object.url]
+
+
+def _create_open_live_client(
+    protocol: Any, train_object: TrainObject
+) -> OpenLiveClient:
+    """Creates a client, parsing the WSDL, with the configured HTTP timeouts
+
+    Args:
+        protocol (Any): Zeep object for SOAP requests
+        train_object (TrainObject): Train object
+
+    Returns:
+        OpenLiveClient: New client
+    """
+    timeout = get_http_timeout()
+    history: Any = protocol.plugins.HistoryPlugin()
+    transport: Any = protocol.Transport(
+        cache=protocol.cache.SqliteCache(timeout=train_object.wsdl_cache_ttl),
+        timeout=timeout,
+        operation_timeout=timeout,
+    )
+    client: Any = protocol.Client(
+        wsdl=train_object.url, plugins=[history], transport=transport
+    )
+    header: Any = protocol.xsd.Element(
+        f"{{{TOKEN_NAMESPACE}}}AccessToken",
+        protocol.xsd.ComplexType(
+            [
+                protocol.xsd.Element(
+                    f"{{{TOKEN_NAMESPACE}}}TokenValue",
+                    protocol.xsd.String(),
+                ),
+            ]
+        ),
+    )
+    return OpenLiveClient(client, history, header)
+
+
+@lru_cache(maxsize=None)
+def _wsdl_http_client() -> Any:
+    """Idle sync httpx client for zeep's AsyncTransport
+
+    The WSDL is already parsed by the pooled client, so this is never used for
+    requests; sharing it avoids building a new SSL context on every refresh.
+    """
+    # pylint: disable=import-outside-toplevel
+    import httpx
+
+    return httpx.Client()
+
+
+def get_open_live_async_client(
+    protocol: Any, open_live_client: OpenLiveClient, train_object: TrainObject
+) -> Any:
+    """Returns the pooled async client for the WSDL URL and httpx client
+
+    Args:
+        protocol (Any): httpx.AsyncClient for SOAP requests
+        open_live_client (OpenLiveClient): Pooled client with the parsed WSDL
+        train_object (TrainObject): Train object
+
+    Returns:
+        zeep.AsyncClient: Pooled async client
+    """
+    with _POOL_LOCK:
+        pooled = _ASYNC_CLIENT_POOL.get(train_object.url)
+        if pooled is None or pooled[0] is not protocol:
+            transport = zeep.transports.AsyncTransport(  # type: ignore[no-untyped-call]
+                client=protocol, wsdl_client=_wsdl_http_client()
+            )
+            async_client: Any = zeep.AsyncClient(  # type: ignore[no-untyped-call]
+                wsdl=open_live_client.client.wsdl, transport=transport
+            )
+            pooled = (protocol, async_client)
+            _ASYNC_CLIENT_POOL[train_object.url] = pooled
+        return pooled[1]
+
+
+def clear_open_live_clients() -> None:
+    """Drops all pooled clients (e.g. after a WSDL URL or network change)"""
+    with _POOL_LOCK:
+        _CLIENT_POOL.clear()
+        _ASYNC_CLIENT_POOL.clear()
 
 
 class OpenLive(TrainBase):
@@ -20,81 +153,121 @@ class OpenLive(TrainBase):
             protocol (Any): Zeep object for SOAP requests
             train_object (TrainObject): Train object
         """
-        history: Any = protocol.plugins.HistoryPlugin()
-        client: Any = protocol.Client(wsdl=train_object.url, plugins=[history])
-        header: Any = protocol.xsd.Element(
-            "{http://thalesgroup.com/RTTI/2013-11-28/Token/types}AccessToken",
-            protocol.xsd.ComplexType(
-                [
-                    protocol.xsd.Element(
-                        "{http://thalesgroup.com/RTTI/2013-11-28/Token/types}"
-                        + "TokenValue",
-                        protocol.xsd.String(),
-                    ),
-                ]
-            ),
-        )
-        header_value = header(TokenValue=train_object.token)
+        open_live_client = get_open_live_client(protocol, train_object)
         self._num = train_object.number
         try:
-            self._data = client.service.GetDepartureBoard(
-                numRows=train_object.number,
-                crs=train_object.station_from,
-                filterCrs=train_object.station_to,
-                filterType="to",
-                _soapheaders=[header_value],
+            board: Any = open_live_client.client.service.GetDepartureBoard(
+                **self._request_args(open_live_client, train_object)
             )
-            self.origin = abbreviate_stn_name(self._data.locationName)
-            self.destination = abbreviate_stn_name(self._data.filterLocationName)
         except protocol.exceptions.Fault as exc:
             logger.error("Error retrieving train data (check stations?).")
             raise ValueError(f"Invalid train data request: {train_object}") from exc
+        self._parse_board(board)
 
-    def _handle_error(self, num: int) -> str:
-        """Log error and raise exception
+    async def aretrieve_data(self, protocol: Any, train_object: TrainObject) -> None:
+        """Asynchronously requests train data from the OpenLDBWS API
+
+        The WSDL is parsed once by the pooled synchronous client, in a worker
+        thread so a cold start does not block the event loop, and shared with a
+        pooled zeep AsyncClient that sends requests over ``protocol``.
 
         Args:
-            num (int): Train number
+            protocol (Any): httpx.AsyncClient for SOAP requests
+            train_object (TrainObject): Train object
+        """
+        open_live_client = await asyncio.to_thread(
+            get_open_live_client, zeep, train_object
+        )
+        async_client = get_open_live_async_client(
+            protocol, open_live_client, train_object
+        )
+        self._num = train_object.number
+        try:
+            board: Any = await async_client.service.GetDepartureBoard(
+                **self._request_args(open_live_client, train_object)
+            )
+        except zeep.exceptions.Fault as exc:
+            logger.error("Error retrieving train data (check stations?).")
+            raise ValueError(f"Invalid train data request: {train_object}") from exc
+        self._parse_board(board)
 
-        Raises:
-            Exception: Exception to raise
+    @staticmethod
+    def _request_args(
+        open_live_client: OpenLiveClient, train_object: TrainObject
+    ) -> Dict[str, Any]:
+        """Build the GetDepartureBoard arguments, including the token header
+
+        Args:
+            open_live_client (OpenLiveClient): Pooled client
+            train_object (TrainObject): Train object
+
+        Returns:
+            dict: Keyword arguments for GetDepartureBoard
         """
-        if not self._data:
-            raise ValueError("No train data available.")
+        return {
+            "numRows": train_object.number,
+            "crs": train_object.station_from,
+            "filterCrs": train_object.station_to,
+            "filterType": "to",
+            "_soapheaders": [open_live_client.header(TokenValue=train_object.token)],
+        }
 
-        try:
-            # pylint: disable=protected-access
-            error_msg = str(self._data.nrccMessages.message[0]._value_1)[1:]
-            return TrainBase.format_error_msg(error_msg, num)
-        except (AttributeError, TypeError, KeyError, IndexError):
-            error_msg = f"No trains to {self.destination} from {self.origin}."
-            return TrainBase.format_error_msg(error_msg, num)
+    def _parse_board(self, board: Any) -> None:
+        """Normalise the departure board into departure records
 
-    def fetch_train(self, num: int) -> str:
-        """Generate next train string
+        Args:
+            board (Any): zeep StationBoard object
+        """
+        self.origin = abbreviate_stn_name(str(board.locationName))
+        self.destination = abbreviate_stn_name(str(board.filterLocationName))
+        self._departures = self._parse_services(board)
+        self._message = self._parse_message(board)
 
-        String is returned in format:
-            [hh:mm] | [Platform #] to [Final Destination Station] - [Status]
+    @staticmethod
+    def _parse_services(board: Any) -> Tuple[Departure, ...]:
+        """Build departure records, skipping services with missing fields
 
         Args:
-            num (int): Next train departing number starting from 0
+            board (Any): zeep StationBoard object
 
         Returns:
-            str: Formatted string or error message
+            tuple: Departure records
         """
-        self._validate_number(num)
-        if not self._data:
-            raise ValueError("No train data available.")
+        departures = []
+        try:
+            services: Any = board.trainServices.service
+        except AttributeError:
+            return ()
+        for service in services or ():
+            try:
+                departures.append(
+                    Departure.create(
+                        service.std,
+                        service.etd,
+                        service.platform,
+                        service.destination.location[0].locationName,
+                        getattr(service, "isCancelled", False),
+                    )
+                )
+            except (AttributeError, TypeError, KeyError, IndexError):
+                logger.debug("Skipping incomplete train service: {s}", s=service)
+        return tuple(departures)
+
+    @staticmethod
+    def _parse_message(board: Any) -> str:
+        """Extract the first service (NRCC) message, if any
+
+        Args:
+            board (Any): zeep StationBoard object
 
+        Returns:
+            str: Message, or an empty string
+        """
         try:
-            service: Any = self._data.trainServices.service[num]
-            platform: str = service.platform[0:2]
-            arrival_t: str = service.std
-            dest_stn: str = service.destination.location[0].locationName
-            status: str = service.etd
-            return TrainBase.format_train_string(arrival_t, platform, dest_stn, status)
+            # pylint: disable=protected-access
+            return str(board.nrccMessages.message[0]._value_1)[1:]
         except (AttributeError, TypeError, KeyError, IndexError):
-            return self._handle_error(num)
+            return ""
 
 
 def instantiate_open_live(train_object: TrainObject) -> OpenLive:
@@ -109,3 +282,24 @@ def instantiate_open_live(train_object: TrainObject) -> OpenLive:
     train_base = OpenLive()
     train_base.retrieve_data(zeep, train_object)
     return train_base
+
+
+async def ainstantiate_open_live(
+    train_object: TrainObject, client: Any = None
+) -> OpenLive:
+    """Asynchronous Open Live object creator
+
+    Args:
+        train_object (TrainObject): train object containing model
+        client (httpx.AsyncClient): HTTP client; a short-lived one is used if None
+
+    Returns:
+        OpenLive: OpenLive object
+    """
+    train_base = OpenLive()
+    if client is None:
+        async with create_async_http_client() as own_client:
+            await train_base.aretrieve_data(own_client, train_object)
+    else:
+        await train_base.aretrieve_data(client, train_object)
+    return train_base
@@ -1,13 +1,30 @@
 """Base class and helper functions for train model"""
 
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 from loguru import logger
 
+ABBREVIATIONS: Dict[str, str] = {
+    "Station": "Stn",
+    "Street": "St",
+    "Lane": "Ln",
+    "Court": "Ct",
+    "Road": "Rd",
+    "North": "N",
+    "South": "S",
+    "East": "E",
+    "West": "W",
+    "Thameslink": "TL",
+}
+_ABBREVIATION_PATTERN = re.compile("|".join(ABBREVIATIONS))
 
+
+@lru_cache(maxsize=1024)
 def abbreviate_stn_name(station_name: str) -> str:
     """Helper function to abbreviate station name by shortening words
 
@@ -17,22 +34,50 @@ def abbreviate_stn_name(station_name: str) -> str:
     Returns:
         str: Abbreviated station name
     """
-    abbreviation_dict: Dict[str, str] = {
-        "Station": "Stn",
-        "Street": "St",
-        "Lane": "Ln",
-        "Court": "Ct",
-        "Road": "Rd",
-        "North": "N",
-        "South": "S",
-        "East": "E",
-        "West": "W",
-        "Thameslink": "TL",
-    }
-    for word, abbreviation in abbreviation_dict.items():
-        station_name = station_name.replace(word, abbreviation)
-
-    return station_name
+    return _ABBREVIATION_PATTERN.sub(
+        lambda match: ABBREVIATIONS[match.group(0)], station_name
+    )
+
+
+class Departure(NamedTuple):
+    """Provider-independent departure record, normalised once per retrieval"""
+
+    std: str
+    etd: str
+    platform: str
+    destination: str
+    destination_short: str
+    cancelled: bool = False
+
+    @classmethod
+    def create(  # pylint: disable=too-many-arguments
+        cls,
+        std: str,
+        etd: str,
+        platform: Optional[str],
+        destination: str,
+        cancelled: Optional[bool] = False,
+    ) -> "Departure":
+        """Create departure record, abbreviating the destination name
+
+        Args:
+            std (str): Scheduled departure time
+            etd (str): Estimated departure time or status (e.g. "On time")
+            platform (str): Platform, if known
+            destination (str): Final destination station name
+            cancelled (bool): Whether the service is cancelled
+
+        Returns:
+            Departure: Departure record
+        """
+        return cls(
+            std,
+            etd,
+            (platform or "")[0:2],
+            destination,
+            abbreviate_stn_name(destination),
+            bool(cancelled) or etd == "Cancelled",
+        )
 
 
 class TrainModel(Enum):
@@ -52,14 +97,19 @@ class TrainObject:
     number: int
     url: str = ""
     token: str = ""
+    wsdl_cache_ttl: int = 86400
 
 
 class TrainBase(ABC):
     """Abstract base class for all train models"""
 
+    # Time the data was fetched, in seconds since the epoch; set by the factory
+    fetched: float = 0.0
+
     def __init__(self) -> None:
         self._num: int = 0
-        self._data: Optional[Any] = None
+        self._departures: Optional[Tuple[Departure, ...]] = None
+        self._message: str = ""
         self.origin: str = ""
         self.destination: str = ""
 
@@ -73,15 +123,85 @@ class TrainBase(ABC):
         """
 
     @abstractmethod
+    async def aretrieve_data(self, protocol: Any, train_object: TrainObject) -> None:
+        """Asynchronously retrieves train data from API; counterpart of retrieve_data
+
+        Args:
+            protocol: async HTTP client (e.g. httpx.AsyncClient)
+            train_object: Train object
+        """
+
+    @property
+    def num(self) -> int:
+        """Number of trains requested"""
+        return self._num
+
+    @property
+    def message(self) -> str:
+        """Service message (e.g. disruption notice), empty if there is none"""
+        return self._message
+
+    @property
+    def departures(self) -> Tuple[Departure, ...]:
+        """Parsed departures, in departure order
+
+        Raises:
+            ValueError: If no train data has been retrieved
+        """
+        if self._departures is None:
+            raise ValueError("No train data available.")
+        return self._departures
+
     def fetch_train(self, num: int) -> str:
-        """Return requested train data
+        """Generate next train string
+
+        String is returned in format:
+            [hh:mm] | [Platform #] to [Final Destination Station] - [Status]
+
+        A departure without a platform is shown as the error message line.
+
+        Args:
+            num (int): Next train departing number starting from 0
+
+        Returns:
+            str: Formatted string or error message
+        """
+        self._validate_number(num)
+        departures = self.departures
+        if num < len(departures) and departures[num].platform:
+            departure = departures[num]
+            return TrainBase._format_line(
+                departure.std,
+                departure.platform,
+                departure.destination_short,
+                departure.etd,
+            )
+        return self._handle_error(num)
+
+    def fetch_trains(self, num: int) -> List[str]:
+        """Generate the next ``num`` train strings
 
         Args:
-            num (int): Desired train number
+            num (int): Number of trains
+
+        Returns:
+            list: Formatted strings or error message lines
+        """
+        return [self.fetch_train(i) for i in range(num)]
+
+    def _handle_error(self, num: int) -> str:
+        """Format the service message (or a default) for an empty train line
+
+        Args:
+            num (int): Train number
 
         Returns:
-            str: Train data
+            str: Line ``num`` of the error message
         """
+        error_msg = (
+            self._message or f"No trains to {self.destination} from {self.origin}."
+        )
+        return TrainBase.format_error_msg(error_msg, num)
 
     @staticmethod
     def format_train_string(
@@ -99,10 +219,27 @@ class TrainBase(ABC):
         Returns:
             str: Formatted string
         """
-        return (
-            f"{arrival_t} | P{platform} to {abbreviate_stn_name(dest_stn)} - {status}"
+        return TrainBase._format_line(
+            arrival_t, platform, abbreviate_stn_name(dest_stn), status
         )
 
+    @staticmethod
+    def _format_line(
+        arrival_t: str, platform: str, dest_short: str, status: str
+    ) -> str:
+        """Format a train line whose destination is already abbreviated
+
+        Args:
+            arrival_t (str): The time the train is due to arrive at the station.
+            platform (str): The platform number the train is arriving at.
+            dest_short (str): The abbreviated destination station of the train.
+            status (str): The status of the train.
+
+        Returns:
+            str: Formatted string
+        """
+        return f"{arrival_t} | P{platform} to {dest_short} - {status}"
+
     @staticmethod
     def format_error_msg(error_msg: str, num: int) -> str:
         """Format error message by line wrapping over each line
@@ -2,36 +2,118 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import os
 import sys
+import time
+from importlib import import_module
 from pathlib import Path
-from typing import Any, Callable
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
 
 from loguru import logger
 
 from inky_pi.display.display_base import DisplayBase, DisplayModel, DisplayOutput
-from inky_pi.display.inky_draw import instantiate_inky_display
-from inky_pi.display.terminal_draw import instantiate_terminal_display
-from inky_pi.train.huxley2 import instantiate_huxley2
-from inky_pi.train.open_live import instantiate_open_live
+from inky_pi.metrics import track_fetch
+from inky_pi.timing import stage, timed
 from inky_pi.train.train_base import TrainBase, TrainModel, TrainObject
-from inky_pi.weather.open_weather_map import instantiate_open_weather_map
 from inky_pi.weather.weather_base import WeatherBase, WeatherModel, WeatherObject
 
+if TYPE_CHECKING:
+    from inky_pi.cache import ResponseCache
+
 LOG_ROOT_DIR = Path(__file__).parent.parent
 LOG_FILE = LOG_ROOT_DIR.joinpath("inky.log")
 LOG_ROTATION = "5 MB"
+LOG_ROTATION_BYTES = 5_000_000  # LOG_ROTATION, for the buffered sink
 LOG_SERIALIZE = True
-
-
-def configure_logging() -> None:
+LOG_BUFFER_ENV_VAR = "INKY_PI_LOG_BUFFER"
+ASYNC_CONCURRENCY = 4
+
+T = TypeVar("T")
+P = TypeVar("P", TrainBase, WeatherBase)
+
+# Backend registries: "module:factory" paths, only imported once selected
+DISPLAY_REGISTRY: dict[DisplayModel, str] = {
+    DisplayModel.INKY: "inky_pi.display.inky_draw:instantiate_inky_display",
+    DisplayModel.TERMINAL: "inky_pi.display.terminal_draw:instantiate_terminal_display",
+    DisplayModel.DESKTOP: "inky_pi.display.inky_draw:instantiate_inky_display",
+    DisplayModel.FILE: "inky_pi.display.inky_draw:instantiate_inky_display",
+    DisplayModel.BUFFER: "inky_pi.display.inky_draw:instantiate_inky_display",
+}
+TRAIN_REGISTRY: dict[TrainModel, str] = {
+    TrainModel.OPEN_LIVE: "inky_pi.train.open_live:instantiate_open_live",
+    TrainModel.HUXLEY2: "inky_pi.train.huxley2:instantiate_huxley2",
+}
+WEATHER_REGISTRY: dict[WeatherModel, str] = {
+    WeatherModel.OPEN_WEATHER_MAP: (
+        "inky_pi.weather.open_weather_map:instantiate_open_weather_map"
+    ),
+}
+ASYNC_TRAIN_REGISTRY: dict[TrainModel, str] = {
+    TrainModel.OPEN_LIVE: "inky_pi.train.open_live:ainstantiate_open_live",
+    TrainModel.HUXLEY2: "inky_pi.train.huxley2:ainstantiate_huxley2",
+}
+ASYNC_WEATHER_REGISTRY: dict[WeatherModel, str] = {
+    WeatherModel.OPEN_WEATHER_MAP: (
+        "inky_pi.weather.open_weather_map:ainstantiate_open_weather_map"
+    ),
+}
+
+
+def configure_logging(buffered: Optional[bool] = None) -> None:
     """Configure logging options
 
     See: https://loguru.readthedocs.io/en/stable/api.html
+
+    Args:
+        buffered (bool): Buffer records in memory and write them to the log file
+            in background batches (default: INKY_PI_LOG_BUFFER=1), to keep log
+            I/O off the refresh and reduce SD card writes
     """
-    logger.add(LOG_FILE, rotation=LOG_ROTATION, serialize=LOG_SERIALIZE)
+    if buffered is None:
+        buffered = os.environ.get(LOG_BUFFER_ENV_VAR, "") == "1"
+    if not buffered:
+        logger.add(LOG_FILE, rotation=LOG_ROTATION, serialize=LOG_SERIALIZE)
+        return
+    # pylint: disable=import-outside-toplevel
+    from inky_pi.log_buffer import BufferedFileSink
+
+    logger.add(
+        BufferedFileSink(LOG_FILE, LOG_ROTATION_BYTES, serialize=LOG_SERIALIZE),
+        serialize=LOG_SERIALIZE,
+    )
+
+
+def load_backend(entry_point: str) -> Callable[..., Any]:
+    """Imports a backend module and returns its factory function
 
+    Backend modules pull in heavy dependencies (Pillow, fonts, rich, zeep,
+    requests) so they are only imported when a model is actually selected.
 
+    Args:
+        entry_point (str): Path in the form "package.module:function"
+
+    Returns:
+        Callable: The backend factory function
+    """
+    module_name, _, attribute = entry_point.partition(":")
+    with stage(f"import:{module_name}"):
+        module = import_module(module_name)
+    factory: Callable[..., Any] = getattr(module, attribute)
+    return factory
+
+
+@timed("display_init")
 def display_model_factory(display_object: DisplayOutput) -> DisplayBase:
     """Selects and instantiates the defined display model to use
 
@@ -41,12 +123,10 @@ def display_model_factory(display_object: DisplayOutput) -> DisplayBase:
     Returns:
         DisplayBase: DisplayBase object
     """
-    display_handler: dict[DisplayModel, Callable[[DisplayOutput], DisplayBase]] = {
-        DisplayModel.INKY: instantiate_inky_display,
-        DisplayModel.TERMINAL: instantiate_terminal_display,
-        DisplayModel.DESKTOP: instantiate_inky_display,
-    }
-    return display_handler[display_object.model](display_object)
+    display_handler: Callable[[DisplayOutput], DisplayBase] = load_backend(
+        DISPLAY_REGISTRY[display_object.model]
+    )
+    return display_handler(display_object)
 
 
 def import_display(display_object: DisplayOutput) -> DisplayBase:
@@ -82,46 +162,167 @@ def _check_open_live_params(train_object: TrainObject) -> None:
         raise ValueError("Open Live requires URL and API token.")
 
 
-def train_model_factory(train_object: TrainObject) -> TrainBase:
+def _fetch(
+    handler: Callable[[Any], P], request_object: Any, cache: Optional[ResponseCache]
+) -> P:
+    """Call a backend factory, through the response cache if one is given
+
+    Only actual provider fetches (not cache hits) are recorded in the metrics.
+
+    Args:
+        handler (Callable): Backend factory
+        request_object (Any): TrainObject or WeatherObject
+        cache (ResponseCache): Optional response cache
+
+    Returns:
+        Provider object
+    """
+
+    def fetch() -> P:
+        with track_fetch(request_object.model):
+            data = handler(request_object)
+        # Stamped before caching, so a cache hit keeps its original fetch time
+        data.fetched = time.time()
+        return data
+
+    if cache is None:
+        return fetch()
+    # pylint: disable=import-outside-toplevel
+    from inky_pi.cache import cached_fetch
+
+    return cached_fetch(cache, request_object, fetch)
+
+
+@timed("fetch_train")
+def train_model_factory(
+    train_object: TrainObject, cache: Optional[ResponseCache] = None
+) -> TrainBase:
     """Selects and instantiates the defined train model to use
 
     Args:
         train_object (TrainObject): train object containing model
+        cache (ResponseCache): optional response cache to serve/store data in
 
     Returns:
         TrainBase: TrainBase object
     """
     _check_open_live_params(train_object)
-    train_handler: dict[TrainModel, Callable[[TrainObject], TrainBase]] = {
-        TrainModel.OPEN_LIVE: instantiate_open_live,
-        TrainModel.HUXLEY2: instantiate_huxley2,
-    }
+    train_handler: Callable[[TrainObject], TrainBase] = load_backend(
+        TRAIN_REGISTRY[train_object.model]
+    )
     try:
-        return train_handler[train_object.model](train_object)
+        return _fetch(train_handler, train_object, cache)
     except ValueError as exc:
         logger.error(exc)
         sys.exit(1)
 
 
-def weather_model_factory(weather_object: WeatherObject) -> WeatherBase:
+@timed("fetch_weather")
+def weather_model_factory(
+    weather_object: WeatherObject, cache: Optional[ResponseCache] = None
+) -> WeatherBase:
     """Selects and instantiates the defined weather model to use
 
     Args:
         weather_object (WeatherObject): weather object containing model
+        cache (ResponseCache): optional response cache to serve/store data in
 
     Returns:
         WeatherBase: WeatherBase object
     """
-    weather_handler: dict[WeatherModel, Callable[[WeatherObject], WeatherBase]] = {
-        WeatherModel.OPEN_WEATHER_MAP: instantiate_open_weather_map,
-    }
+    weather_handler: Callable[[WeatherObject], WeatherBase] = load_backend(
+        WEATHER_REGISTRY[weather_object.model]
+    )
     try:
-        return weather_handler[weather_object.model](weather_object)
+        return _fetch(weather_handler, weather_object, cache)
     except ValueError as exc:
         logger.error(exc)
         sys.exit(1)
 
 
+async def atrain_model_factory(
+    train_object: TrainObject, client: Any = None
+) -> TrainBase:
+    """Selects and asynchronously instantiates the defined train model to use
+
+    Unlike train_model_factory, errors are logged and raised rather than exiting,
+    so one failing board does not stop an event loop serving others.
+
+    Args:
+        train_object (TrainObject): train object containing model
+        client (httpx.AsyncClient): shared HTTP client; a short-lived one if None
+
+    Raises:
+        ValueError: If the train data request is invalid
+
+    Returns:
+        TrainBase: TrainBase object
+    """
+    _check_open_live_params(train_object)
+    train_handler: Callable[..., Awaitable[TrainBase]] = load_backend(
+        ASYNC_TRAIN_REGISTRY[train_object.model]
+    )
+    try:
+        with track_fetch(train_object.model):
+            data = await train_handler(train_object, client)
+        data.fetched = time.time()
+        return data
+    except ValueError as exc:
+        logger.error(exc)
+        raise
+
+
+async def aweather_model_factory(
+    weather_object: WeatherObject, client: Any = None
+) -> WeatherBase:
+    """Selects and asynchronously instantiates the defined weather model to use
+
+    Unlike weather_model_factory, errors are logged and raised rather than exiting.
+
+    Args:
+        weather_object (WeatherObject): weather object containing model
+        client (httpx.AsyncClient): shared HTTP client; a short-lived one if None
+
+    Raises:
+        ValueError: If the weather data request is invalid
+
+    Returns:
+        WeatherBase: WeatherBase object
+    """
+    weather_handler: Callable[..., Awaitable[WeatherBase]] = load_backend(
+        ASYNC_WEATHER_REGISTRY[weather_object.model]
+    )
+    try:
+        with track_fetch(weather_object.model):
+            data = await weather_handler(weather_object, client)
+        data.fetched = time.time()
+        return data
+    except ValueError as exc:
+        logger.error(exc)
+        raise
+
+
+async def gather_bounded(
+    awaitables: Iterable[Awaitable[T]], limit: int = ASYNC_CONCURRENCY
+) -> List[T]:
+    """Awaits all awaitables with at most ``limit`` of them running at once
+
+    Args:
+        awaitables (Iterable): e.g. atrain_model_factory/aweather_model_factory calls
+        limit (int): maximum number of concurrent requests
+
+    Returns:
+        list: Results in the same order as the awaitables
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(awaitable: Awaitable[T]) -> T:
+        async with semaphore:
+            return await awaitable
+
+    return list(await asyncio.gather(*(_run(awaitable) for awaitable in awaitables)))
+
+
 def load_json(json_file: Path | str) -> Any:
     """
     Read a Json file and return it
@@ -4,11 +4,12 @@ Fetches data from OpenWeatherMap API and generates formatted data"""
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional
 
 import requests
 from loguru import logger
 
+from inky_pi.http_session import create_async_http_client, get_http_session
 from inky_pi.weather.weather_base import (
     IconType,
     ScaleType,
@@ -21,6 +22,7 @@ from inky_pi.weather.weather_base import (
 # Weather formatting constants
 DEG_C: str = "\N{DEGREE SIGN}" + "C"
 DEG_F: str = "\N{DEGREE SIGN}" + "F"
+ONE_CALL_URL = "https://api.openweathermap.org/data/3.0/onecall?"
 
 
 def _check_day_limit(day: int) -> None:
@@ -43,19 +45,54 @@ class OpenWeatherMap(WeatherBase):
         This must be called before any other data manipulation methods.
 
         Args:
-            protocol (Any): Requests object
+            protocol (Any): Requests session (or module) for HTTP requests
             weather_object: WeatherObject object
         """
-        payload: dict[str, float | str] = {
+        response: Any = protocol.get(
+            ONE_CALL_URL, params=self._request_params(weather_object)
+        )
+        self._parse_response(response)
+
+    async def aretrieve_data(
+        self, protocol: Any, weather_object: WeatherObject
+    ) -> None:
+        """Asynchronously retrieves weather data from OpenWeatherMap 7-day forecast API.
+
+        Args:
+            protocol (Any): httpx.AsyncClient for HTTP requests
+            weather_object: WeatherObject object
+        """
+        response: Any = await protocol.get(
+            ONE_CALL_URL, params=self._request_params(weather_object)
+        )
+        self._parse_response(response)
+
+    @staticmethod
+    def _request_params(weather_object: WeatherObject) -> dict[str, float | str]:
+        """Build the One Call API query parameters
+
+        Args:
+            weather_object: WeatherObject object
+
+        Returns:
+            dict: Query parameters
+        """
+        return {
             "lat": weather_object.latitude,
             "lon": weather_object.longitude,
             "exclude": weather_object.exclude_flags,
             "appid": weather_object.weather_api_token,
         }
-        response: Any = protocol.get(
-            "https://api.openweathermap.org/data/3.0/onecall?", params=payload
-        )
 
+    def _parse_response(self, response: Any) -> None:
+        """Store the decoded weather response
+
+        Args:
+            response (Any): requests or httpx response
+
+        Raises:
+            ValueError: If the response reports an error
+        """
         self._data = response.json()
 
         # Check for errors in weather response, i.e. API key invalid (cod==401)
@@ -228,15 +265,39 @@ class OpenWeatherMap(WeatherBase):
             return f"Error retrieving weather. {ex!r}"
 
 
-def instantiate_open_weather_map(weather_object: WeatherObject) -> OpenWeatherMap:
+def instantiate_open_weather_map(
+    weather_object: WeatherObject, session: Optional[requests.Session] = None
+) -> OpenWeatherMap:
     """Open Weather Map object creator
 
     Args:
         weather_object (WeatherObject): weather object containing model
+        session (requests.Session): HTTP session; defaults to the shared session
+
+    Returns:
+        OpenWeatherMap: OpenWeatherMap object
+    """
+    weather_base = OpenWeatherMap()
+    weather_base.retrieve_data(session or get_http_session(), weather_object)
+    return weather_base
+
+
+async def ainstantiate_open_weather_map(
+    weather_object: WeatherObject, client: Any = None
+) -> OpenWeatherMap:
+    """Asynchronous Open Weather Map object creator
+
+    Args:
+        weather_object (WeatherObject): weather object containing model
+        client (httpx.AsyncClient): HTTP client; a short-lived one is used if None
 
     Returns:
         OpenWeatherMap: OpenWeatherMap object
     """
     weather_base = OpenWeatherMap()
-    weather_base.retrieve_data(requests, weather_object)
+    if client is None:
+        async with create_async_http_client() as own_client:
+            await weather_base.aretrieve_data(own_client, weather_object)
+    else:
+        await weather_base.aretrieve_data(client, weather_object)
     return weather_base
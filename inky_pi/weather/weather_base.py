@@ -62,6 +62,9 @@ class ScaleType(Enum):
 class WeatherBase(ABC):
     """Abstract base class for all weather models"""
 
+    # Time the data was fetched, in seconds since the epoch; set by the factory
+    fetched: float = 0.0
+
     @abstractmethod
     def retrieve_data(self, protocol: Any, weather_object: WeatherObject) -> None:
         """Retrieves weather data from API; must be called after constructor
@@ -71,6 +74,17 @@ class WeatherBase(ABC):
             weather_object: Weather object
         """
 
+    @abstractmethod
+    async def aretrieve_data(
+        self, protocol: Any, weather_object: WeatherObject
+    ) -> None:
+        """Asynchronously retrieves weather data from API; counterpart of retrieve_data
+
+        Args:
+            protocol: async HTTP client (e.g. httpx.AsyncClient)
+            weather_object: Weather object
+        """
+
     @abstractmethod
     def get_icon(self, day: int = 0) -> IconType:
         """Return requested weather icon
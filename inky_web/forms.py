@@ -2,8 +2,6 @@
 Forms for the flask app
 """
 
-from pathlib import Path
-
 from flask_wtf import FlaskForm
 from wtforms import (
     BooleanField,
@@ -16,13 +14,12 @@ from wtforms import (
 from wtforms.validators import InputRequired
 
 from inky_pi.configs import InkyColor, Settings
+from inky_pi.display.display_base import RefreshPolicy
+from inky_pi.stations import get_station_index
 from inky_pi.train.train_base import TrainModel
-from inky_pi.util import load_json
 from inky_pi.weather.weather_base import WeatherModel
 
-ROOT_DIR = Path(__file__).parent
-STATIC_DIR = ROOT_DIR.joinpath("static")
-station_crs_data = load_json(STATIC_DIR / "crs_codes.json")
+stations = get_station_index()
 default_config = Settings()
 
 
@@ -38,6 +35,24 @@ class ConfigurationForm(FlaskForm):  # type: ignore[misc]
         choices=[(color.value, color.value) for color in InkyColor],
         validators=[InputRequired()],
     )
+    display_refresh_policy = SelectField(
+        label="Display Refresh Policy",
+        description=(
+            "When to skip refreshing the Inky display: never (ALWAYS), if the"
+            " frame is unchanged (SKIP_UNCHANGED), or if only the clock changed"
+            " (IGNORE_VOLATILE)"
+        ),
+        choices=[(policy.value, policy.value) for policy in RefreshPolicy],
+        validators=[InputRequired()],
+    )
+    headless_output_file = StringField(
+        label="Headless Output File",
+        description=(
+            "File the headless file output writes each frame to: a PNG image"
+            " (.png) or raw packed 1-bit black/colour planes (any other extension)"
+        ),
+        validators=[InputRequired()],
+    )
     train_model = SelectField(
         label="Train Model",
         description="The model option to use for train predictions",
@@ -47,17 +62,13 @@ class ConfigurationForm(FlaskForm):  # type: ignore[misc]
     station_from = SelectField(
         label="Station From",
         description="The departure station",
-        choices=[
-            (station["crsCode"], station["stationName"]) for station in station_crs_data
-        ],
+        choices=list(stations.choices),
         validators=[InputRequired()],
     )
     station_to = SelectField(
         label="Station To",
         description="The arrival station",
-        choices=[
-            (station["crsCode"], station["stationName"]) for station in station_crs_data
-        ],
+        choices=list(stations.choices),
         validators=[InputRequired()],
     )
     train_number = IntegerField(
@@ -75,6 +86,73 @@ class ConfigurationForm(FlaskForm):  # type: ignore[misc]
         description="Train API URL to fetch data from",
         validators=[InputRequired()],
     )
+    train_wsdl_cache_ttl = IntegerField(
+        label="Train WSDL Cache TTL",
+        description="Seconds to cache the downloaded train API WSDL/XSD files",
+        validators=[InputRequired()],
+    )
+    http_connect_timeout = FloatField(
+        label="HTTP Connect Timeout",
+        description="Seconds to wait for a connection to a train or weather API",
+        validators=[InputRequired()],
+    )
+    http_read_timeout = FloatField(
+        label="HTTP Read Timeout",
+        description="Seconds to wait for a train or weather API to respond",
+        validators=[InputRequired()],
+    )
+    http_retries = IntegerField(
+        label="HTTP Retries",
+        description=(
+            "Retries of a failed train or weather API request, with backoff"
+            " (0 disables retries)"
+        ),
+        validators=[InputRequired()],
+    )
+    response_cache = BooleanField(
+        label="Response Cache",
+        description=(
+            "Cache train and weather responses on disk between runs, serving"
+            " stale weather data while refreshing in the background (train"
+            " data is never served stale)"
+        ),
+    )
+    offline_snapshot = BooleanField(
+        label="Offline Snapshot",
+        description=(
+            "Save the last fetched train and weather data and show it, marked"
+            " stale, until fresh data arrives or when it cannot be fetched"
+        ),
+    )
+    offline_snapshot_wait = FloatField(
+        label="Offline Snapshot Wait",
+        description=(
+            "Seconds to wait for fresh data before showing the saved snapshot;"
+            " keep it above the usual fetch time, as fresh data arriving later"
+            " refreshes the display a second time (0 shows it immediately)"
+        ),
+        validators=[InputRequired()],
+    )
+    serve_train_interval = IntegerField(
+        label="Serve Train Interval",
+        description="Seconds between train data refreshes in serve (daemon) mode",
+        validators=[InputRequired()],
+    )
+    serve_weather_interval = IntegerField(
+        label="Serve Weather Interval",
+        description="Seconds between weather data refreshes in serve (daemon) mode",
+        validators=[InputRequired()],
+    )
+    serve_schedule = StringField(
+        label="Serve Schedule",
+        description=(
+            "Time-of-day display options in serve (daemon) mode as a"
+            " comma-delimited list of HH:MM-HH:MM=option rules (without spaces);"
+            " the weather option is shown outside them. Options: train, weather,"
+            " night."
+        ),
+        validators=[InputRequired()],
+    )
     weather_model = SelectField(
         label="Weather Model",
         description="Which weather model to use",
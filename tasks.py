@@ -9,15 +9,22 @@ from __future__ import annotations
 import platform
 import shutil
 import webbrowser
+from datetime import datetime
 from pathlib import Path
 
 import pytest
 from invoke import Context, exceptions, runners, task  # type: ignore
 
+from inky_pi.stations import CRS_CODES_FILE, CRS_INDEX_FILE, build_station_index
+
 ROOT_DIR = Path(__file__).parent
 BIN_DIR = ROOT_DIR.joinpath("bin")
 SETUP_FILE = ROOT_DIR.joinpath("setup.py")
 TEST_DIR = ROOT_DIR.joinpath("tests")
+BENCH_DIR = TEST_DIR.joinpath("benchmarks")
+BENCH_BASELINE_FILE = BENCH_DIR.joinpath("baseline.json")
+BENCH_THRESHOLD = 0.2
+BENCH_MIN_ROUNDS = 15
 SOURCE_DIR = ROOT_DIR.joinpath("inky_pi")
 FLASK_DIR = ROOT_DIR.joinpath("inky_web")
 TOX_DIR = ROOT_DIR.joinpath(".tox")
@@ -25,6 +32,7 @@ JUNIT_XML_FILE = BIN_DIR.joinpath("report.xml")
 COVERAGE_XML_FILE = BIN_DIR.joinpath("coverage.xml")
 COVERAGE_HTML_DIR = BIN_DIR.joinpath("coverage_html")
 COVERAGE_HTML_FILE = COVERAGE_HTML_DIR.joinpath("index.html")
+BENCH_RESULTS_DIR = BIN_DIR.joinpath("benchmarks")
 COV_ALL_THRESHOLD = 90
 COV_UNIT_THRESHOLD = 75
 DOCS_DIR = ROOT_DIR.joinpath("docs")
@@ -161,6 +169,8 @@ def test(
     if junit:
         pytest_args.append(f"--junitxml={JUNIT_XML_FILE}")
 
+    # Benchmarks only run through the bench task
+    pytest_args.append(f"--ignore={BENCH_DIR}")
     pytest_args.append(str(TEST_DIR))
     return_code = pytest.main(pytest_args)
 
@@ -203,6 +213,139 @@ def test_unit(
     )
 
 
+@task(
+    optional=["args", "name"],
+    help={
+        "args": "Arguments to pass to pytest (e.g. -k display_data)",
+        "name": "Results file name, without extension (default: a timestamp)",
+        "min_rounds": "Minimum timed rounds per benchmark",
+    },
+)
+def bench(
+    _: Context,
+    args: str | None = None,
+    name: str | None = None,
+    min_rounds: int = BENCH_MIN_ROUNDS,
+) -> Path:
+    """
+    Run the benchmark suite against recorded fixtures and save the results as JSON
+    :param _: The context object that is passed to invoke tasks
+    :param args: Extra pytest arguments (optional)
+    :param name: Name of the results file in bin/benchmarks (optional)
+    :param min_rounds: Minimum number of timed rounds per benchmark
+    :return: Path of the results file
+    """
+    BENCH_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    results_file = BENCH_RESULTS_DIR.joinpath(
+        f"{name or datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    pytest_args = [
+        "-q",
+        "--benchmark-only",
+        "--benchmark-sort=name",
+        f"--benchmark-min-rounds={min_rounds}",
+        f"--benchmark-json={results_file}",
+    ]
+    if args:
+        pytest_args.extend(args.split())
+    pytest_args.append(str(BENCH_DIR))
+    return_code = pytest.main(pytest_args)
+
+    if return_code:
+        raise exceptions.Exit("Benchmarks failed", code=return_code)
+    print(f"Benchmark results written to {results_file}")
+    return results_file
+
+
+@task(
+    optional=["baseline", "args", "results"],
+    help={
+        "baseline": "Baseline JSON to compare against",
+        "threshold": "Allowed relative slowdown or memory growth (0.2 = 20%)",
+        "min_rounds": "Minimum timed rounds per benchmark",
+        "args": "Arguments to pass to pytest (e.g. -k display_data)",
+        "results": "Compare existing pytest-benchmark results instead of a fresh run",
+        "update": "Write the results to the baseline instead of comparing",
+    },
+)
+def bench_compare(  # pylint: disable=too-many-arguments
+    _: Context,
+    baseline: str | None = None,
+    threshold: float = BENCH_THRESHOLD,
+    min_rounds: int = BENCH_MIN_ROUNDS,
+    args: str | None = None,
+    results: str | None = None,
+    update: bool = False,
+) -> None:
+    """
+    Fail if any benchmarked stage is slower, or peaks higher in memory, than the
+    baseline by more than the threshold. Timings are compared by their median over
+    the timed rounds, and a slowdown must also exceed the interquartile range of
+    either run, so noisy stages do not fail the gate.
+    :param _: The context object that is passed to invoke tasks
+    :param baseline: Baseline summary JSON (default: tests/benchmarks/baseline.json)
+    :param threshold: Allowed relative slowdown or memory growth
+    :param min_rounds: Minimum number of timed rounds per benchmark
+    :param args: Extra pytest arguments (optional)
+    :param results: pytest-benchmark JSON to use instead of a fresh run (optional)
+    :param update: Store the results as the new baseline
+    """
+    # pylint: disable=import-outside-toplevel
+    from tests.benchmarks.compare import (
+        compare,
+        format_report,
+        load_summary,
+        save_summary,
+    )
+
+    results_file = (
+        Path(results)
+        if results
+        else bench(_, args=args, name="compare", min_rounds=min_rounds)
+    )
+    baseline_file = Path(baseline) if baseline else BENCH_BASELINE_FILE
+    fresh = load_summary(results_file)
+    if update:
+        save_summary(fresh, baseline_file)
+        print(f"Benchmark baseline written to {baseline_file}")
+        return
+
+    base = load_summary(baseline_file)
+    if base["machine"] != fresh["machine"]:
+        print(
+            f"Warning: baseline was recorded on {base['machine']}, this run on"
+            f" {fresh['machine']}"
+        )
+    comparisons = compare(base, fresh, threshold)
+    print(format_report(comparisons))
+    regressions = [
+        comparison.name
+        for comparison in comparisons
+        if comparison.slower or comparison.more_memory
+    ]
+    if regressions:
+        raise exceptions.Exit(
+            f"Performance regression beyond {threshold:.0%} in: {', '.join(regressions)}",
+            code=1,
+        )
+    missing = [comparison.name for comparison in comparisons if comparison.missing]
+    if missing:
+        raise exceptions.Exit(
+            f"Benchmarks missing from this run: {', '.join(missing)} (run all"
+            " benchmarks, or store a new baseline with --update if they were removed)",
+            code=1,
+        )
+
+
+@task
+def build_stations(_: Context) -> None:
+    """
+    Compile the CRS station json into the binary station index
+    """
+    build_station_index(CRS_CODES_FILE, CRS_INDEX_FILE)
+    print(f"Station index written to {CRS_INDEX_FILE}")
+
+
 @task
 def clean_docs(_c: Context) -> None:
     """
@@ -0,0 +1 @@
+"""Benchmark suite for inky_pi."""
@@ -0,0 +1,224 @@
+"""
+Compare benchmark results against a stored baseline
+
+pytest-benchmark results are reduced to a compact per-stage summary (median and
+interquartile range of the timed rounds, and tracemalloc peak memory). A stage
+regresses when it is slower, or allocates more, than the baseline by more than a
+relative threshold, and the slowdown is larger than the noise of either run (the
+larger IQR). A baseline stage missing from the fresh run also fails, so a
+benchmark cannot silently drop out of the gate. Used by the bench-compare task.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PEAK_MEMORY_KEY = "peak_memory_bytes"
+# Peak memory differences below this are allocator noise
+MEMORY_TOLERANCE_BYTES = 4096
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """Timing (seconds) and peak memory (bytes) of one benchmarked stage"""
+
+    median: float
+    iqr: float
+    rounds: int
+    peak_memory_bytes: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class StageComparison:
+    """Baseline and fresh statistics of a stage, and whether it regressed"""
+
+    name: str
+    baseline: Optional[StageStats]
+    fresh: Optional[StageStats]
+    slower: bool = False
+    more_memory: bool = False
+
+    @property
+    def missing(self) -> bool:
+        """Whether the stage is in the baseline but was not run"""
+        return self.baseline is not None and self.fresh is None
+
+    @property
+    def regressed(self) -> bool:
+        """Whether the stage got slower, allocates more, or was not run"""
+        return self.slower or self.more_memory or self.missing
+
+    @property
+    def status(self) -> str:
+        """Short status for the report"""
+        if self.baseline is None:
+            return "new"
+        if self.fresh is None:
+            return "MISSING"
+        if self.regressed:
+            return " & ".join(
+                label
+                for label, flag in (
+                    ("SLOWER", self.slower),
+                    ("MEMORY", self.more_memory),
+                )
+                if flag
+            )
+        return "ok"
+
+
+def summarize(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce pytest-benchmark JSON results to a baseline summary
+
+    Args:
+        results (dict): Decoded pytest-benchmark JSON
+
+    Returns:
+        dict: Machine description, date and per-stage statistics
+    """
+    stages: Dict[str, Dict[str, Any]] = {}
+    for bench in results["benchmarks"]:
+        stats = bench["stats"]
+        stages[bench["name"]] = asdict(
+            StageStats(
+                median=stats["median"],
+                iqr=stats["iqr"],
+                rounds=stats["rounds"],
+                peak_memory_bytes=bench.get("extra_info", {}).get(PEAK_MEMORY_KEY),
+            )
+        )
+    machine = results.get("machine_info", {})
+    return {
+        "machine": {
+            "node": machine.get("node", platform.node()),
+            "machine": machine.get("machine", platform.machine()),
+            "python_version": machine.get("python_version", platform.python_version()),
+        },
+        "datetime": results.get("datetime", datetime.now().isoformat()),
+        "stages": stages,
+    }
+
+
+def load_summary(path: Path) -> Dict[str, Any]:
+    """Load a baseline summary, or summarize raw pytest-benchmark results
+
+    Args:
+        path (Path): JSON file
+
+    Returns:
+        dict: Baseline summary
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        data: Dict[str, Any] = json.load(file)
+    return summarize(data) if "benchmarks" in data else data
+
+
+def save_summary(summary: Dict[str, Any], path: Path) -> None:
+    """Write a baseline summary
+
+    Args:
+        summary (dict): Baseline summary
+        path (Path): JSON file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, indent=2, sort_keys=True) + "\n", "utf-8")
+
+
+def _stats(summary: Dict[str, Any], name: str) -> Optional[StageStats]:
+    stage = summary["stages"].get(name)
+    return StageStats(**stage) if stage is not None else None
+
+
+def compare(
+    baseline: Dict[str, Any], fresh: Dict[str, Any], threshold: float
+) -> List[StageComparison]:
+    """Compare every stage of two summaries
+
+    Args:
+        baseline (dict): Baseline summary
+        fresh (dict): Summary of the fresh run
+        threshold (float): Allowed relative slowdown/memory growth (0.2 = 20%)
+
+    Returns:
+        list: Comparison per stage, sorted by name
+    """
+    comparisons: List[StageComparison] = []
+    for name in sorted({*baseline["stages"], *fresh["stages"]}):
+        base, new = _stats(baseline, name), _stats(fresh, name)
+        if base is None or new is None:
+            comparisons.append(StageComparison(name, base, new))
+            continue
+        slowdown = new.median - base.median
+        slower = slowdown > base.median * threshold and slowdown > max(
+            base.iqr, new.iqr
+        )
+        more_memory = (
+            base.peak_memory_bytes is not None
+            and new.peak_memory_bytes is not None
+            and new.peak_memory_bytes - base.peak_memory_bytes
+            > max(base.peak_memory_bytes * threshold, MEMORY_TOLERANCE_BYTES)
+        )
+        comparisons.append(StageComparison(name, base, new, slower, more_memory))
+    return comparisons
+
+
+def _format_time(stats: Optional[StageStats]) -> str:
+    if stats is None:
+        return "-"
+    return f"{stats.median * 1000:.3f} ±{stats.iqr * 1000:.3f}"
+
+
+def _format_memory(stats: Optional[StageStats]) -> str:
+    if stats is None or stats.peak_memory_bytes is None:
+        return "-"
+    return f"{stats.peak_memory_bytes / 1024:.1f}"
+
+
+def _format_change(comparison: StageComparison) -> str:
+    if comparison.baseline is None or comparison.fresh is None:
+        return "-"
+    return f"{comparison.fresh.median / comparison.baseline.median - 1:+.1%}"
+
+
+def format_report(comparisons: List[StageComparison]) -> str:
+    """Format comparisons as a text table
+
+    Args:
+        comparisons (list): Stage comparisons
+
+    Returns:
+        str: Report, one stage per line
+    """
+    rows = [
+        (
+            "stage",
+            "baseline ms (±IQR)",
+            "fresh ms (±IQR)",
+            "change",
+            "baseline KiB",
+            "fresh KiB",
+            "status",
+        )
+    ]
+    rows.extend(
+        (
+            comparison.name,
+            _format_time(comparison.baseline),
+            _format_time(comparison.fresh),
+            _format_change(comparison),
+            _format_memory(comparison.baseline),
+            _format_memory(comparison.fresh),
+            comparison.status,
+        )
+        for comparison in comparisons
+    )
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(cell.ljust(widths[index]) for index, cell in enumerate(row)).rstrip()
+        for row in rows
+    )
@@ -0,0 +1,214 @@
+"""
+Fixtures for the benchmark suite
+
+Providers are fed the recorded API responses in tests/unit/resources, so every
+benchmark runs offline and measures only inky_pi's own work.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pickle  # nosec B403 - only loads the repo's own recorded fixture
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, Iterator, Optional
+from unittest.mock import patch
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from rich.console import Console
+
+from inky_pi.__main__ import get_runtime_context
+from inky_pi.train.huxley2 import Huxley2
+from inky_pi.train.open_live import OpenLive
+from inky_pi.train.train_base import TrainModel, TrainObject
+from inky_pi.weather.open_weather_map import OpenWeatherMap
+from inky_pi.weather.weather_base import WeatherModel, WeatherObject
+from tests.benchmarks.compare import PEAK_MEMORY_KEY
+
+RESOURCES_DIR = Path(__file__).parent.parent.joinpath("unit", "resources")
+HUXLEY2_TRAIN_DATA = RESOURCES_DIR.joinpath("train_data.json")
+OPEN_LIVE_TRAIN_DATA = RESOURCES_DIR.joinpath("train_data_zeep.pickle")
+WEATHER_DATA = RESOURCES_DIR.joinpath("weather_data.json")
+TRAIN_NUMBER = 3
+
+
+class MemoryBenchmark:
+    """Benchmarks a function's time and peak memory
+
+    The function is timed by pytest-benchmark, then called once more under
+    tracemalloc; the peak traced allocation is stored in the results' extra_info.
+    """
+
+    def __init__(self, benchmark: BenchmarkFixture) -> None:
+        """Initialize fixture
+
+        Args:
+            benchmark (BenchmarkFixture): pytest-benchmark fixture
+        """
+        self._benchmark = benchmark
+
+    def __call__(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Time a function, then measure its peak memory
+
+        Args:
+            function (Callable): Function to benchmark
+            args: Positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            The function's result
+        """
+        result = self._benchmark(function, *args, **kwargs)
+        if self._benchmark.enabled:
+            tracemalloc.start()
+            try:
+                function(*args, **kwargs)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self._benchmark.extra_info[PEAK_MEMORY_KEY] = peak
+        return result
+
+
+@pytest.fixture(name="bench")
+def fixture_bench(benchmark: BenchmarkFixture) -> MemoryBenchmark:
+    """pytest-benchmark's fixture, also recording peak memory"""
+    return MemoryBenchmark(benchmark)
+
+
+class RecordedResponse:
+    """Response holding a recorded body, decoded on each json() call like requests"""
+
+    def __init__(self, text: str) -> None:
+        """Initialize response
+
+        Args:
+            text (str): Recorded response body
+        """
+        self.text = text
+        self.status_code = 200
+
+    def json(self) -> Any:
+        """Decode the body"""
+        return json.loads(self.text)
+
+
+class RecordedSession:
+    """Fake HTTP session returning a recorded response for every request"""
+
+    def __init__(self, json_file: Path) -> None:
+        """Initialize session
+
+        Args:
+            json_file (Path): Recorded response body
+        """
+        self.text = json_file.read_text(encoding="utf-8")
+
+    # pylint: disable=unused-argument
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Fake get method
+
+        Args:
+            url (str): url
+            params (dict): params
+        """
+        return RecordedResponse(self.text)
+
+
+@pytest.fixture(name="train_object")
+def fixture_train_object() -> TrainObject:
+    """Huxley2 train request"""
+    return TrainObject(TrainModel.HUXLEY2, "MZH", "LBG", TRAIN_NUMBER)
+
+
+@pytest.fixture(name="weather_object")
+def fixture_weather_object() -> WeatherObject:
+    """OpenWeatherMap weather request"""
+    return WeatherObject(
+        WeatherModel.OPEN_WEATHER_MAP, 51.5085, -0.1257, "minutely,hourly", "key"
+    )
+
+
+@pytest.fixture(name="huxley2_requests")
+def fixture_huxley2_requests() -> RecordedSession:
+    """Fake session returning the recorded Huxley2 response"""
+    return RecordedSession(HUXLEY2_TRAIN_DATA)
+
+
+@pytest.fixture(name="weather_requests")
+def fixture_weather_requests() -> RecordedSession:
+    """Fake session returning the recorded OpenWeatherMap response"""
+    return RecordedSession(WEATHER_DATA)
+
+
+@pytest.fixture(name="open_live_board")
+def fixture_open_live_board() -> Any:
+    """Recorded OpenLDBWS departure board (zeep StationBoard)"""
+    with open(OPEN_LIVE_TRAIN_DATA, "rb") as file:
+        return pickle.load(file)  # nosec B301
+
+
+@pytest.fixture(name="train_data")
+def fixture_train_data(
+    huxley2_requests: RecordedSession, train_object: TrainObject
+) -> Huxley2:
+    """Huxley2 provider with the recorded departures"""
+    train_base = Huxley2()
+    train_base.retrieve_data(huxley2_requests, train_object)
+    return train_base
+
+
+@pytest.fixture(name="open_live_data")
+def fixture_open_live_data(open_live_board: Any) -> OpenLive:
+    """OpenLive provider with the recorded departures"""
+    train_base = OpenLive()
+    train_base._num = TRAIN_NUMBER  # pylint: disable=protected-access
+    train_base._parse_board(open_live_board)  # pylint: disable=protected-access
+    return train_base
+
+
+@pytest.fixture(name="weather_data")
+def fixture_weather_data(
+    weather_requests: RecordedSession, weather_object: WeatherObject
+) -> OpenWeatherMap:
+    """OpenWeatherMap provider with the recorded forecast"""
+    weather_base = OpenWeatherMap()
+    weather_base.retrieve_data(weather_requests, weather_object)
+    return weather_base
+
+
+@pytest.fixture(name="quiet_console")
+def fixture_quiet_console() -> Iterator[None]:
+    """Send terminal output to the null device instead of the captured stdout"""
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with patch(
+            "inky_pi.display.terminal_draw.Console",
+            lambda: Console(file=devnull, width=120),
+        ):
+            yield
+
+
+@pytest.fixture(name="offline_settings")
+def fixture_offline_settings(
+    monkeypatch: pytest.MonkeyPatch,
+    huxley2_requests: RecordedSession,
+    weather_requests: RecordedSession,
+) -> Generator[None, None, None]:
+    """Settings using Huxley2 without a response cache, served by fake sessions"""
+    monkeypatch.setenv("TRAIN_MODEL", TrainModel.HUXLEY2.value)
+    monkeypatch.setenv("WEATHER_MODEL", WeatherModel.OPEN_WEATHER_MAP.value)
+    monkeypatch.setenv("TRAIN_NUMBER", str(TRAIN_NUMBER))
+    monkeypatch.setenv("RESPONSE_CACHE", "false")
+    monkeypatch.setenv("OFFLINE_SNAPSHOT", "false")
+    get_runtime_context.cache_clear()
+    with (
+        patch("inky_pi.train.huxley2.get_http_session", lambda: huxley2_requests),
+        patch(
+            "inky_pi.weather.open_weather_map.get_http_session",
+            lambda: weather_requests,
+        ),
+    ):
+        yield
+    get_runtime_context.cache_clear()
@@ -0,0 +1,112 @@
+"""Benchmarks for drawing, rendering and the complete display_data pipeline"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterator
+
+import pytest
+
+from inky_pi.__main__ import display_data, get_runtime_context
+from inky_pi.display.display_base import DisplayModel, DisplayOption, DisplayOutput
+from inky_pi.display.inky_draw import InkyDraw
+from inky_pi.display.terminal_draw import TerminalDraw
+from inky_pi.display.util.desktop_driver import DesktopDisplayDriver
+from inky_pi.train.huxley2 import Huxley2
+from inky_pi.weather.open_weather_map import OpenWeatherMap
+from inky_pi.weather.weather_base import IconType
+from tests.benchmarks.conftest import TRAIN_NUMBER, MemoryBenchmark
+
+DRAW_CALLS: dict[str, Callable[[InkyDraw, Huxley2, OpenWeatherMap], Any]] = {
+    "draw_date": lambda display, _, __: display.draw_date(),
+    "draw_time": lambda display, _, __: display.draw_time(),
+    "draw_weather_icon": lambda display, _, __: display.draw_weather_icon(
+        IconType.THUNDERSTORM
+    ),
+    "draw_weather_forecast": lambda display, _, weather: (
+        display.draw_weather_forecast(weather, disp_tomorrow=True)
+    ),
+    "draw_mini_forecast": lambda display, _, weather: display.draw_mini_forecast(
+        weather, day=1
+    ),
+    "draw_forecast_icons": lambda display, _, weather: display.draw_forecast_icons(
+        weather
+    ),
+    "draw_train_times": lambda display, train, _: display.draw_train_times(
+        train, TRAIN_NUMBER
+    ),
+    "draw_goodnight": lambda display, _, weather: display.draw_goodnight(weather),
+}
+
+
+@pytest.fixture(name="inky_display")
+def fixture_inky_display() -> Iterator[InkyDraw]:
+    """InkyDraw on a desktop driver, which is never shown"""
+    display = InkyDraw(DesktopDisplayDriver("yellow"))
+    display.begin_frame()
+    yield display
+
+
+@pytest.mark.benchmark(group="inky_draw")
+@pytest.mark.parametrize("name", list(DRAW_CALLS))
+def test_inky_draw(
+    bench: MemoryBenchmark,
+    inky_display: InkyDraw,
+    train_data: Huxley2,
+    weather_data: OpenWeatherMap,
+    name: str,
+) -> None:
+    """Benchmark each InkyDraw.draw_* method
+
+    Args:
+        bench (MemoryBenchmark): Benchmark fixture
+        inky_display (InkyDraw): Display to draw on
+        train_data (Huxley2): Train provider
+        weather_data (OpenWeatherMap): Weather provider
+        name (str): draw_* method
+    """
+    bench(DRAW_CALLS[name], inky_display, train_data, weather_data)
+
+
+@pytest.mark.benchmark(group="render")
+@pytest.mark.usefixtures("quiet_console")
+def test_terminal_render_text(
+    bench: MemoryBenchmark, train_data: Huxley2, weather_data: OpenWeatherMap
+) -> None:
+    """Benchmark rendering a full train screen to the terminal
+
+    Args:
+        bench (MemoryBenchmark): Benchmark fixture
+        train_data (Huxley2): Train provider
+        weather_data (OpenWeatherMap): Weather provider
+    """
+    display = TerminalDraw()
+    display.draw_date()
+    display.draw_time()
+    display.draw_weather_forecast(weather_data, disp_tomorrow=True)
+    display.draw_train_times(train_data, TRAIN_NUMBER)
+    bench(display.render_text)
+
+
+@pytest.mark.benchmark(group="display_data")
+@pytest.mark.usefixtures("offline_settings", "quiet_console")
+@pytest.mark.parametrize(
+    "model", [DisplayModel.BUFFER, DisplayModel.TERMINAL], ids=lambda m: m.name.lower()
+)
+@pytest.mark.parametrize("option", list(DisplayOption), ids=lambda o: o.name.lower())
+def test_display_data(
+    bench: MemoryBenchmark, option: DisplayOption, model: DisplayModel
+) -> None:
+    """Benchmark a complete cron-style display_data run, settings included
+
+    Args:
+        bench (MemoryBenchmark): Benchmark fixture
+        option (DisplayOption): Display option
+        model (DisplayModel): Headless PNG buffer or terminal output
+    """
+    output = DisplayOutput(model, "yellow")
+
+    def run() -> None:
+        get_runtime_context.cache_clear()
+        display_data(option, output)
+
+    bench(run)
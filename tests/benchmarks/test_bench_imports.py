@@ -0,0 +1,42 @@
+"""Benchmarks for import time of the entry points and display backends"""
+
+from __future__ import annotations
+
+import subprocess  # nosec B404
+import sys
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+IMPORT_ROUNDS = 10
+
+
+@pytest.mark.benchmark(group="import")
+@pytest.mark.parametrize(
+    "module",
+    [
+        "inky_pi.cli",
+        "inky_pi.__main__",
+        "inky_pi.display.inky_draw",
+        "inky_pi.weather.open_weather_map",
+        "inky_pi.train.open_live",
+    ],
+)
+def test_import(benchmark: BenchmarkFixture, module: str) -> None:
+    """Benchmark importing a module in a fresh interpreter
+
+    Interpreter startup is included, so only differences between runs matter.
+
+    Args:
+        benchmark (BenchmarkFixture): Benchmark fixture
+        module (str): Module to import
+    """
+
+    def run() -> None:
+        subprocess.run(  # nosec B603
+            [sys.executable, "-c", f"import {module}"], check=True
+        )
+
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        run, rounds=IMPORT_ROUNDS, iterations=1, warmup_rounds=1
+    )
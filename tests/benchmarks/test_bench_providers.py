@@ -0,0 +1,132 @@
+"""Benchmarks for settings validation and the train and weather providers"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import pytest
+
+from inky_pi.configs import Settings
+from inky_pi.train.huxley2 import instantiate_huxley2
+from inky_pi.train.open_live import OpenLive
+from inky_pi.train.train_base import TrainBase, TrainObject
+from inky_pi.weather.open_weather_map import (
+    OpenWeatherMap,
+    instantiate_open_weather_map,
+)
+from inky_pi.weather.weather_base import WeatherObject
+from tests.benchmarks.conftest import TRAIN_NUMBER, MemoryBenchmark, RecordedSession
+
+
+@pytest.mark.benchmark(group="settings")
+def test_settings(bench: MemoryBenchmark) -> None:
+    """Benchmark Settings() construction and validation
+
+    Args:
+        bench (MemoryBenchmark): Benchmark fixture
+    """
+    config = bench(Settings)
+    assert config.STATION_FROM
+
+
+@pytest.mark.benchmark(group="parse")
+def test_huxley2_fetch_and_parse(
+    bench: MemoryBenchmark,
+    huxley2_requests: RecordedSession,
+    train_object: TrainObject,
+) -> None:
+    """Benchmark Huxley2 instantiation from the recorded response
+
+    Args:
+        bench (MemoryBenchmark): Benchmark fixture
+        huxley2_requests (RecordedSession): Fake session
+        train_object (TrainObject): Train request
+    """
+    train_base = bench(instantiate_huxley2, train_object, huxley2_requests)
+    assert train_base.departures
+
+
+@pytest.mark.benchmark(group="parse")
+def test_open_live_parse(bench: MemoryBenchmark, open_live_board: Any) -> None:
+    """Benchmark parsing the recorded OpenLDBWS departure board
+
+    Args:
+        bench (MemoryBenchmark): Benchmark fixture
+        open_live_board (Any): Recorded zeep StationBoard
+    """
+    # pylint: disable=protected-access
+    train_base = OpenLive()
+    train_base._num = TRAIN_NUMBER
+    bench(train_base._parse_board, open_live_board)
+    assert train_base.departures
+
+
+@pytest.mark.benchmark(group="parse")
+def test_open_weather_map_fetch_and_parse(
+    bench: MemoryBenchmark,
+    weather_requests: RecordedSession,
+    weather_object: WeatherObject,
+) -> None:
+    """Benchmark OpenWeatherMap instantiation from the recorded response
+
+    Args:
+        bench (MemoryBenchmark): Benchmark fixture
+        weather_requests (RecordedSession): Fake session
+        weather_object (WeatherObject): Weather request
+    """
+    weather_base = bench(instantiate_open_weather_map, weather_object, weather_requests)
+    assert weather_base.get_current_condition()
+
+
+@pytest.mark.benchmark(group="fetch_train")
+@pytest.mark.parametrize("provider", ["train_data", "open_live_data"])
+def test_fetch_train(
+    bench: MemoryBenchmark, provider: str, request: pytest.FixtureRequest
+) -> None:
+    """Benchmark formatting each departure line
+
+    Args:
+        bench (MemoryBenchmark): Benchmark fixture
+        provider (str): Train provider fixture name
+        request (pytest.FixtureRequest): Fixture request
+    """
+    train_base: TrainBase = request.getfixturevalue(provider)
+    lines = bench(train_base.fetch_trains, TRAIN_NUMBER)
+    assert len(lines) == TRAIN_NUMBER
+
+
+@pytest.mark.benchmark(group="weather_get")
+@pytest.mark.parametrize(
+    "getter",
+    [
+        lambda data: data.get_icon(),
+        lambda data: data.get_current_weather(),
+        lambda data: data.get_current_temperature(),
+        lambda data: data.get_current_condition(),
+        lambda data: data.get_temp_range(0),
+        lambda data: data.get_condition(1),
+        lambda data: data.get_future_weather(1),
+    ],
+    ids=[
+        "get_icon",
+        "get_current_weather",
+        "get_current_temperature",
+        "get_current_condition",
+        "get_temp_range",
+        "get_condition",
+        "get_future_weather",
+    ],
+)
+def test_weather_getters(
+    bench: MemoryBenchmark,
+    weather_data: OpenWeatherMap,
+    getter: Callable[[OpenWeatherMap], Any],
+) -> None:
+    """Benchmark each OpenWeatherMap accessor used when drawing
+
+    Args:
+        bench (MemoryBenchmark): Benchmark fixture
+        weather_data (OpenWeatherMap): Weather provider
+        getter (Callable): Accessor call
+    """
+    assert bench(getter, weather_data) is not None
@@ -13,6 +13,8 @@ def test_can_successfully_run_main(display_mock: Mock) -> None:
     args.option = "weather"
     args.output = "inky"
     args.dry_run = False
+    args.timings = False
+    args.metrics_file = None
     with patch("inky_pi.__main__._parse_args", return_value=args):
         main()
         display_mock.assert_called_once()
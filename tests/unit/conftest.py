@@ -0,0 +1,19 @@
+"""Shared fixtures for unit tests"""
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+
+from inky_pi.__main__ import get_runtime_context
+
+
+@pytest.fixture(autouse=True, scope="session")
+def fixture_no_offline_snapshot() -> Iterator[None]:
+    """Keep tests from reading or writing the offline snapshot in .cache"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("OFFLINE_SNAPSHOT", "false")
+        get_runtime_context.cache_clear()
+        yield
+    get_runtime_context.cache_clear()
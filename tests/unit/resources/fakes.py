@@ -68,3 +68,25 @@ class FakeRequests:
         assert url is not None
         assert self.response is not None
         return self.response
+
+
+class FakeAsyncRequests(FakeRequests):
+    """Fake async HTTP client. Used in place of httpx.AsyncClient in tests.
+
+    Usage:
+    >>> client = FakeAsyncRequests()
+    >>> client.add_response(test_data, 200)
+    >>> response = await client.get("https://www.example.com")
+    """
+
+    # pylint: disable=invalid-overridden-method
+    async def get(  # type: ignore[override]
+        self, url: str, params: Optional[dict[str, str]] = None
+    ) -> Optional[FakeResponse]:
+        """Fake async get method
+
+        Args:
+            url (str): url
+            params (dict): params
+        """
+        return super().get(url, params)
@@ -0,0 +1,95 @@
+"""Tests for the benchmark baseline comparison"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from tests.benchmarks.compare import (
+    PEAK_MEMORY_KEY,
+    compare,
+    format_report,
+    load_summary,
+    save_summary,
+    summarize,
+)
+
+
+def _results(
+    name: str, median: float, iqr: float, peak: Optional[int] = None
+) -> Dict[str, Any]:
+    return {
+        "machine_info": {"node": "pi", "machine": "armv7l", "python_version": "3.9"},
+        "datetime": "2024-01-01T00:00:00",
+        "benchmarks": [
+            {
+                "name": name,
+                "stats": {"median": median, "iqr": iqr, "rounds": 20},
+                "extra_info": {PEAK_MEMORY_KEY: peak} if peak is not None else {},
+            }
+        ],
+    }
+
+
+def test_slowdown_beyond_threshold_and_noise_regresses() -> None:
+    """Test that a stage regresses only if slower by more than threshold and IQR"""
+    baseline = summarize(_results("test_display", 0.010, 0.001))
+
+    slower = compare(baseline, summarize(_results("test_display", 0.013, 0.001)), 0.2)
+    within = compare(baseline, summarize(_results("test_display", 0.011, 0.001)), 0.2)
+    noisy = compare(baseline, summarize(_results("test_display", 0.013, 0.005)), 0.2)
+
+    assert slower[0].slower and slower[0].status == "SLOWER"
+    assert not within[0].regressed
+    assert not noisy[0].regressed
+
+
+def test_peak_memory_growth_regresses() -> None:
+    """Test that peak memory growth beyond the threshold regresses"""
+    baseline = summarize(_results("test_render", 0.01, 0.001, peak=100_000))
+
+    grown = compare(
+        baseline, summarize(_results("test_render", 0.01, 0.001, 150_000)), 0.2
+    )
+    tiny = compare(
+        summarize(_results("test_render", 0.01, 0.001, peak=100)),
+        summarize(_results("test_render", 0.01, 0.001, peak=1000)),
+        0.2,
+    )
+
+    assert grown[0].more_memory and grown[0].status == "MEMORY"
+    assert not tiny[0].regressed
+
+
+def test_new_stages_pass_and_missing_stages_fail() -> None:
+    """Test that added benchmarks are reported and removed benchmarks fail"""
+    comparisons = compare(
+        summarize(_results("test_old", 0.01, 0.001)),
+        summarize(_results("test_new", 0.01, 0.001)),
+        0.2,
+    )
+
+    assert [(c.name, c.status, c.regressed) for c in comparisons] == [
+        ("test_new", "new", False),
+        ("test_old", "MISSING", True),
+    ]
+    assert [c.name for c in comparisons if c.missing] == ["test_old"]
+    report = format_report(comparisons).splitlines()
+    assert report[0].startswith("stage")
+    assert len(report) == 3
+
+
+def test_summary_round_trip(tmp_path: Path) -> None:
+    """Test that raw results and saved summaries load to the same summary"""
+    results = _results("test_draw", 0.002, 0.0001, peak=2048)
+    path = tmp_path.joinpath("baseline.json")
+    save_summary(summarize(results), path)
+
+    summary = load_summary(path)
+    assert summary["machine"]["machine"] == "armv7l"
+    assert summary["stages"]["test_draw"] == {
+        "median": 0.002,
+        "iqr": 0.0001,
+        "rounds": 20,
+        "peak_memory_bytes": 2048,
+    }
@@ -0,0 +1,199 @@
+"""Tests for response cache module"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Generator
+from unittest.mock import Mock, patch
+
+import pytest
+
+from inky_pi.cache import (
+    CACHE_VERSION,
+    CacheEntry,
+    CachePolicy,
+    DiskCache,
+    MemoryCache,
+    cache_key,
+    cached_fetch,
+)
+from inky_pi.train.train_base import TrainModel, TrainObject
+from inky_pi.util import train_model_factory
+
+POLICY = CachePolicy(ttl=60, stale_ttl=600)
+
+
+@pytest.fixture(name="train_object")
+def _train_object() -> Generator[TrainObject, None, None]:
+    yield TrainObject(TrainModel.HUXLEY2, "MZH", "LBG", 3)
+
+
+def _wait_for_refresh() -> None:
+    for thread in threading.enumerate():
+        if thread.name.startswith("inky_refresh_"):
+            thread.join()
+
+
+def test_cache_key_depends_on_request_parameters(train_object: TrainObject) -> None:
+    """Test that different request parameters never share an entry
+
+    Args:
+        train_object (TrainObject): Train object
+    """
+    other = TrainObject(TrainModel.HUXLEY2, "MZH", "LBG", 4)
+    same = TrainObject(TrainModel.HUXLEY2, "MZH", "LBG", 3)
+    assert cache_key(train_object) == cache_key(same)
+    assert cache_key(train_object) != cache_key(other)
+
+
+def test_cache_key_depends_on_cache_version(train_object: TrainObject) -> None:
+    """Test that bumping the cache version orphans existing entries
+
+    Args:
+        train_object (TrainObject): Train object
+    """
+    key = cache_key(train_object)
+    with patch("inky_pi.cache.CACHE_VERSION", CACHE_VERSION + 1):
+        assert cache_key(train_object) != key
+
+
+def test_train_entries_are_never_served_stale(train_object: TrainObject) -> None:
+    """Test that an expired train entry is refetched rather than served
+
+    Args:
+        train_object (TrainObject): Train object
+    """
+    cache = MemoryCache()
+    cache.set(cache_key(train_object), CacheEntry(time.time() - 31, "old"))
+    fetch = Mock(return_value="fresh")
+    assert cached_fetch(cache, train_object, fetch) == "fresh"
+    fetch.assert_called_once()
+
+
+def test_fresh_entry_is_served_without_fetching(train_object: TrainObject) -> None:
+    """Test that an entry within its TTL is returned directly
+
+    Args:
+        train_object (TrainObject): Train object
+    """
+    cache = MemoryCache()
+    fetch = Mock(return_value="fresh")
+    assert cached_fetch(cache, train_object, fetch, POLICY) == "fresh"
+    assert cached_fetch(cache, train_object, fetch, POLICY) == "fresh"
+    fetch.assert_called_once()
+
+
+def test_stale_entry_is_served_while_refreshing(train_object: TrainObject) -> None:
+    """Test stale-while-revalidate behaviour
+
+    Args:
+        train_object (TrainObject): Train object
+    """
+    cache = MemoryCache()
+    key = cache_key(train_object)
+    cache.set(key, CacheEntry(time.time() - 120, "stale"))
+    fetch = Mock(return_value="fresh")
+
+    assert cached_fetch(cache, train_object, fetch, POLICY) == "stale"
+    _wait_for_refresh()
+    fetch.assert_called_once()
+    assert cached_fetch(cache, train_object, fetch, POLICY) == "fresh"
+
+
+def test_failed_refresh_keeps_serving_stale_data(train_object: TrainObject) -> None:
+    """Test that an upstream error during a background refresh is not fatal
+
+    Args:
+        train_object (TrainObject): Train object
+    """
+    cache = MemoryCache()
+    cache.set(cache_key(train_object), CacheEntry(time.time() - 120, "stale"))
+    fetch = Mock(side_effect=ValueError)
+
+    assert cached_fetch(cache, train_object, fetch, POLICY) == "stale"
+    _wait_for_refresh()
+    assert cached_fetch(cache, train_object, fetch, POLICY) == "stale"
+
+
+def test_expired_entry_is_fetched_synchronously(train_object: TrainObject) -> None:
+    """Test that entries beyond the stale window are not served
+
+    Args:
+        train_object (TrainObject): Train object
+    """
+    cache = MemoryCache()
+    cache.set(cache_key(train_object), CacheEntry(time.time() - 1000, "expired"))
+    assert cached_fetch(cache, train_object, Mock(return_value="fresh"), POLICY) == (
+        "fresh"
+    )
+
+
+def test_disk_cache_persists_between_instances(
+    tmp_path: Path, train_object: TrainObject
+) -> None:
+    """Test that a new process (cache instance) sees previously stored entries
+
+    Args:
+        tmp_path (Path): Temporary directory
+        train_object (TrainObject): Train object
+    """
+    cached_fetch(DiskCache(tmp_path), train_object, Mock(return_value="fresh"), POLICY)
+    fetch = Mock()
+    assert cached_fetch(DiskCache(tmp_path), train_object, fetch, POLICY) == "fresh"
+    fetch.assert_not_called()
+
+
+def test_unwritable_disk_cache_still_returns_fresh_value(
+    tmp_path: Path, train_object: TrainObject
+) -> None:
+    """Test that a failed cache write does not fail the refresh
+
+    Args:
+        tmp_path (Path): Temporary directory
+        train_object (TrainObject): Train object
+    """
+    not_a_dir = tmp_path.joinpath("file")
+    not_a_dir.write_text("")
+    cache = DiskCache(not_a_dir.joinpath("cache"))
+    assert cached_fetch(cache, train_object, Mock(return_value="fresh")) == "fresh"
+    assert cache.get(cache_key(train_object)) is None
+
+
+def test_disk_cache_ignores_unreadable_entries(tmp_path: Path) -> None:
+    """Test that a corrupt entry is treated as a cache miss
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    tmp_path.joinpath("key.pickle").write_bytes(b"not a pickle")
+    assert DiskCache(tmp_path).get("key") is None
+
+
+def test_train_model_factory_serves_from_cache(train_object: TrainObject) -> None:
+    """Test that the factory only calls the backend on a cache miss
+
+    Args:
+        train_object (TrainObject): Train object
+    """
+    cache = MemoryCache()
+    with patch("inky_pi.train.huxley2.instantiate_huxley2") as instantiate_mock:
+        first = train_model_factory(train_object, cache)
+        second = train_model_factory(train_object, cache)
+    instantiate_mock.assert_called_once_with(train_object)
+    assert first is second
+
+
+def test_cache_hit_keeps_the_original_fetch_time(train_object: TrainObject) -> None:
+    """Test that data served from the cache reports when it was fetched
+
+    Args:
+        train_object (TrainObject): Train object
+    """
+    cache = MemoryCache()
+    with patch("inky_pi.train.huxley2.instantiate_huxley2"):
+        first = train_model_factory(train_object, cache)
+        fetched = first.fetched
+        time.sleep(0.01)
+        second = train_model_factory(train_object, cache)
+    assert fetched > 0
+    assert second.fetched == fetched
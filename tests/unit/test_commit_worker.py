@@ -0,0 +1,118 @@
+"""Tests for the background display commit worker"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, List
+from unittest.mock import patch
+
+import pytest
+
+from inky_pi.display.inky_draw import InkyDraw
+from inky_pi.display.util.commit_worker import CommitWorker, _close_workers
+from inky_pi.display.util.desktop_driver import DesktopDisplayDriver
+
+
+class _BlockingCommit:
+    """Commit callable that blocks until released, recording committed frames"""
+
+    def __init__(self) -> None:
+        self.frames: List[Any] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, frame: Any) -> None:
+        self.started.set()
+        self.release.wait(5)
+        self.frames.append(frame)
+
+
+def test_worker_only_commits_newest_pending_frame() -> None:
+    """Test that frames arriving during a refresh coalesce into the newest one"""
+    commit = _BlockingCommit()
+    worker = CommitWorker(commit)
+    worker.submit(1)
+    assert commit.started.wait(5)
+    for frame in (2, 3, 4):
+        worker.submit(frame)
+    commit.release.set()
+
+    assert worker.wait_idle(5)
+    assert commit.frames == [1, 4]
+    assert (worker.committed, worker.dropped) == (2, 2)
+    worker.close(5)
+
+
+def test_worker_keeps_running_after_commit_error() -> None:
+    """Test that a failed refresh does not stop later frames being shown"""
+    frames: List[Any] = []
+
+    def commit(frame: Any) -> None:
+        if frame == "bad":
+            raise OSError("SPI error")
+        frames.append(frame)
+
+    worker = CommitWorker(commit)
+    worker.submit("bad")
+    assert worker.wait_idle(5)
+    worker.submit("good")
+    assert worker.wait_idle(5)
+    assert frames == ["good"]
+    worker.close(5)
+
+
+def test_close_commits_pending_frame_then_rejects_new_ones() -> None:
+    """Test that closing drains the mailbox and stops the thread"""
+    commit = _BlockingCommit()
+    worker = CommitWorker(commit)
+    worker.submit(1)
+    assert commit.started.wait(5)
+    worker.submit(2)
+    commit.release.set()
+    worker.close(5)
+
+    assert commit.frames == [1, 2]
+    with pytest.raises(RuntimeError):
+        worker.submit(3)
+
+
+def test_exit_hook_commits_pending_frames_of_open_workers() -> None:
+    """Test that the exit hook drains open workers and skips closed ones"""
+    commit = _BlockingCommit()
+    commit.release.set()
+    worker = CommitWorker(commit)
+    closed = CommitWorker(commit)
+    closed.close(5)
+    worker.submit(1)
+    _close_workers()
+    assert commit.frames == [1]
+    with pytest.raises(RuntimeError):
+        worker.submit(2)
+
+
+def test_inky_draw_shows_snapshot_on_worker_thread() -> None:
+    """Test that background rendering returns before the panel refresh finishes"""
+    commit_threads: List[str] = []
+    release = threading.Event()
+
+    def show(_: Any) -> None:
+        commit_threads.append(threading.current_thread().name)
+        release.wait(5)
+
+    with patch.object(DesktopDisplayDriver, "show", show):
+        display = InkyDraw(DesktopDisplayDriver(), background_commit=True)
+        with display:
+            display.draw_date()
+        worker = display.commit_worker
+        assert worker is not None
+        # The panel is still refreshing while the next frame is drawn
+        with patch.object(worker, "submit") as submit_mock:
+            with display:
+                display.draw_time()
+        release.set()
+        assert worker.wait_idle(5)
+        worker.close(5)
+
+    assert commit_threads == ["inky_commit"]
+    image, _ = submit_mock.call_args.args[0]
+    assert image is not display._img
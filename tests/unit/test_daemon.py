@@ -0,0 +1,215 @@
+"""Tests for the long-running serve mode"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from datetime import time as dt_time
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from inky_pi.__main__ import get_runtime_context
+from inky_pi.cli import cli
+from inky_pi.daemon import (
+    CLOCK_INTERVAL,
+    RETRY_INTERVAL,
+    RefreshScheduler,
+    ScheduleRule,
+    create_scheduler,
+    parse_schedule,
+    select_option,
+)
+from inky_pi.display.display_base import DisplayOption
+
+# A Saturday at 12:00:30 local time
+NOON = datetime(2024, 1, 6, 12, 0, 30).timestamp()
+
+
+def test_parse_schedule_returns_rules_in_order() -> None:
+    """Test that schedule rules are parsed in priority order"""
+    rules = parse_schedule("06:00-10:00=train,22:30-06:00=NIGHT")
+    assert rules == [
+        ScheduleRule(dt_time(6, 0), dt_time(10, 0), DisplayOption.TRAIN),
+        ScheduleRule(dt_time(22, 30), dt_time(6, 0), DisplayOption.NIGHT),
+    ]
+    assert not parse_schedule("")
+
+
+@pytest.mark.parametrize(
+    "schedule", ["06:00=train", "06:00-10:00=bus", "6am-10am=train", "a-b-c=night"]
+)
+def test_parse_schedule_with_invalid_rule_raises_error(schedule: str) -> None:
+    """Test that malformed schedule rules are rejected"""
+    with pytest.raises(ValueError, match="Invalid schedule rule"):
+        parse_schedule(schedule)
+
+
+@pytest.mark.parametrize(
+    "hour, minute, expected",
+    [
+        (5, 59, DisplayOption.NIGHT),
+        (6, 0, DisplayOption.TRAIN),
+        (9, 59, DisplayOption.TRAIN),
+        (10, 0, DisplayOption.WEATHER),
+        (22, 29, DisplayOption.WEATHER),
+        (22, 30, DisplayOption.NIGHT),
+        (0, 0, DisplayOption.NIGHT),
+    ],
+)
+def test_select_option_follows_time_of_day_rules(
+    hour: int, minute: int, expected: DisplayOption
+) -> None:
+    """Test that options are selected by time of day, wrapping past midnight"""
+    rules = parse_schedule("06:00-10:00=train,22:30-06:00=night")
+    assert select_option(rules, datetime(2024, 1, 6, hour, minute)) == expected
+
+
+def _scheduler(schedule: str) -> RefreshScheduler:
+    context = get_runtime_context()
+    return RefreshScheduler(
+        context,
+        context.output_dispatch_table["TERMINAL"],
+        parse_schedule(schedule),
+        train_interval=45,
+        weather_interval=600,
+    )
+
+
+def test_tick_fetches_each_source_on_its_own_cadence() -> None:
+    """Test that the clock, train and weather refreshes run independently"""
+    scheduler = _scheduler("00:00-23:59=train")
+    with (
+        patch("inky_pi.daemon.weather_model_factory") as weather,
+        patch("inky_pi.daemon.train_model_factory") as train,
+        patch("inky_pi.daemon.import_display") as import_display_mock,
+    ):
+        # The clock is due on the minute, before the next train refresh
+        next_due = scheduler.tick(NOON)
+        assert next_due == NOON + 30
+        assert (weather.call_count, train.call_count) == (1, 1)
+
+        next_due = scheduler.tick(next_due)
+        assert next_due == NOON + 45
+        assert (weather.call_count, train.call_count) == (1, 1)
+
+        # Nothing is due yet, so nothing is fetched or redrawn
+        scheduler.tick(NOON + 40)
+        scheduler.tick(NOON + 45)
+        assert (weather.call_count, train.call_count) == (1, 2)
+
+        scheduler.tick(NOON + 600)
+        assert (weather.call_count, train.call_count) == (2, 3)
+
+    # The display is created once and reused for every frame
+    import_display_mock.assert_called_once()
+    display = import_display_mock.return_value
+    assert display.frame.call_count == 4
+    display.draw_train_times.assert_called_with(
+        train.return_value, get_runtime_context().config.TRAIN_NUMBER
+    )
+
+
+def test_tick_does_not_fetch_trains_outside_the_train_option() -> None:
+    """Test that train data is only fetched while the TRAIN option is shown"""
+    scheduler = _scheduler("")
+    with (
+        patch("inky_pi.daemon.weather_model_factory") as weather,
+        patch("inky_pi.daemon.train_model_factory") as train,
+        patch("inky_pi.daemon.import_display") as import_display_mock,
+    ):
+        next_due = scheduler.tick(NOON)
+
+    assert scheduler.option == DisplayOption.WEATHER
+    assert next_due == NOON + CLOCK_INTERVAL - 30
+    weather.assert_called_once()
+    train.assert_not_called()
+    import_display_mock.return_value.draw_forecast_icons.assert_called_once()
+
+
+def test_tick_keeps_last_data_and_retries_when_fetch_fails() -> None:
+    """Test that a failed fetch keeps the last data and is retried sooner"""
+    scheduler = _scheduler("")
+    weather_data = MagicMock()
+    with (
+        patch(
+            "inky_pi.daemon.weather_model_factory",
+            side_effect=[weather_data, SystemExit(1)],
+        ),
+        patch("inky_pi.daemon.import_display") as import_display_mock,
+    ):
+        scheduler.tick(NOON)
+        next_due = scheduler.tick(NOON + 600)
+
+    assert next_due == NOON + 600 + min(CLOCK_INTERVAL - 30, RETRY_INTERVAL)
+    draw_weather_forecast = import_display_mock.return_value.draw_weather_forecast
+    assert draw_weather_forecast.call_count == 2
+    assert draw_weather_forecast.call_args.args[0] is weather_data
+
+
+def test_tick_marks_held_trains_stale_when_refetch_fails() -> None:
+    """Test that departures kept after a failed fetch are drawn as stale"""
+    scheduler = _scheduler("00:00-23:59=train")
+    with (
+        patch("inky_pi.daemon.weather_model_factory"),
+        patch(
+            "inky_pi.daemon.train_model_factory",
+            side_effect=[MagicMock(), SystemExit(1)],
+        ),
+        patch("inky_pi.daemon.import_display") as import_display_mock,
+    ):
+        scheduler.tick(NOON)
+        display = import_display_mock.return_value
+        display.draw_stale_time.assert_not_called()
+        scheduler.tick(NOON + 45)
+
+    display.draw_stale_time.assert_called_once_with(datetime.fromtimestamp(NOON))
+
+
+def test_tick_does_not_draw_without_weather_data() -> None:
+    """Test that nothing is drawn until weather data has been fetched"""
+    scheduler = _scheduler("")
+    with (
+        patch("inky_pi.daemon.weather_model_factory", side_effect=ValueError),
+        patch("inky_pi.daemon.import_display") as import_display_mock,
+    ):
+        scheduler.tick(NOON)
+
+    import_display_mock.assert_not_called()
+
+
+def test_run_sleeps_until_stopped() -> None:
+    """Test that run waits for the next due time and exits once stopped"""
+    scheduler = _scheduler("")
+
+    def tick(now: float) -> float:
+        scheduler.stop()
+        return now + 60
+
+    with patch.object(scheduler, "tick", Mock(side_effect=tick)) as tick_mock:
+        scheduler.run()
+    tick_mock.assert_called_once()
+
+
+def test_create_scheduler_uses_settings_unless_overridden() -> None:
+    """Test that intervals default to the serve settings"""
+    context = get_runtime_context()
+    output = context.output_dispatch_table["TERMINAL"]
+    scheduler = create_scheduler(context, output, weather_interval=5)
+    # pylint: disable=protected-access
+    assert scheduler._train_interval == context.config.SERVE_TRAIN_INTERVAL
+    assert scheduler._weather_interval == 5
+
+
+def test_cli_serve_runs_scheduler() -> None:
+    """Test that the serve command builds and runs a scheduler"""
+    with (
+        patch("inky_pi.daemon.create_scheduler") as create_scheduler_mock,
+        patch("inky_pi.cli.signal.signal"),
+    ):
+        result = CliRunner().invoke(
+            cli, ["serve", "--output", "terminal", "--train-interval", "20"]
+        )
+    assert result.exit_code == 0, result.output
+    create_scheduler_mock.return_value.run.assert_called_once_with()
+    assert create_scheduler_mock.call_args.args[2:] == (20, None)
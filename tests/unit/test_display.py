@@ -1,14 +1,26 @@
 """Tests for display module"""
 
 import platform
+from pathlib import Path
+from typing import List
 from unittest.mock import Mock, patch
 
 import pytest
+from PIL import Image
 
 from inky_pi.configs import InkyColor
-from inky_pi.display.display_base import DisplayBase, DisplayModel, DisplayOutput
+from inky_pi.display.display_base import (
+    DisplayBase,
+    DisplayModel,
+    DisplayOption,
+    DisplayOutput,
+    RefreshPolicy,
+)
 from inky_pi.display.inky_draw import InkyDraw
 from inky_pi.display.terminal_draw import TerminalDraw
+from inky_pi.display.util.desktop_driver import DesktopDisplayDriver
+from inky_pi.display.util.frame_hash import FrameHashStore
+from inky_pi.display.util.headless_driver import HeadlessDisplayDriver, HeadlessFormat
 from inky_pi.util import display_model_factory, import_display
 
 
@@ -71,3 +83,217 @@ def test_can_successfully_instantiate_desktop_draw_object() -> None:
     )
     ret: DisplayBase = import_display(desktop_object)
     assert isinstance(ret, InkyDraw)
+
+
+def _render_frames(
+    policy: RefreshPolicy, store: FrameHashStore, clock_times: List[str]
+) -> int:
+    """Render one frame per clock time, returning how many reached the display
+
+    Args:
+        policy (RefreshPolicy): Refresh policy
+        store (FrameHashStore): Frame hash store
+        clock_times (List[str]): Clock text for each frame
+
+    Returns:
+        int: Number of display refreshes
+    """
+    with patch.object(DesktopDisplayDriver, "show") as show_mock:
+        for clock_time in clock_times:
+            with patch(
+                "inky_pi.display.inky_draw.strftime",
+                side_effect=lambda fmt, t=clock_time: t if "%H" in fmt else "Mon 01",
+            ):
+                with InkyDraw(DesktopDisplayDriver(), None, policy, store) as display:
+                    display.draw_date()
+                    display.draw_time()
+        return show_mock.call_count
+
+
+@pytest.mark.parametrize(
+    "policy, clock_times, expected_refreshes",
+    [
+        (RefreshPolicy.ALWAYS, ["10:00", "10:00"], 2),
+        (RefreshPolicy.SKIP_UNCHANGED, ["10:00", "10:00"], 1),
+        (RefreshPolicy.SKIP_UNCHANGED, ["10:00", "10:01"], 2),
+        (RefreshPolicy.IGNORE_VOLATILE, ["10:00", "10:01", "11:11"], 1),
+    ],
+)
+def test_render_screen_applies_refresh_policy(
+    tmp_path: Path,
+    policy: RefreshPolicy,
+    clock_times: List[str],
+    expected_refreshes: int,
+) -> None:
+    """Test that unchanged frames (or clock-only changes) skip the refresh
+
+    Args:
+        tmp_path (Path): Temporary directory
+        policy (RefreshPolicy): Refresh policy
+        clock_times (List[str]): Clock text for each frame
+        expected_refreshes (int): Expected number of display refreshes
+    """
+    store = FrameHashStore(tmp_path.joinpath("frame_hash.json"))
+    assert _render_frames(policy, store, clock_times) == expected_refreshes
+
+
+def test_frame_hash_persists_between_runs(tmp_path: Path) -> None:
+    """Test that a new process skips a frame already shown by a previous one
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    path = tmp_path.joinpath("frame_hash.json")
+    policy = RefreshPolicy.SKIP_UNCHANGED
+    assert _render_frames(policy, FrameHashStore(path), ["10:00"]) == 1
+    assert _render_frames(policy, FrameHashStore(path), ["10:00"]) == 0
+
+    FrameHashStore(path).clear()
+    assert _render_frames(policy, FrameHashStore(path), ["10:00"]) == 1
+
+    path.write_text("not json", encoding="utf-8")
+    assert FrameHashStore(path).load() is None
+    assert _render_frames(policy, FrameHashStore(path), ["10:00"]) == 1
+
+
+def test_inky_draw_reuses_image_across_frames() -> None:
+    """Test that a new frame clears and reuses the image and draw context"""
+    with patch.object(DesktopDisplayDriver, "show"):
+        fresh = InkyDraw(DesktopDisplayDriver())
+        with fresh:
+            fresh.draw_date()
+
+        reused = InkyDraw(DesktopDisplayDriver())
+        image, image_draw = reused._img, reused._img_draw
+        with reused:
+            reused.draw_goodnight(
+                Mock(
+                    **{
+                        "get_temp_range.return_value": "1-2",
+                        "get_condition.return_value": "Rain",
+                    }
+                )
+            )
+        with reused:
+            reused.draw_date()
+
+    assert reused._img is image and reused._img_draw is image_draw
+    assert reused._img.convert("RGB").tobytes() == fresh._img.convert("RGB").tobytes()
+
+
+def test_terminal_draw_begins_each_frame_empty() -> None:
+    """Test that text from a previous frame is not rendered again"""
+    display = TerminalDraw()
+    with patch.object(display, "render_text"):
+        with display:
+            display.draw_date()
+            display.draw_time()
+        with display:
+            display.draw_time()
+    assert len(display._output) == 1
+
+
+@pytest.mark.parametrize("model", [DisplayModel.FILE, DisplayModel.BUFFER])
+def test_can_successfully_instantiate_headless_draw_object(
+    tmp_path: Path, model: DisplayModel
+) -> None:
+    """Test for creating headless instanced objects"""
+    headless_object = DisplayOutput(
+        model=model,
+        base_color=InkyColor.RED.value,
+        output_file=str(tmp_path.joinpath("frame.png")),
+    )
+    ret = import_display(headless_object)
+    assert isinstance(ret, InkyDraw)
+    assert isinstance(ret.display_driver, HeadlessDisplayDriver)
+    assert (ret.display_driver.path is None) == (model == DisplayModel.BUFFER)
+
+
+def test_headless_driver_writes_png_frame_without_viewer(tmp_path: Path) -> None:
+    """Test that a headless frame is encoded and written without an image viewer"""
+    path = tmp_path.joinpath("out", "frame.png")
+    driver = HeadlessDisplayDriver(InkyColor.YELLOW.value, path)
+    with patch("PIL.Image.Image.show") as viewer_mock:
+        with InkyDraw(driver) as display:
+            display.draw_date()
+    viewer_mock.assert_not_called()
+
+    assert path.read_bytes() == driver.buffer
+    with Image.open(path) as image:
+        assert image.size == (driver.WIDTH, driver.HEIGHT)
+        assert image.convert("RGB").tobytes() == display._img.convert("RGB").tobytes()
+
+
+@pytest.mark.parametrize(
+    "base_color, num_planes", [(InkyColor.BLACK.value, 1), (InkyColor.RED.value, 2)]
+)
+def test_headless_driver_packs_raw_planes(base_color: str, num_planes: int) -> None:
+    """Test that raw frames hold one packed 1-bit plane per ink"""
+    driver = HeadlessDisplayDriver(base_color, frame_format=HeadlessFormat.RAW)
+    with InkyDraw(driver) as display:
+        display._img_draw.rectangle((104, 100, 111, 100), driver._color)
+
+    plane_size = driver.WIDTH * driver.HEIGHT // 8
+    assert len(driver.buffer) == num_planes * plane_size
+    # The last plane holds the base color's 8 pixels on row 100
+    row = driver.buffer[-plane_size:][100 * driver.WIDTH // 8 :][: driver.WIDTH // 8]
+    assert row[104 // 8] == 0xFF
+    assert HeadlessFormat.from_path("frame.bin") == HeadlessFormat.RAW
+
+
+def test_static_layer_is_rendered_once_and_composited() -> None:
+    """Test that frames built on the cached static layer match full redraws"""
+    weather = Mock(
+        **{"get_temp_range.return_value": "1-2", "get_condition.return_value": "Rain"}
+    )
+    expected = InkyDraw(DesktopDisplayDriver("red"))
+    expected.draw_goodnight(weather)
+
+    display = InkyDraw(DesktopDisplayDriver("red"))
+    with patch.object(
+        display,
+        "_draw_goodnight_static",
+        wraps=display._draw_goodnight_static,
+    ) as static_mock:
+        display._static_painters[DisplayOption.NIGHT] = static_mock
+        for option in (DisplayOption.NIGHT, DisplayOption.TRAIN, DisplayOption.NIGHT):
+            display.begin_frame(option)
+            if option == DisplayOption.NIGHT:
+                display.draw_goodnight(weather)
+            else:
+                display.draw_date()
+
+    static_mock.assert_called_once()
+    assert display._img.convert("RGB").tobytes() == (
+        expected._img.convert("RGB").tobytes()
+    )
+
+
+def test_failed_refresh_does_not_record_frame(tmp_path: Path) -> None:
+    """Test that a frame is only recorded as shown once the panel refreshed
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    store = FrameHashStore(tmp_path.joinpath("frame_hash.json"))
+    with patch.object(DesktopDisplayDriver, "show", side_effect=OSError("SPI")):
+        with pytest.raises(OSError):
+            with InkyDraw(
+                DesktopDisplayDriver(), None, RefreshPolicy.SKIP_UNCHANGED, store
+            ) as display:
+                display.draw_date()
+    assert store.load() is None
+    assert _render_frames(RefreshPolicy.SKIP_UNCHANGED, store, ["10:00"]) == 1
+
+
+def test_frame_begins_the_layout_once_and_renders() -> None:
+    """Test that a frame of a layout is begun once, with its option, and rendered"""
+    display = TerminalDraw()
+    with (
+        patch.object(display, "begin_frame") as begin_mock,
+        patch.object(display, "render_text") as render_mock,
+    ):
+        with display.frame(DisplayOption.NIGHT) as frame:
+            assert frame is display
+    begin_mock.assert_called_once_with(DisplayOption.NIGHT)
+    render_mock.assert_called_once()
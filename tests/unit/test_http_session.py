@@ -0,0 +1,75 @@
+"""Tests for shared HTTP session module"""
+
+from unittest.mock import Mock, patch
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from inky_pi.http_session import (
+    HTTP_RETRIES,
+    HTTP_TIMEOUT,
+    TimeoutSession,
+    configure_http,
+    create_http_session,
+    get_http_session,
+)
+
+
+def _retry(session: requests.Session, url: str = "https://") -> Retry:
+    adapter = session.get_adapter(url)
+    assert isinstance(adapter, HTTPAdapter)
+    return adapter.max_retries
+
+
+def test_shared_http_session_is_reused() -> None:
+    """Test that the process-wide session is created once"""
+    assert get_http_session() is get_http_session()
+
+
+def test_http_session_mounts_retrying_adapters() -> None:
+    """Test that both schemes get bounded retries with backoff"""
+    session = create_http_session(retries=5, backoff_factor=0.1)
+    for scheme in ("http://", "https://"):
+        retry = _retry(session, f"{scheme}example.com")
+        assert retry.total == 5
+        assert retry.backoff_factor == 0.1
+    assert _retry(create_http_session()).total == HTTP_RETRIES
+
+
+@patch("inky_pi.http_session.requests.Session.request")
+def test_http_session_applies_default_timeout(request_mock: Mock) -> None:
+    """Test that requests without a timeout use the session timeout
+
+    Args:
+        request_mock (Mock): Mock for requests.Session.request
+    """
+    session = TimeoutSession()
+    session.get("https://example.com")
+    assert request_mock.call_args.kwargs["timeout"] == HTTP_TIMEOUT
+
+
+@patch("inky_pi.http_session.requests.Session.request")
+def test_http_session_keeps_explicit_timeout(request_mock: Mock) -> None:
+    """Test that an explicit timeout overrides the session timeout
+
+    Args:
+        request_mock (Mock): Mock for requests.Session.request
+    """
+    session = TimeoutSession()
+    session.get("https://example.com", timeout=1)
+    assert request_mock.call_args.kwargs["timeout"] == 1
+
+
+def test_configured_timeout_and_retries_apply_to_shared_session() -> None:
+    """Test that configure_http replaces the shared session with the new settings"""
+    try:
+        configure_http((1.0, 2.0), 0)
+        session = get_http_session()
+        assert session.timeout == (1.0, 2.0)
+        assert _retry(session).total == 0
+        configure_http((1.0, 2.0), 0)
+        assert get_http_session() is session
+    finally:
+        configure_http(HTTP_TIMEOUT, HTTP_RETRIES)
+    assert get_http_session().timeout == HTTP_TIMEOUT
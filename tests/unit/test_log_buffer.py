@@ -0,0 +1,157 @@
+"""Tests for the buffered log file sink"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Iterator, List
+from unittest.mock import Mock, patch
+
+import pytest
+from loguru import logger
+
+from inky_pi.log_buffer import BufferedFileSink
+from inky_pi.util import LOG_BUFFER_ENV_VAR, LOG_FILE, configure_logging
+
+
+@pytest.fixture(name="log_file")
+def fixture_log_file(tmp_path: Path) -> Path:
+    """Log file in a temporary directory"""
+    return tmp_path.joinpath("inky.log")
+
+
+@pytest.fixture(name="add_sink")
+def fixture_add_sink() -> Iterator[List[int]]:
+    """Remove the sinks added by a test, which flushes them"""
+    handler_ids: List[int] = []
+    yield handler_ids
+    for handler_id in handler_ids:
+        logger.remove(handler_id)
+
+
+def _lines(path: Path) -> List[str]:
+    if not path.exists():
+        return []
+    return [
+        json.loads(line)["record"]["message"] for line in path.read_text().splitlines()
+    ]
+
+
+def test_records_are_written_in_a_batch_when_removed(
+    log_file: Path, add_sink: List[int]
+) -> None:
+    """Test that records stay in memory until flushed, then keep their order"""
+    handler_id = logger.add(
+        BufferedFileSink(log_file, 10**6, flush_interval=60), serialize=True
+    )
+    logger.info("first")
+    logger.debug("second")
+
+    assert not log_file.exists()
+    logger.remove(handler_id)
+    assert _lines(log_file) == ["first", "second"]
+
+
+def test_error_records_are_flushed_without_waiting(
+    log_file: Path, add_sink: List[int]
+) -> None:
+    """Test that a record at the flush level wakes the flush thread"""
+    add_sink.append(
+        logger.add(BufferedFileSink(log_file, 10**6, flush_interval=60), serialize=True)
+    )
+    logger.info("context")
+    logger.error("failure")
+
+    deadline = time.monotonic() + 5
+    while not log_file.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _lines(log_file) == ["context", "failure"]
+
+
+def test_ring_buffer_drops_oldest_records_when_full(
+    log_file: Path, add_sink: List[int]
+) -> None:
+    """Test that a log storm cannot grow the buffer past its capacity"""
+    sink = BufferedFileSink(log_file, 10**6, capacity=3, flush_interval=60)
+    handler_id = logger.add(sink, serialize=True)
+    for index in range(10):
+        logger.info("storm {index}", index=index)
+
+    assert sink.dropped == 7
+    logger.remove(handler_id)
+    assert _lines(log_file) == [
+        "Log buffer full: dropped 7 records",
+        "storm 7",
+        "storm 8",
+        "storm 9",
+    ]
+    notice = json.loads(log_file.read_text().splitlines()[0])
+    assert notice["record"]["level"]["name"] == "WARNING"
+    assert notice["record"]["extra"] == {"dropped": 7}
+
+
+def test_dropped_records_warning_is_not_logged_through_loguru(
+    log_file: Path, add_sink: List[int]
+) -> None:
+    """Test that the flush thread never calls back into loguru"""
+    sink = BufferedFileSink(log_file, 10**6, capacity=1, flush_interval=60)
+    add_sink.append(logger.add(sink, serialize=True))
+    logger.info("first")
+    logger.info("second")
+    with patch("inky_pi.log_buffer.logger") as logger_mock:
+        sink._flush()
+    logger_mock.warning.assert_not_called()
+    assert _lines(log_file) == ["Log buffer full: dropped 1 records", "second"]
+
+
+def test_failed_write_counts_records_as_dropped(tmp_path: Path) -> None:
+    """Test that an unwritable log file does not stop the flush thread"""
+    log_dir = tmp_path.joinpath("missing")
+    sink = BufferedFileSink(log_dir.joinpath("inky.log"), 10**6, flush_interval=60)
+    handler_id = logger.add(sink, serialize=True)
+    logger.info("lost")
+    logger.error("also lost")
+
+    deadline = time.monotonic() + 5
+    while sink.dropped < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sink.dropped == 2
+    assert sink._thread.is_alive()
+
+    log_dir.mkdir()
+    logger.info("written")
+    logger.remove(handler_id)
+    assert _lines(log_dir.joinpath("inky.log")) == [
+        "Log buffer full: dropped 2 records",
+        "written",
+    ]
+
+
+def test_log_file_is_rotated_by_size(log_file: Path, add_sink: List[int]) -> None:
+    """Test that a batch that would grow the file past the limit starts a new file"""
+    log_file.write_text("x" * 100)
+    handler_id = logger.add(
+        BufferedFileSink(log_file, 150, flush_interval=60), serialize=True
+    )
+    logger.info("rotated")
+    logger.remove(handler_id)
+
+    rotated = [path for path in log_file.parent.iterdir() if path != log_file]
+    assert len(rotated) == 1
+    assert rotated[0].name.startswith("inky.") and rotated[0].suffix == ".log"
+    assert _lines(log_file) == ["rotated"]
+
+
+@patch("inky_pi.util.logger.add")
+def test_buffered_logging_is_enabled_by_environment(
+    logger_add_mock: Mock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that INKY_PI_LOG_BUFFER=1 adds the buffered sink"""
+    monkeypatch.setenv(LOG_BUFFER_ENV_VAR, "1")
+    configure_logging()
+
+    sink = logger_add_mock.call_args.args[0]
+    assert isinstance(sink, BufferedFileSink)
+    assert sink.path == LOG_FILE
+    sink.stop()
@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
-from unittest.mock import Mock, patch
+import threading
+from typing import Any
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
-from inky_pi.__main__ import _parse_args, main
+from inky_pi.__main__ import (
+    _parse_args,
+    display_data,
+    get_runtime_context,
+    main,
+)
+from inky_pi.display.display_base import DisplayModel, DisplayOption
 
 
 def test_can_successfully_parse_args() -> None:
@@ -22,6 +30,8 @@ def test_running_main_with_invalid_args_raises_error() -> None:
     args.option = "invalid"
     args.output = "invalid"
     args.dry_run = False
+    args.timings = False
+    args.metrics_file = None
     with patch("inky_pi.__main__._parse_args", return_value=args):
         with pytest.raises(KeyError):
             main()
@@ -33,9 +43,81 @@ def test_running_main_with_display_data_exception_raises_exception() -> None:
     args.option = "train"
     args.output = "inky"
     args.dry_run = False
+    args.timings = False
+    args.metrics_file = None
     with (
         patch("inky_pi.__main__._parse_args", return_value=args),
         patch("inky_pi.__main__.display_data", side_effect=ValueError),
     ):
         with pytest.raises(ValueError):
             main()
+
+
+def test_dry_run_does_not_build_runtime_context() -> None:
+    """Test that a dry run skips settings validation"""
+    args = Mock()
+    args.option = "train"
+    args.output = "terminal"
+    args.dry_run = True
+    args.timings = False
+    args.metrics_file = None
+    get_runtime_context.cache_clear()
+    with (
+        patch("inky_pi.__main__._parse_args", return_value=args),
+        patch("inky_pi.configs.Settings") as settings_mock,
+    ):
+        main()
+    settings_mock.assert_not_called()
+    assert get_runtime_context.cache_info().currsize == 0
+
+
+def test_runtime_context_is_built_once_and_memoized() -> None:
+    """Test that the runtime context is created on first use and then reused"""
+    get_runtime_context.cache_clear()
+    context = get_runtime_context()
+    assert get_runtime_context() is context
+    assert set(context.output_dispatch_table) == {m.name for m in DisplayModel}
+    assert context.train_object.number == context.config.TRAIN_NUMBER
+
+
+def _barrier_factory(barrier: threading.Barrier) -> Mock:
+    def fetch(*_: Any) -> Mock:
+        barrier.wait()
+        return MagicMock()
+
+    return Mock(side_effect=fetch)
+
+
+def test_display_data_fetches_train_and_weather_concurrently() -> None:
+    """Test that the train and weather fetches are in flight at the same time"""
+    # Each fetch only returns once the other has started; run one after the
+    # other, the first fetch times out and breaks the barrier instead
+    barrier = threading.Barrier(2, timeout=5)
+    output = get_runtime_context().output_dispatch_table["TERMINAL"]
+    with (
+        patch("inky_pi.__main__.weather_model_factory", _barrier_factory(barrier)),
+        patch(
+            "inky_pi.__main__.train_model_factory", _barrier_factory(barrier)
+        ) as train,
+        patch("inky_pi.__main__.import_display") as import_display_mock,
+    ):
+        display_data(DisplayOption.TRAIN, output)
+
+    train.assert_called_once()
+    import_display_mock.return_value.draw_train_times.assert_called_once()
+    assert not barrier.broken
+
+
+def test_display_data_does_not_draw_when_fetch_fails() -> None:
+    """Test that a failed fetch exits before anything is drawn or rendered"""
+    output = get_runtime_context().output_dispatch_table["TERMINAL"]
+    with (
+        patch("inky_pi.__main__.weather_model_factory", side_effect=SystemExit(1)),
+        patch("inky_pi.__main__.train_model_factory") as train,
+        patch("inky_pi.__main__.import_display") as import_display_mock,
+    ):
+        with pytest.raises(SystemExit):
+            display_data(DisplayOption.WEATHER, output)
+
+    train.assert_not_called()
+    import_display_mock.return_value.frame.assert_not_called()
@@ -0,0 +1,139 @@
+"""Tests for the Prometheus metrics module"""
+
+from __future__ import annotations
+
+import urllib.request
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from inky_pi.cache import MemoryCache
+from inky_pi.display.inky_draw import InkyDraw
+from inky_pi.display.util.desktop_driver import DesktopDisplayDriver
+from inky_pi.metrics import (
+    Histogram,
+    Metric,
+    MetricsRegistry,
+    configure_metrics,
+    get_metrics,
+    start_http_server,
+    write_textfile,
+)
+from inky_pi.train.train_base import TrainModel, TrainObject
+from inky_pi.util import train_model_factory
+
+
+@pytest.fixture(name="registry")
+def fixture_registry() -> Iterator[MetricsRegistry]:
+    """Enable metrics with a fresh registry"""
+    configure_metrics(False)
+    registry = configure_metrics(True)
+    assert registry is not None
+    yield registry
+    configure_metrics(False)
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    """Test the text exposition format of a labelled histogram"""
+    histogram = Histogram("latency_seconds", "Latency.", (0.5, 1.0), ("provider",))
+    for value in (0.2, 0.7, 3.0):
+        histogram.observe("Huxley2", value=value)
+
+    assert histogram.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{provider="Huxley2",le="0.5"} 1',
+        'latency_seconds_bucket{provider="Huxley2",le="1"} 2',
+        'latency_seconds_bucket{provider="Huxley2",le="+Inf"} 3',
+        'latency_seconds_sum{provider="Huxley2"} 3.9',
+        'latency_seconds_count{provider="Huxley2"} 3',
+    ]
+
+
+def test_metric_base_class_is_abstract() -> None:
+    """Test that a metric must define its samples"""
+    with pytest.raises(TypeError):
+        Metric("latency_seconds", "Latency.")  # type: ignore[abstract]
+
+
+def test_fetches_are_recorded_per_provider(registry: MetricsRegistry) -> None:
+    """Test fetch latency, errors, last success time and response cache hits"""
+    train_object = TrainObject(TrainModel.HUXLEY2, "MZH", "LBG", 3)
+    cache = MemoryCache()
+    with patch("inky_pi.train.huxley2.instantiate_huxley2"):
+        train_model_factory(train_object, cache)
+        train_model_factory(train_object, cache)
+    with patch(
+        "inky_pi.train.huxley2.instantiate_huxley2", side_effect=ConnectionError
+    ):
+        with pytest.raises(ConnectionError):
+            train_model_factory(train_object)
+
+    # Only the fetch that missed the cache reaches the provider
+    assert registry.fetch_seconds.count("Huxley2") == 1
+    assert registry.errors.value("ConnectionError") == 1
+    assert registry.last_success.value("Huxley2") > 0
+    text = registry.render()
+    assert 'inky_pi_cache_hits_total{cache="response"} 1' in text
+    assert 'inky_pi_cache_hit_ratio{cache="response"} 0.5' in text
+
+
+def test_render_and_panel_refresh_are_recorded(registry: MetricsRegistry) -> None:
+    """Test that frame render and panel refresh durations are observed"""
+    with patch.object(DesktopDisplayDriver, "show"):
+        with InkyDraw(DesktopDisplayDriver()) as display:
+            display.draw_date()
+
+    assert registry.render_seconds.count() == 1
+    assert registry.panel_seconds.count() == 1
+    assert registry.last_success.value("display") > 0
+
+
+def test_textfile_keeps_last_success_of_sources_not_updated(
+    registry: MetricsRegistry, tmp_path: Path
+) -> None:
+    """Test that a cron run without a weather fetch keeps its last success time"""
+    path = tmp_path.joinpath("inky_pi.prom")
+    registry.last_success.set("OpenWeatherMap", value=100)
+    registry.last_success.set("display", value=100)
+    write_textfile(path)
+
+    configure_metrics(False)
+    registry = configure_metrics(True)  # type: ignore[assignment]
+    registry.last_success.set("display", value=200)
+    write_textfile(path)
+
+    text = path.read_text(encoding="utf-8")
+    assert 'inky_pi_last_success_timestamp_seconds{source="OpenWeatherMap"} 100' in text
+    assert 'inky_pi_last_success_timestamp_seconds{source="display"} 200' in text
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_http_endpoint_serves_metrics(registry: MetricsRegistry) -> None:
+    """Test that the daemon endpoint serves the text exposition format"""
+    registry.errors.inc("ValueError")
+    server = start_http_server(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:  # nosec B310
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert 'inky_pi_errors_total{type="ValueError"} 1' in body
+
+
+def test_nothing_is_recorded_when_disabled(tmp_path: Path) -> None:
+    """Test that metrics are off by default and no textfile is written"""
+    configure_metrics(False)
+    with patch("inky_pi.train.huxley2.instantiate_huxley2"):
+        train_model_factory(TrainObject(TrainModel.HUXLEY2, "MZH", "LBG", 3))
+    write_textfile(tmp_path.joinpath("inky_pi.prom"))
+
+    assert get_metrics() is None
+    assert not list(tmp_path.iterdir())
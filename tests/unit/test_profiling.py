@@ -0,0 +1,93 @@
+"""Tests for refresh profiling"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import subprocess  # nosec B404
+from pathlib import Path
+from typing import Any, List
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from inky_pi.cli import cli
+from inky_pi.profiling import ProfileResult, parse_importtime, profile_refresh
+
+IMPORTTIME_OUTPUT = [
+    "import time: self [us] | cumulative | imported package",
+    "import time:       100 |        100 |     inky_pi.timing",
+    "import time:       300 |        300 |     PIL.Image",
+    "import time:       200 |        500 |   inky_pi.display.display_base",
+    "import time:        50 |        750 | inky_pi.util",
+    "2024-01-01 | DEBUG | not an import line",
+    "import time:        20 |         20 | inky_pi.profiling",
+]
+
+
+def test_importtime_output_is_parsed_to_a_tree() -> None:
+    """Test that nested imports are attached to the module importing them"""
+    imports = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [record.name for record in imports] == ["inky_pi.util", "inky_pi.profiling"]
+    util = imports[0]
+    assert util.cumulative_us == 750
+    assert [child.name for child in util.children] == ["inky_pi.display.display_base"]
+    assert [record.name for record in util.children[0].children] == [
+        "inky_pi.timing",
+        "PIL.Image",
+    ]
+
+
+def test_profile_refresh_writes_report_pstats_and_speedscope(tmp_path: Path) -> None:
+    """Test that a profiled refresh writes all three files"""
+
+    def run(command: List[str], **_: Any) -> subprocess.CompletedProcess[str]:
+        cProfile.run("sorted(range(100))", command[-1])
+        return subprocess.CompletedProcess(
+            command, 0, stderr="\n".join(IMPORTTIME_OUTPUT)
+        )
+
+    with patch("inky_pi.profiling.subprocess.run", side_effect=run) as run_mock:
+        result = profile_refresh("weather", "buffer", tmp_path, "profile")
+
+    assert run_mock.call_args.args[0][1:5] == [
+        "-X",
+        "importtime",
+        "-m",
+        "inky_pi.profiling",
+    ]
+    assert result.returncode == 0
+    report = result.report_file.read_text(encoding="utf-8")
+    assert "Functions by cumulative time" in report
+    assert "Imports: 5 modules, 0.8 ms total" in report
+    assert report.index("inky_pi.util") < report.index("PIL.Image")
+    assert result.pstats_file.exists()
+    speedscope = json.loads(result.speedscope_file.read_text(encoding="utf-8"))
+    events = speedscope["profiles"][0]["events"]
+    assert speedscope["profiles"][0]["endValue"] == 770
+    assert [event["type"] for event in events].count("O") == 5
+    assert events[-1] == {"type": "C", "frame": 4, "at": 770}
+
+
+def test_profile_command_reports_files(tmp_path: Path) -> None:
+    """Test that the profile command validates options and fails on a failed refresh"""
+    result = ProfileResult(
+        tmp_path.joinpath("p.txt"),
+        tmp_path.joinpath("p.pstats"),
+        tmp_path.joinpath("p.speedscope.json"),
+        1,
+    )
+    runner = CliRunner()
+    with patch(
+        "inky_pi.profiling.profile_refresh", return_value=result
+    ) as profile_mock:
+        output = runner.invoke(
+            cli,
+            ["profile", "-o", "Night", "-m", "BUFFER", "--directory", str(tmp_path)],
+        )
+
+    profile_mock.assert_called_once_with("night", "buffer", tmp_path, None)
+    assert output.exit_code == 1
+    assert str(result.report_file) in output.output
+    assert "profile is partial" in output.output
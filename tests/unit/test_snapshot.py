@@ -0,0 +1,215 @@
+"""Tests for offline-first rendering from the last-known-good snapshot"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, TypeVar
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from inky_pi.__main__ import RuntimeContext, display_data, get_runtime_context
+from inky_pi.daemon import RefreshScheduler, parse_schedule
+from inky_pi.display.display_base import DisplayOption
+from inky_pi.snapshot import load_snapshot, save_snapshot
+from inky_pi.train.huxley2 import Huxley2
+from inky_pi.train.train_base import TrainBase
+from inky_pi.weather.open_weather_map import OpenWeatherMap
+from inky_pi.weather.weather_base import ScaleType, WeatherBase
+from tests.unit.resources.fakes import FakeRequests
+
+RESOURCES_DIR = Path(__file__).parent.joinpath("resources")
+FETCHED = datetime(2024, 1, 6, 7, 30).timestamp()
+
+P = TypeVar("P", WeatherBase, TrainBase)
+
+
+def _retrieve(provider: P, resource: str, request_object: Any) -> P:
+    requests = FakeRequests()
+    with open(RESOURCES_DIR.joinpath(resource), "r", encoding="utf-8") as file:
+        requests.add_response(json.load(file), 200)
+    provider.retrieve_data(requests, request_object)
+    provider.fetched = FETCHED
+    return provider
+
+
+@pytest.fixture(name="context")
+def fixture_context(tmp_path: Path) -> Iterator[RuntimeContext]:
+    """Runtime context with the snapshot in a temporary directory"""
+    context = replace(
+        get_runtime_context(),
+        cache=None,
+        snapshot_file=tmp_path.joinpath("snapshot.pickle"),
+    )
+    with patch("inky_pi.__main__.get_runtime_context", return_value=context):
+        yield context
+
+
+@pytest.fixture(name="weather")
+def fixture_weather(context: RuntimeContext) -> WeatherBase:
+    """OpenWeatherMap data from the recorded response"""
+    return _retrieve(OpenWeatherMap(), "weather_data.json", context.weather_object)
+
+
+@pytest.fixture(name="train")
+def fixture_train(context: RuntimeContext) -> TrainBase:
+    """Huxley2 departures from the recorded response"""
+    return _retrieve(Huxley2(), "train_data.json", context.train_object)
+
+
+def test_snapshot_round_trip_matches_the_providers(
+    context: RuntimeContext, weather: WeatherBase, train: TrainBase
+) -> None:
+    """Test that a restored snapshot draws exactly what the providers would"""
+    assert context.snapshot_file is not None
+    save_snapshot(
+        context.weather_object,
+        weather,
+        context.train_object,
+        train,
+        context.snapshot_file,
+    )
+    snapshot = load_snapshot(
+        context.weather_object, context.train_object, context.snapshot_file
+    )
+
+    assert snapshot.weather is not None and snapshot.train is not None
+    assert snapshot.fetched(needs_train=True) == datetime.fromtimestamp(FETCHED)
+    for scale in ScaleType:
+        assert snapshot.weather.get_current_weather(scale) == (
+            weather.get_current_weather(scale)
+        )
+        for day in range(8):
+            assert snapshot.weather.get_icon(day) == weather.get_icon(day)
+            assert snapshot.weather.get_temp_range(day, scale) == (
+                weather.get_temp_range(day, scale)
+            )
+            assert snapshot.weather.get_future_weather(day, scale) == (
+                weather.get_future_weather(day, scale)
+            )
+    number = context.config.TRAIN_NUMBER
+    assert snapshot.train.fetch_trains(number) == train.fetch_trains(number)
+
+    snapshot.train.retrieve_data(None, context.train_object)
+    assert snapshot.train.fetch_trains(number) == train.fetch_trains(number)
+
+
+def test_snapshot_keeps_parts_not_refetched_and_ignores_other_requests(
+    context: RuntimeContext, weather: WeatherBase, train: TrainBase
+) -> None:
+    """Test that a weather-only save keeps the departures of the previous one"""
+    path = context.snapshot_file
+    assert path is not None
+    save_snapshot(context.weather_object, weather, context.train_object, train, path)
+    save_snapshot(context.weather_object, weather, path=path)
+
+    assert load_snapshot(context.weather_object, context.train_object, path).covers(
+        needs_train=True
+    )
+    other_station = replace(context.train_object, station_to="BHM")
+    assert load_snapshot(context.weather_object, other_station, path).train is None
+    path.write_bytes(b"not a snapshot")
+    assert (
+        load_snapshot(context.weather_object, context.train_object, path).weather
+        is None
+    )
+
+
+def test_unwritable_snapshot_directory_is_logged_not_raised(
+    tmp_path: Path, context: RuntimeContext, weather: WeatherBase
+) -> None:
+    """Test that a failed snapshot save does not block drawing the fresh frame"""
+    not_a_dir = tmp_path.joinpath("file")
+    not_a_dir.write_text("")
+    path = not_a_dir.joinpath("cache", "snapshot.pickle")
+    save_snapshot(context.weather_object, weather, path=path)
+    assert load_snapshot(context.weather_object, path=path).weather is None
+
+
+def test_failed_fetch_draws_the_snapshot_marked_stale(
+    context: RuntimeContext, weather: WeatherBase
+) -> None:
+    """Test that the screen shows the last known data instead of nothing"""
+    assert context.snapshot_file is not None
+    save_snapshot(context.weather_object, weather, path=context.snapshot_file)
+    output = context.output_dispatch_table["TERMINAL"]
+    with (
+        patch("inky_pi.__main__.weather_model_factory", side_effect=SystemExit(1)),
+        patch("inky_pi.__main__.import_display") as import_display_mock,
+    ):
+        with pytest.raises(SystemExit):
+            display_data(DisplayOption.WEATHER, output)
+
+    display = import_display_mock.return_value
+    display.draw_stale_time.assert_called_once_with(datetime.fromtimestamp(FETCHED))
+    display.draw_time.assert_not_called()
+    display.draw_forecast_icons.assert_called_once()
+
+
+def test_slow_fetch_draws_the_snapshot_then_fresh_data(
+    context: RuntimeContext, weather: WeatherBase
+) -> None:
+    """Test that the snapshot is replaced, and updated, once fresh data arrives"""
+    assert context.snapshot_file is not None
+    save_snapshot(context.weather_object, weather, path=context.snapshot_file)
+    context = replace(
+        context, config=context.config.model_copy(update={"OFFLINE_SNAPSHOT_WAIT": 0})
+    )
+    output = context.output_dispatch_table["TERMINAL"]
+
+    def slow_fetch(*_: Any) -> WeatherBase:
+        time.sleep(0.2)
+        weather.fetched = time.time()
+        return weather
+
+    with (
+        patch("inky_pi.__main__.get_runtime_context", return_value=context),
+        patch("inky_pi.__main__.weather_model_factory", side_effect=slow_fetch),
+        patch("inky_pi.__main__.import_display") as import_display_mock,
+    ):
+        display_data(DisplayOption.WEATHER, output)
+
+    display = import_display_mock.return_value
+    assert display.frame.call_count == 2
+    display.draw_stale_time.assert_called_once()
+    display.draw_time.assert_called_once()
+    assert context.snapshot_file is not None
+    snapshot = load_snapshot(context.weather_object, path=context.snapshot_file)
+    assert snapshot.weather is not None and snapshot.weather.fetched > FETCHED
+
+
+def test_serve_draws_the_snapshot_before_the_first_fetch(
+    context: RuntimeContext, weather: WeatherBase
+) -> None:
+    """Test that serve mode shows the snapshot until the first fetch succeeds"""
+    assert context.snapshot_file is not None
+    save_snapshot(context.weather_object, weather, path=context.snapshot_file)
+    scheduler = RefreshScheduler(
+        context,
+        context.output_dispatch_table["TERMINAL"],
+        parse_schedule(""),
+        train_interval=45,
+        weather_interval=600,
+    )
+    noon = datetime(2024, 1, 6, 12, 0).timestamp()
+
+    def fetch(*_: Any) -> WeatherBase:
+        weather.fetched = noon
+        return weather
+
+    with (
+        patch("inky_pi.daemon.draw_data") as draw_mock,
+        patch("inky_pi.daemon.import_display", return_value=MagicMock()),
+        patch("inky_pi.daemon.weather_model_factory", side_effect=fetch),
+    ):
+        scheduler.restore_snapshot(noon)
+        scheduler.tick(noon)
+
+    stale_since = [call.args[5] for call in draw_mock.call_args_list]
+    assert stale_since == [datetime.fromtimestamp(FETCHED), None]
+    snapshot = load_snapshot(context.weather_object, path=context.snapshot_file)
+    assert snapshot.weather is not None and snapshot.weather.fetched == noon
@@ -0,0 +1,109 @@
+"""Tests for the weather icon sprite cache"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Tuple
+from unittest.mock import patch
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+from inky_pi.display.inky_draw import InkyDraw
+from inky_pi.display.util.desktop_driver import DesktopDisplayDriver
+from inky_pi.display.util.sprites import (
+    ICON_DRAWERS,
+    SPRITE_CANVAS,
+    SpriteCache,
+    rasterise_icon,
+)
+from inky_pi.weather.weather_base import IconType
+from tests.unit.resources.generate_test_shapes import BLACK, WHITE
+
+WIDTH, HEIGHT = DesktopDisplayDriver.WIDTH, DesktopDisplayDriver.HEIGHT
+
+GREY = 128
+
+
+def _background() -> Image.Image:
+    """Non-uniform background, so untouched and negative space pixels differ"""
+    image = Image.new("P", (WIDTH, HEIGHT), color="white")
+    ImageDraw.Draw(image).rectangle((0, 0, WIDTH // 2, HEIGHT), (GREY, GREY, GREY))
+    return image
+
+
+@pytest.mark.parametrize("icon", list(IconType))
+@pytest.mark.parametrize(
+    "x_y, colors",
+    [
+        ((0, 0), (BLACK, WHITE)),
+        ((30, 90), (BLACK, WHITE)),
+        ((-20, HEIGHT - 40), (BLACK, WHITE)),
+        ((WIDTH - 30, -10), (BLACK, WHITE)),
+        ((17, 33), (DesktopDisplayDriver.YELLOW, BLACK)),
+    ],
+)
+def test_sprite_matches_vector_drawing(
+    icon: IconType, x_y: Tuple[int, int], colors: Tuple[Any, Any]
+) -> None:
+    """Test that blitting a cached sprite is pixel-identical to vector drawing
+
+    Args:
+        icon (IconType): Weather icon
+        x_y: (x, y) coordinates, including positions clipped by the image edge
+        colors: Outline and negative space colors
+    """
+    expected = _background()
+    ICON_DRAWERS[icon](ImageDraw.Draw(expected), *colors, x_y)
+    generated = _background()
+    SpriteCache().draw(ImageDraw.Draw(generated), icon, *colors, x_y)
+
+    assert not ImageChops.difference(
+        generated.convert("RGB"), expected.convert("RGB")
+    ).getbbox()
+
+
+@pytest.mark.parametrize("icon", list(IconType))
+def test_icon_fits_within_sprite_canvas(icon: IconType) -> None:
+    """Test that no icon is clipped by the rasterisation canvas
+
+    Args:
+        icon (IconType): Weather icon
+    """
+    bbox = rasterise_icon(icon).getbbox()
+    assert bbox is not None
+    assert bbox[0] > 0 and bbox[1] > 0
+    assert bbox[2] < SPRITE_CANVAS[0] and bbox[3] < SPRITE_CANVAS[1]
+
+
+def test_sprites_are_rasterised_once(tmp_path: Path) -> None:
+    """Test in-memory reuse and the on-disk warm store
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    cache = SpriteCache(tmp_path)
+    assert cache.get(IconType.SNOW) is cache.get(IconType.SNOW)
+    assert len(list(tmp_path.glob("snow-*.png"))) == 1
+
+    with patch(
+        "inky_pi.display.util.sprites.rasterise_icon", side_effect=AssertionError
+    ):
+        warm = SpriteCache(tmp_path).get(IconType.SNOW)
+    assert warm.offset == cache.get(IconType.SNOW).offset
+    cold = cache.get(IconType.SNOW)
+    assert len(warm.layers) == len(cold.layers)
+    for index, (value, mask) in enumerate(warm.layers):
+        cold_value, cold_mask = cold.layers[index]
+        assert value == cold_value
+        assert not ImageChops.difference(mask, cold_mask).getbbox()
+
+
+def test_inky_draw_uses_sprite_cache() -> None:
+    """Test that InkyDraw draws weather icons from its sprite cache"""
+    sprites = SpriteCache()
+    inky_draw = InkyDraw(DesktopDisplayDriver(), sprites)
+    with patch.object(sprites, "draw", wraps=sprites.draw) as draw_mock:
+        inky_draw.draw_weather_icon(IconType.RAIN, (30, 90))
+    draw_mock.assert_called_once()
+    assert draw_mock.call_args.args[1] == IconType.RAIN
@@ -0,0 +1,134 @@
+"""Tests for station index module"""
+
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from pydantic import ValidationError
+
+from inky_pi.configs import Settings
+from inky_pi.stations import (
+    CRS_CODES_FILE,
+    StationIndex,
+    build_station_index,
+    compile_station_index,
+    get_station_index,
+)
+from inky_pi.util import load_json
+
+
+@pytest.fixture(name="station_index")
+def _station_index() -> StationIndex:
+    return StationIndex(compile_station_index(CRS_CODES_FILE.read_bytes()))
+
+
+def test_station_index_contains_all_crs_data(station_index: StationIndex) -> None:
+    """Test that the index matches every station in the CRS data file
+
+    Args:
+        station_index (StationIndex): Station index compiled from the json file
+    """
+    station_crs_data = load_json(CRS_CODES_FILE)
+    assert len(station_index) == len(station_crs_data)
+    assert list(station_index.choices) == [
+        (station["crsCode"], station["stationName"]) for station in station_crs_data
+    ]
+    assert list(station_index) == sorted(s["crsCode"] for s in station_crs_data)
+    for station in station_crs_data:
+        assert station_index.get_name(station["crsCode"]) == station["stationName"]
+        assert station_index.get_code(station["stationName"]) == station["crsCode"]
+
+
+@pytest.mark.parametrize(
+    "code, expected", [("BHO", True), ("ZZZ", False), ("BH", False), ("BHOX", False)]
+)
+def test_station_index_validates_codes(
+    code: str, expected: bool, station_index: StationIndex
+) -> None:
+    """Test CRS code validation
+
+    Args:
+        code (str): CRS code
+        expected (bool): Expected validity
+        station_index (StationIndex): Station index compiled from the json file
+    """
+    assert station_index.is_valid_code(code) is expected
+
+
+def test_station_index_lookup_of_unknown_station_raises_error(
+    station_index: StationIndex,
+) -> None:
+    """Test that unknown codes and names raise KeyError
+
+    Args:
+        station_index (StationIndex): Station index compiled from the json file
+    """
+    with pytest.raises(KeyError):
+        station_index.get_name("ZZZ")
+    with pytest.raises(KeyError):
+        station_index.get_code("Nowhere Parkway")
+
+
+def test_invalid_index_content_raises_error() -> None:
+    """Test that a buffer without the index header is rejected"""
+    with pytest.raises(ValueError):
+        StationIndex(b"\0" * 64)
+
+
+def test_station_index_is_rebuilt_when_json_changes(tmp_path: Path) -> None:
+    """Test that a stale index is regenerated from the json source of truth
+
+    Args:
+        tmp_path (Path): Temporary directory
+    """
+    crs_file = tmp_path / "crs_codes.json"
+    index_file = tmp_path / "crs_codes.idx"
+    crs_file.write_text(json.dumps([{"stationName": "Aber", "crsCode": "ABE"}]))
+    build_station_index(crs_file, index_file)
+
+    crs_file.write_text(json.dumps([{"stationName": "Bath Spa", "crsCode": "BTH"}]))
+    station_index = get_station_index(crs_file, index_file)
+    assert "BTH" in station_index
+    assert "ABE" not in station_index
+    assert StationIndex(index_file.read_bytes()).digest == station_index.digest
+
+
+@patch("inky_pi.stations.build_station_index", side_effect=PermissionError)
+def test_station_index_falls_back_to_memory_when_unwritable(
+    build_mock: Mock, tmp_path: Path
+) -> None:
+    """Test that an unwritable index location still yields a working index
+
+    Args:
+        build_mock (Mock): Mock for build_station_index
+        tmp_path (Path): Temporary directory
+    """
+    crs_file = tmp_path / "crs_codes.json"
+    crs_file.write_text(json.dumps([{"stationName": "Aber", "crsCode": "ABE"}]))
+    station_index = get_station_index(crs_file, tmp_path / "crs_codes.idx")
+    build_mock.assert_called_once()
+    assert station_index.get_name("ABE") == "Aber"
+
+
+@patch("inky_pi.stations.compile_station_index", wraps=compile_station_index)
+def test_station_index_is_loaded_once_per_process(compile_mock: Mock) -> None:
+    """Test that validating several settings only opens the index once
+
+    Args:
+        compile_mock (Mock): Mock wrapping compile_station_index
+    """
+    get_station_index.cache_clear()
+    get_station_index()
+    compile_mock.reset_mock()
+    get_station_index.cache_clear()
+    Settings(STATION_FROM="BHO", STATION_TO="WMW")
+    Settings(STATION_FROM="LBG", STATION_TO="MZH")
+    compile_mock.assert_not_called()
+    assert get_station_index.cache_info().misses == 1
+
+
+def test_settings_with_invalid_station_code_raises_error() -> None:
+    """Test that an unknown CRS code fails settings validation"""
+    with pytest.raises(ValidationError):
+        Settings(STATION_FROM="ZZZ")
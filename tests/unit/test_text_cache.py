@@ -0,0 +1,67 @@
+"""Tests for the rendered text bitmap cache"""
+
+from __future__ import annotations
+
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+from inky_pi.display.inky_draw import (
+    FONT_GL,
+    FONT_M,
+    FONT_S,
+    FONT_XL,
+    FONT_XS,
+    InkyDraw,
+)
+from inky_pi.display.util.desktop_driver import DesktopDisplayDriver
+from inky_pi.display.util.text_cache import CacheInfo, TextCache
+
+
+@pytest.mark.parametrize("font", [FONT_XS, FONT_S, FONT_M, FONT_XL, FONT_GL])
+@pytest.mark.parametrize(
+    "text",
+    ["Sat 06 Jan 2024", "Updated 12:34", "tomorrow: light rain", "-3.5°C", "", "a\nb"],
+)
+@pytest.mark.parametrize("x_y", [(10, 5), (-4, 290), (395, 100)])
+def test_cached_text_matches_direct_drawing(
+    font: ImageFont.FreeTypeFont, text: str, x_y: tuple[int, int]
+) -> None:
+    """Test that cached text is pixel-identical to ImageDraw.text, including bboxes"""
+    expected = Image.new("P", (400, 300), color="white")
+    expected_draw = ImageDraw.Draw(expected)
+    expected_draw.text(x_y, text, 2, font)
+
+    actual = Image.new("P", (400, 300), color="white")
+    cache = TextCache()
+    for _ in range(2):
+        box = cache.draw(ImageDraw.Draw(actual), x_y, text, 2, font)
+
+    assert actual.tobytes() == expected.tobytes()
+    assert box == expected_draw.textbbox(x_y, text, font)
+
+
+def test_cache_counts_hits_and_evicts_least_recently_used() -> None:
+    """Test that the cache is bounded and exposes hit/miss counters"""
+    cache = TextCache(maxsize=2)
+    first = cache.get("a", FONT_S)
+    cache.get("b", FONT_S)
+    assert cache.get("a", FONT_S) is first
+    cache.get("a", FONT_M)
+    assert cache.cache_info() == CacheInfo(hits=1, misses=3, maxsize=2, currsize=2)
+
+    # "b" was least recently used, so it was evicted
+    cache.get("b", FONT_S)
+    assert cache.cache_info().misses == 4
+
+    cache.clear()
+    assert cache.cache_info() == CacheInfo(0, 0, 2, 0)
+
+
+def test_inky_draw_reuses_text_bitmaps_between_frames() -> None:
+    """Test that repeated strings are only rasterised for the first frame"""
+    cache = TextCache()
+    display = InkyDraw(DesktopDisplayDriver(), text_cache=cache)
+    for _ in range(3):
+        display.begin_frame()
+        display.draw_date()
+    assert cache.cache_info()[:2] == (2, 1)
@@ -0,0 +1,76 @@
+"""Tests for per-stage refresh timing"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
+
+import pytest
+from loguru import logger
+
+from inky_pi.display.inky_draw import InkyDraw
+from inky_pi.display.util.desktop_driver import DesktopDisplayDriver
+from inky_pi.timing import configure_timing, refresh_timer, stage, timed
+from inky_pi.util import load_backend
+
+
+@pytest.fixture(name="records")
+def fixture_records() -> Iterator[List[Dict[str, Any]]]:
+    """Capture the extra fields of logged timing records, with timing enabled"""
+    records: List[Dict[str, Any]] = []
+    handler_id = logger.add(
+        lambda message: records.append(message.record["extra"]),
+        filter=lambda record: "stages" in record["extra"],
+    )
+    configure_timing(True)
+    yield records
+    configure_timing(False)
+    logger.remove(handler_id)
+
+
+def test_refresh_emits_one_record_with_stage_durations(
+    records: List[Dict[str, Any]],
+) -> None:
+    """Test that draw calls, render and panel show are timed in one record"""
+    with patch.object(DesktopDisplayDriver, "show"):
+        with refresh_timer("display_data"):
+            # Nested refreshes are folded into the outer one
+            with refresh_timer("nested"):
+                with stage("settings"):
+                    load_backend("inky_pi.display.terminal_draw:TerminalDraw")
+            with InkyDraw(DesktopDisplayDriver()) as display:
+                display.draw_date()
+                display.draw_date()
+
+    assert len(records) == 1
+    assert records[0]["refresh"] == "display_data"
+    stages = records[0]["stages"]
+    assert set(stages) == {
+        "settings",
+        "import:inky_pi.display.terminal_draw",
+        "draw_date",
+        "render_screen",
+        "panel_show",
+    }
+    assert stages["draw_date"]["calls"] == 2
+    assert all(timing["ms"] >= 0 for timing in stages.values())
+
+
+def test_timed_calls_pass_through_when_disabled() -> None:
+    """Test that nothing is recorded or logged while timing is disabled"""
+    calls: List[int] = []
+
+    @timed("stage")
+    def func(value: int) -> int:
+        calls.append(value)
+        return value * 2
+
+    with patch("inky_pi.timing.logger") as logger_mock:
+        with refresh_timer("display_data") as report:
+            assert func(2) == 4
+            with stage("settings"):
+                pass
+
+    assert report is None
+    assert calls == [2]
+    logger_mock.bind.assert_not_called()
@@ -1,28 +1,68 @@
 """Tests for train module"""
 
+import asyncio
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Generator, Mapping
+from typing import Any, Dict, Generator, Mapping
 from unittest.mock import Mock, patch
 
 import pytest
+import zeep
+from requests.exceptions import JSONDecodeError
 
 from inky_pi.train.huxley2 import Huxley2
-from inky_pi.train.open_live import OpenLive
+from inky_pi.train.open_live import (
+    OpenLive,
+    clear_open_live_clients,
+    get_open_live_async_client,
+    get_open_live_client,
+)
 from inky_pi.train.train_base import (
+    Departure,
     TrainBase,
     TrainModel,
     TrainObject,
     abbreviate_stn_name,
 )
-from inky_pi.util import train_model_factory
-from tests.unit.resources.fakes import FakeRequests
+from inky_pi.util import atrain_model_factory, train_model_factory
+from tests.unit.resources.fakes import FakeAsyncRequests, FakeRequests
 
 TEST_DIR = Path(__file__).parent
 RESOURCES_DIR = TEST_DIR.joinpath("resources")
 HUXLEY2_TRAIN_DATA = RESOURCES_DIR.joinpath("train_data.json")
 OPEN_LIVE_TRAIN_DATA = RESOURCES_DIR.joinpath("train_data_zeep.pickle")
 INVALID_OPEN_LIVE_DATA = RESOURCES_DIR.joinpath("trains_unavailable_zeep.pickle")
+OPEN_LIVE_WSDL = RESOURCES_DIR.joinpath("openldbws.wsdl")
+OPEN_LIVE_SOAP_RESPONSE = """<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope">
+  <soap:Body>
+    <GetDepartureBoardResponse xmlns="http://thalesgroup.com/RTTI/2017-10-01/ldb/">
+      <GetStationBoardResult>
+        <locationName>Maze Hill</locationName>
+        <filterLocationName>London Bridge</filterLocationName>
+        <trainServices>
+          <service>
+            <std>18:11</std>
+            <etd>On time</etd>
+            <platform>2</platform>
+            <destination>
+              <location><locationName>Slade Green</locationName></location>
+            </destination>
+          </service>
+        </trainServices>
+      </GetStationBoardResult>
+    </GetDepartureBoardResponse>
+  </soap:Body>
+</soap:Envelope>"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_open_live_client_pool() -> Generator[None, None, None]:
+    clear_open_live_clients()
+    yield
+    clear_open_live_clients()
 
 
 # pylint: disable=possibly-unused-variable
@@ -141,6 +181,7 @@ def test_format_train_error_string(error_msg: str, num: int, expected: str) -> N
     assert TrainBase.format_error_msg(error_msg, num) == expected
 
 
+@patch("inky_pi.train.open_live.zeep.cache.SqliteCache")
 @patch("inky_pi.train.open_live.zeep.plugins.HistoryPlugin")
 @patch("inky_pi.train.open_live.zeep.xsd.Element")
 @patch("inky_pi.train.open_live.zeep.Client")
@@ -148,6 +189,7 @@ def test_can_successfully_instantiate_train_open_live(
     zeep_client_mock: Mock,
     zeep_xsd_mock: Mock,
     zeep_history_mock: Mock,
+    zeep_cache_mock: Mock,
     _setup_train_object_open_live: TrainObject,
 ) -> None:
     """Test for creating OpenLDBWS instanced object
@@ -156,27 +198,146 @@ def test_can_successfully_instantiate_train_open_live(
         zeep_client_mock (Mock): Mock for Client class
         zeep_xsd_mock (Mock): Mock for xsd.Element class
         zeep_history_mock (Mock): Mock for HistoryPlugin class
+        zeep_cache_mock (Mock): Mock for SqliteCache class
         _setup_train_object_open_live (TrainObject): Open Live TrainObject
     """
     ret: TrainBase = train_model_factory(_setup_train_object_open_live)
     zeep_history_mock.assert_called_once()
     zeep_client_mock.assert_called_once()
+    zeep_cache_mock.assert_called_once_with(
+        timeout=_setup_train_object_open_live.wsdl_cache_ttl
+    )
     assert zeep_xsd_mock.call_count == 2
     assert isinstance(ret, OpenLive)
 
 
-@patch("inky_pi.train.huxley2.requests.get")
+@patch("inky_pi.train.open_live.zeep.cache.SqliteCache")
+@patch("inky_pi.train.open_live.zeep.Transport")
+@patch("inky_pi.train.open_live.zeep.xsd.Element")
+@patch("inky_pi.train.open_live.zeep.Client")
+def test_open_live_transport_uses_configured_http_timeout(
+    _zeep_client_mock: Mock,
+    _zeep_xsd_mock: Mock,
+    zeep_transport_mock: Mock,
+    _zeep_cache_mock: Mock,
+    _setup_train_object_open_live: TrainObject,
+) -> None:
+    """Test that WSDL loads and SOAP calls get the configured HTTP timeout
+
+    Args:
+        _zeep_client_mock (Mock): Mock for Client class
+        _zeep_xsd_mock (Mock): Mock for xsd.Element class
+        zeep_transport_mock (Mock): Mock for Transport class
+        _zeep_cache_mock (Mock): Mock for SqliteCache class
+        _setup_train_object_open_live (TrainObject): Open Live TrainObject
+    """
+    with patch("inky_pi.train.open_live.get_http_timeout", return_value=(2.0, 5.0)):
+        get_open_live_client(zeep, _setup_train_object_open_live)
+    _, kwargs = zeep_transport_mock.call_args
+    assert kwargs["timeout"] == (2.0, 5.0)
+    assert kwargs["operation_timeout"] == (2.0, 5.0)
+
+
+@patch("inky_pi.train.open_live.zeep.cache.SqliteCache")
+@patch("inky_pi.train.open_live.zeep.xsd.Element")
+@patch("inky_pi.train.open_live.zeep.Client")
+def test_concurrent_refreshes_create_one_pooled_client(
+    zeep_client_mock: Mock,
+    _zeep_xsd_mock: Mock,
+    _zeep_cache_mock: Mock,
+    _setup_train_object_open_live: TrainObject,
+) -> None:
+    """Test that threads racing on a cold pool parse the WSDL only once
+
+    Args:
+        zeep_client_mock (Mock): Mock for Client class
+        _zeep_xsd_mock (Mock): Mock for xsd.Element class
+        _zeep_cache_mock (Mock): Mock for SqliteCache class
+        _setup_train_object_open_live (TrainObject): Open Live TrainObject
+    """
+
+    def slow_wsdl_parse(**_: Any) -> Mock:
+        time.sleep(0.05)
+        return Mock()
+
+    zeep_client_mock.side_effect = slow_wsdl_parse
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        clients = list(
+            executor.map(
+                lambda _: get_open_live_client(zeep, _setup_train_object_open_live),
+                range(4),
+            )
+        )
+    zeep_client_mock.assert_called_once()
+    assert all(client is clients[0] for client in clients)
+
+
+@patch("inky_pi.train.open_live.zeep.cache.SqliteCache")
+@patch("inky_pi.train.open_live.zeep.xsd.Element")
+@patch("inky_pi.train.open_live.zeep.Client")
+def test_open_live_refreshes_reuse_pooled_client_and_header(
+    zeep_client_mock: Mock,
+    zeep_xsd_mock: Mock,
+    _zeep_cache_mock: Mock,
+    _setup_train_object_open_live: TrainObject,
+) -> None:
+    """Test that repeated refreshes only build the SOAP client and header once
+
+    Args:
+        zeep_client_mock (Mock): Mock for Client class
+        zeep_xsd_mock (Mock): Mock for xsd.Element class
+        _zeep_cache_mock (Mock): Mock for SqliteCache class
+        _setup_train_object_open_live (TrainObject): Open Live TrainObject
+    """
+    for _ in range(3):
+        train_model_factory(_setup_train_object_open_live)
+    zeep_client_mock.assert_called_once()
+    assert zeep_xsd_mock.call_count == 2
+    service = zeep_client_mock.return_value.service
+    assert service.GetDepartureBoard.call_count == 3
+
+
+@patch("inky_pi.train.open_live.zeep.cache.SqliteCache")
+def test_pooled_open_live_client_skips_wsdl_parsing(
+    _zeep_cache_mock: Mock, _setup_train_vars: Mapping[str, Any]
+) -> None:
+    """Test that the local WSDL fixture is only parsed for the first lookup
+
+    Args:
+        _zeep_cache_mock (Mock): Mock for SqliteCache class
+        _setup_train_vars (Mapping): Mapping of variables to be used in the test
+    """
+    train_object = TrainObject(
+        model=TrainModel.OPEN_LIVE,
+        station_from=_setup_train_vars["station_from"],
+        station_to=_setup_train_vars["station_to"],
+        number=_setup_train_vars["number"],
+        url=str(OPEN_LIVE_WSDL),
+        token=_setup_train_vars["token"],
+    )
+
+    with patch(
+        "inky_pi.train.open_live.zeep.Client", wraps=zeep.Client
+    ) as zeep_client_mock:
+        pooled_client = get_open_live_client(zeep, train_object)
+        for _ in range(3):
+            assert get_open_live_client(zeep, train_object) is pooled_client
+    zeep_client_mock.assert_called_once()
+    assert pooled_client.header(TokenValue="key").TokenValue == "key"
+
+
+@patch("inky_pi.http_session.TimeoutSession.get")
 def test_can_successfully_instantiate_train_huxley2(
-    requests_get_mock: Mock, _setup_train_object_huxley2: TrainObject
+    session_get_mock: Mock, _setup_train_object_huxley2: TrainObject
 ) -> None:
     """Test for creating Huxley2 OpenLDBWS instanced object
 
     Args:
-        requests_get_mock (Mock): Mock for requests.get class
+        session_get_mock (Mock): Mock for shared session get method
         _setup_train_object_huxley2 (TrainObject): Huxley2 TrainObject
     """
     ret: TrainBase = train_model_factory(_setup_train_object_huxley2)
-    requests_get_mock.assert_called_once()
+    session_get_mock.assert_called_once()
     assert isinstance(ret, Huxley2)
 
 
@@ -237,3 +398,182 @@ def test_fetch_train_string_huxley2_invalid_num_raises_error(
     """
     with pytest.raises(ValueError):
         _setup_huxley2_fake_data.fetch_train(num)
+
+
+def test_huxley2_normalises_departures_once(
+    _setup_huxley2_fake_data: Huxley2,
+) -> None:
+    """Test that the response is parsed into compact departure records
+
+    Args:
+        _setup_huxley2_fake_data (Huxley2): Huxley2 fake data
+    """
+    departures = _setup_huxley2_fake_data.departures
+    assert isinstance(departures, tuple)
+    assert departures[1] == Departure("18:14", "On time", "1", "Luton", "Luton")
+    assert not hasattr(departures[0], "__dict__")
+    assert _setup_huxley2_fake_data.fetch_trains(3) == [
+        "18:11 | P2 to Slade Green - On time",
+        "18:14 | P1 to Luton - On time",
+        "18:21 | P2 to Slade Green - On time",
+    ]
+
+
+def test_fetch_trains_pads_with_service_message() -> None:
+    """Test that missing departures are filled with the wrapped service message"""
+    board: Dict[str, Any] = {
+        "locationName": "Maze Hill",
+        "filterLocationName": "London Bridge",
+        "trainServices": None,
+        "nrccMessages": [{"value": "Disruption between Maze Hill and London"}],
+    }
+    requests = FakeRequests()
+    requests.add_response(board, 200)
+    train_base = Huxley2()
+    train_base.retrieve_data(requests, TrainObject(TrainModel.HUXLEY2, "MZH", "LBG", 2))
+    assert train_base.departures == ()
+    assert train_base.num == 2
+    assert train_base.message == "Disruption between Maze Hill and London"
+    assert train_base.fetch_trains(2) == [
+        "Disruption between Maze Hill and Londo",
+        "n",
+    ]
+
+
+def test_departure_without_platform_shows_error_message() -> None:
+    """Test that a service with no platform is not drawn as a bare "P" line"""
+    board: Dict[str, Any] = {
+        "locationName": "Maze Hill",
+        "filterLocationName": "London Bridge",
+        "trainServices": [
+            {
+                "std": "18:11",
+                "etd": "On time",
+                "destination": [{"locationName": "London Bridge"}],
+            }
+        ],
+    }
+    requests = FakeRequests()
+    requests.add_response(board, 200)
+    train_base = Huxley2()
+    train_base.retrieve_data(requests, TrainObject(TrainModel.HUXLEY2, "MZH", "LBG", 1))
+    assert train_base.fetch_train(0) == "No trains to London Bridge from Maze H"
+
+
+def test_huxley2_invalid_json_raises_error() -> None:
+    """Test that a response that is not JSON is reported as invalid train data"""
+    session = Mock()
+    session.get.return_value.json.side_effect = JSONDecodeError(
+        "Expecting value", "", 0
+    )
+    with pytest.raises(ValueError):
+        Huxley2().retrieve_data(
+            session, TrainObject(TrainModel.HUXLEY2, "MZH", "LBG", 1)
+        )
+
+
+def test_departure_flags_cancelled_services() -> None:
+    """Test that cancelled services are flagged from either provider field"""
+    assert Departure.create("18:11", "Cancelled", None, "Luton").cancelled
+    assert Departure.create("18:11", "On time", "12A", "Luton", True).cancelled
+    assert Departure.create("18:11", "On time", "12A", "Luton").platform == "12"
+
+
+def test_train_data_unavailable_before_retrieval() -> None:
+    """Test that fetching trains before retrieving data raises an error"""
+    with pytest.raises(ValueError):
+        Huxley2().fetch_trains(1)
+
+
+def test_async_huxley2_matches_sync_huxley2(
+    _setup_train_object_huxley2: TrainObject, _setup_huxley2_fake_data: Huxley2
+) -> None:
+    """Test that the async Huxley2 provider parses responses like the sync one
+
+    Args:
+        _setup_train_object_huxley2 (TrainObject): Huxley2 TrainObject
+        _setup_huxley2_fake_data (Huxley2): Huxley2 fake data
+    """
+    client = FakeAsyncRequests()
+    with open(HUXLEY2_TRAIN_DATA, "r", encoding="utf-8") as file:
+        client.add_response(json.load(file), 200)
+
+    train_base = asyncio.run(atrain_model_factory(_setup_train_object_huxley2, client))
+    assert isinstance(train_base, Huxley2)
+    for num in range(3):
+        assert train_base.fetch_train(num) == _setup_huxley2_fake_data.fetch_train(num)
+
+
+@patch("inky_pi.train.open_live.zeep.cache.SqliteCache")
+def test_async_open_live_sends_request_over_given_client(
+    _zeep_cache_mock: Mock, _setup_train_vars: Mapping[str, Any]
+) -> None:
+    """Test the async OpenLive provider against the local WSDL fixture
+
+    Args:
+        _zeep_cache_mock (Mock): Mock for SqliteCache class
+        _setup_train_vars (Mapping): Mapping of variables to be used in the test
+    """
+    httpx = pytest.importorskip("httpx")
+    requests_sent: list[Any] = []
+
+    def handler(request: Any) -> Any:
+        requests_sent.append(request)
+        return httpx.Response(
+            200,
+            content=OPEN_LIVE_SOAP_RESPONSE.encode(),
+            headers={"Content-Type": "application/soap+xml; charset=utf-8"},
+        )
+
+    train_object = TrainObject(
+        model=TrainModel.OPEN_LIVE,
+        station_from=_setup_train_vars["station_from"],
+        station_to=_setup_train_vars["station_to"],
+        number=_setup_train_vars["number"],
+        url=str(OPEN_LIVE_WSDL),
+        token=_setup_train_vars["token"],
+    )
+
+    async def fetch() -> TrainBase:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await atrain_model_factory(train_object, client)
+
+    train_base = asyncio.run(fetch())
+    assert isinstance(train_base, OpenLive)
+    assert len(requests_sent) == 1
+    assert b"<ns0:TokenValue>key</ns0:TokenValue>" in requests_sent[0].content
+    assert train_base.origin == "Maze Hill"
+    assert train_base.fetch_train(0) == "18:11 | P2 to Slade Green - On time"
+    assert train_base.departures == (
+        Departure("18:11", "On time", "2", "Slade Green", "Slade Green", False),
+    )
+
+
+@patch("inky_pi.train.open_live.zeep.cache.SqliteCache")
+def test_async_open_live_client_is_pooled_per_http_client(
+    _zeep_cache_mock: Mock, _setup_train_vars: Mapping[str, Any]
+) -> None:
+    """Test that the zeep AsyncClient is reused while the httpx client is the same
+
+    Args:
+        _zeep_cache_mock (Mock): Mock for SqliteCache class
+        _setup_train_vars (Mapping): Mapping of variables to be used in the test
+    """
+    httpx = pytest.importorskip("httpx")
+    train_object = TrainObject(
+        model=TrainModel.OPEN_LIVE,
+        station_from=_setup_train_vars["station_from"],
+        station_to=_setup_train_vars["station_to"],
+        number=_setup_train_vars["number"],
+        url=str(OPEN_LIVE_WSDL),
+        token=_setup_train_vars["token"],
+    )
+    open_live_client = get_open_live_client(zeep, train_object)
+    first, second = httpx.AsyncClient(), httpx.AsyncClient()
+
+    pooled = get_open_live_async_client(first, open_live_client, train_object)
+
+    assert get_open_live_async_client(first, open_live_client, train_object) is pooled
+    assert (
+        get_open_live_async_client(second, open_live_client, train_object) is not pooled
+    )
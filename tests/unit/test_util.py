@@ -1,15 +1,27 @@
 """Tests for utility methods and classes"""
 
+import asyncio
+import subprocess  # nosec B404
+import sys
+from enum import Enum
 from unittest.mock import Mock, patch
 
 import pytest
 
+from inky_pi.display.display_base import DisplayModel
 from inky_pi.train.train_base import TrainModel, TrainObject
 from inky_pi.util import (
+    ASYNC_TRAIN_REGISTRY,
+    ASYNC_WEATHER_REGISTRY,
+    DISPLAY_REGISTRY,
     LOG_FILE,
     LOG_ROTATION,
     LOG_SERIALIZE,
+    TRAIN_REGISTRY,
+    WEATHER_REGISTRY,
     configure_logging,
+    gather_bounded,
+    load_backend,
     train_model_factory,
     weather_model_factory,
 )
@@ -46,3 +58,65 @@ def test_that_weather_model_factory_with_invalid_model_raises_exception() -> Non
         weather_model_factory(
             WeatherObject(WeatherModel.OPEN_WEATHER_MAP, -1, -1, "INVALID", "INVALID")
         )
+
+
+def test_importing_util_does_not_import_backends() -> None:
+    """Test that backend modules are only imported once selected"""
+    backends = [
+        "inky_pi.display.inky_draw",
+        "inky_pi.display.terminal_draw",
+        "inky_pi.train.huxley2",
+        "inky_pi.train.open_live",
+        "inky_pi.weather.open_weather_map",
+    ]
+    code = (
+        "import sys, inky_pi.util; "
+        f"print([m for m in {backends!r} if m in sys.modules])"
+    )
+    result = subprocess.run(  # nosec B603
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize(
+    "registry",
+    [
+        DISPLAY_REGISTRY,
+        TRAIN_REGISTRY,
+        WEATHER_REGISTRY,
+        ASYNC_TRAIN_REGISTRY,
+        ASYNC_WEATHER_REGISTRY,
+    ],
+)
+def test_all_registered_backends_can_be_loaded(registry: dict[Enum, str]) -> None:
+    """Test that every registry entry resolves to a callable factory
+
+    Args:
+        registry (dict): Backend registry
+    """
+    for entry_point in registry.values():
+        assert callable(load_backend(entry_point))
+
+
+def test_every_display_model_has_a_registered_backend() -> None:
+    """Test that no display model is missing from the registry"""
+    assert set(DISPLAY_REGISTRY) == set(DisplayModel)
+
+
+def test_gather_bounded_limits_concurrency_and_keeps_order() -> None:
+    """Test that at most `limit` awaitables run at once and results stay ordered"""
+    running = 0
+    peak = 0
+
+    async def fetch(num: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return num
+
+    results = asyncio.run(gather_bounded((fetch(num) for num in range(10)), limit=3))
+    assert results == list(range(10))
+    assert peak == 3
@@ -1,5 +1,6 @@
 """Tests for weather module"""
 
+import asyncio
 import json
 from math import isclose
 from pathlib import Path
@@ -8,7 +9,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from inky_pi.util import weather_model_factory
+from inky_pi.util import aweather_model_factory, weather_model_factory
 from inky_pi.weather.open_weather_map import DEG_C, DEG_F, OpenWeatherMap
 from inky_pi.weather.weather_base import (
     IconType,
@@ -19,7 +20,7 @@ from inky_pi.weather.weather_base import (
     celsius_to_fahrenheit,
     kelvin_to_celsius,
 )
-from tests.unit.resources.fakes import FakeRequests
+from tests.unit.resources.fakes import FakeAsyncRequests, FakeRequests
 
 TEST_DIR = Path(__file__).parent
 RESOURCES_DIR = TEST_DIR.joinpath("resources")
@@ -108,19 +109,19 @@ def test_kelvin_below_abs_zero_raises_value_error() -> None:
         kelvin_to_celsius(-1)
 
 
-@patch("inky_pi.weather.open_weather_map.requests.get")
+@patch("inky_pi.http_session.TimeoutSession.get")
 def test_can_successfully_instantiate_weather_open_weather_map(
-    requests_get_mock: Mock, _setup_weather_object: WeatherObject
+    session_get_mock: Mock, _setup_weather_object: WeatherObject
 ) -> None:
     """Test for creating OpenWeatherMap instanced object
 
     Args:
-        requests_get_mock (Mock): Mock for requests.get
+        session_get_mock (Mock): Mock for shared session get method
         _setup_weather_object (WeatherObject): Setup weather data
     """
     weather_object = _setup_weather_object
     ret: WeatherBase = weather_model_factory(weather_object)
-    requests_get_mock.assert_called_once()
+    session_get_mock.assert_called_once()
     assert isinstance(ret, OpenWeatherMap)
 
 
@@ -142,6 +143,45 @@ def test_retrieving_invalid_weather_data_raises_value_error(
         weather_base.retrieve_data(_invalid_requests, _setup_weather_object)
 
 
+def test_async_retrieve_data_matches_sync_retrieve_data(
+    _setup_weather_object: WeatherObject, _setup_weather_fake_data: OpenWeatherMap
+) -> None:
+    """Test that the async provider parses responses like the sync one
+
+    Args:
+        _setup_weather_object (WeatherObject): Setup weather data
+        _setup_weather_fake_data (OpenWeatherMap): Fixture for weather data
+    """
+    client = FakeAsyncRequests()
+    with open(WEATHER_DATA, "r", encoding="utf-8") as file:
+        client.add_response(json.load(file), 200)
+
+    weather_base: WeatherBase = asyncio.run(
+        aweather_model_factory(_setup_weather_object, client)
+    )
+    assert isinstance(weather_base, OpenWeatherMap)
+    assert weather_base.get_current_weather() == (
+        _setup_weather_fake_data.get_current_weather()
+    )
+    assert weather_base.get_temp_range(1) == _setup_weather_fake_data.get_temp_range(1)
+
+
+def test_async_retrieving_invalid_weather_data_raises_value_error(
+    _setup_weather_object: WeatherObject,
+) -> None:
+    """Test that async errors are raised rather than exiting
+
+    Args:
+        _setup_weather_object (WeatherObject): Setup weather data
+    """
+    client = FakeAsyncRequests()
+    with open(INVALID_WEATHER_DATA, "r", encoding="utf-8") as file:
+        client.add_response(json.load(file), 200)
+
+    with pytest.raises(ValueError):
+        asyncio.run(aweather_model_factory(_setup_weather_object, client))
+
+
 @pytest.mark.parametrize(
     "day, expected_icon_type",
     [